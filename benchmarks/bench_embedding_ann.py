@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Recall and latency of the IVF embedding index against brute-force cosine
+similarity on a synthetic FAQ corpus.
+
+Usage:
+    python benchmarks/bench_embedding_ann.py --size 50000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from corpus import synthetic_questions
+from embeddings import HashingEmbedder, IVFIndex, brute_force_search
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark IVF recall and latency against brute force')
+    parser.add_argument('--size', type=int, default=50000,
+                       help='Number of synthetic FAQs (default: 50000)')
+    parser.add_argument('--queries', type=int, default=200,
+                       help='Number of queries (default: 200)')
+    parser.add_argument('--k', type=int, default=10,
+                       help='Neighbours per query (default: 10)')
+    parser.add_argument('--probes', default='1,2,4,8,16,32',
+                       help='Comma-separated n_probe values (default: 1,2,4,8,16,32)')
+    args = parser.parse_args()
+
+    questions = synthetic_questions(args.size)
+    queries = synthetic_questions(args.queries, seed=7)
+
+    start = time.perf_counter()
+    embedder = HashingEmbedder().fit(questions)
+    vectors = embedder.embed(questions)
+    print(f"Embedded {args.size} questions in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    index = IVFIndex.build(vectors)
+    print(f"Built IVF index with {len(index.centroids)} lists in {time.perf_counter() - start:.2f}s")
+
+    query_vectors = embedder.embed(queries)
+    start = time.perf_counter()
+    exact = [{row for row, _ in brute_force_search(vectors, q, args.k)} for q in query_vectors]
+    brute_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+    print(f"\n  {'n_probe':>7} {f'recall@{args.k}':>10} {'ms/query':>9} {'speedup':>8}")
+    print(f"  {'brute':>7} {1.0:>10.3f} {brute_ms:>9.3f} {1.0:>8.2f}")
+    for n_probe in [int(p) for p in args.probes.split(',')]:
+        start = time.perf_counter()
+        found = [{row for row, _ in index.search(vectors, q, args.k, n_probe)} for q in query_vectors]
+        ivf_ms = (time.perf_counter() - start) * 1000 / len(queries)
+        recall = sum(len(a & b) for a, b in zip(exact, found)) / sum(len(a) for a in exact)
+        print(f"  {n_probe:>7} {recall:>10.3f} {ivf_ms:>9.3f} {brute_ms / ivf_ms:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Memory use and category aggregation time of FaqStore against the list of
+dicts returned by load_faqs, on a synthetic corpus from corpus.py.
+
+Usage:
+    python benchmarks/bench_faq_store.py --size 100000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from corpus import generate_corpus
+from faq_store import FaqStore
+
+
+def allocated(build):
+    """Return (result, bytes still allocated by build())."""
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark FaqStore memory and aggregation')
+    parser.add_argument('--size', type=int, default=100000,
+                       help='Number of synthetic FAQs (default: 100000)')
+    args = parser.parse_args()
+
+    text = json.dumps(generate_corpus(args.size))
+
+    # Decode from text in both cases so neither side shares string objects
+    faqs, dict_bytes = allocated(lambda: json.loads(text))
+    store, store_bytes = allocated(lambda: FaqStore(json.loads(text)))
+    print(f"{args.size} FAQs:")
+    print(f"  list of dicts: {dict_bytes / 1e6:8.1f} MB")
+    print(f"  FaqStore:      {store_bytes / 1e6:8.1f} MB ({dict_bytes / store_bytes:.1f}x smaller)")
+
+    start = time.perf_counter()
+    expected = Counter(faq.get('category') for faq in faqs)
+    dict_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    counts = store.category_counts()
+    store_seconds = time.perf_counter() - start
+    assert counts == dict(expected)
+    print(f"\nCategory counts:")
+    print(f"  list of dicts: {dict_seconds * 1000:8.2f} ms")
+    print(f"  FaqStore:      {store_seconds * 1000:8.2f} ms ({dict_seconds / store_seconds:.1f}x faster)")
+
+
+if __name__ == '__main__':
+    main()
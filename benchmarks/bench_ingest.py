@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Load test for ingest_service: concurrent stand-in clients POST batches of a
+synthetic corpus over keep-alive connections to a service on a local Unix
+socket, and the sustained throughput and request latency are reported.
+Each request is only answered once its FAQs are fsynced, so the latency
+includes the group commit.
+
+Usage:
+    python benchmarks/bench_ingest.py --clients 8 --batch 100 --items 100000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from typing import List, Dict, Any
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from corpus import generate_corpus
+from ingest_service import DEFAULT_BATCH_SIZE, DEFAULT_MAX_PENDING, FaqIngestService, IngestClient, serve
+from instrumentation import set_verbose
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+async def run_client(socket_path: str, batches: List[List[Dict[str, Any]]], latencies: List[float]) -> int:
+    accepted = 0
+    async with IngestClient(unix_socket=socket_path) as client:
+        for batch in batches:
+            start = time.perf_counter()
+            result = await client.submit(batch)
+            latencies.append(time.perf_counter() - start)
+            accepted += result['accepted']
+    return accepted
+
+
+async def load_test(args: argparse.Namespace, directory: str) -> None:
+    faqs = generate_corpus(args.items, seed=args.seed)
+    batches = [faqs[start:start + args.batch] for start in range(0, len(faqs), args.batch)]
+    # Client k sends every clients-th batch, so all of them run for the whole test
+    assignments = [batches[k::args.clients] for k in range(args.clients)]
+
+    service = FaqIngestService(os.path.join(directory, 'faqs.jsonl'), batch_size=args.commit_batch,
+                               max_pending=args.max_pending)
+    socket_path = os.path.join(directory, 'ingest.sock')
+    server = await serve(service, unix_socket=socket_path)
+    latencies: List[float] = []
+    async with server:
+        start = time.perf_counter()
+        accepted = await asyncio.gather(*(run_client(socket_path, batches, latencies) for batches in assignments))
+        elapsed = time.perf_counter() - start
+        await service.close()
+
+    latencies.sort()
+    stats = service.status()
+    print(f"{args.items} FAQs in {len(batches)} batches of {args.batch} from {args.clients} clients:")
+    print(f"  Elapsed:        {elapsed:.2f}s")
+    print(f"  Throughput:     {args.items / elapsed:,.0f} items/s submitted, "
+          f"{sum(accepted) / elapsed:,.0f} items/s committed")
+    print(f"  Latency:        p50 {percentile(latencies, 0.5) * 1000:.1f} ms, "
+          f"p99 {percentile(latencies, 0.99) * 1000:.1f} ms, max {latencies[-1] * 1000:.1f} ms")
+    print(f"  Accepted:       {stats['accepted']} ({stats['duplicates']} duplicates, {stats['invalid']} invalid)")
+    print(f"  Commits:        {stats['commits']} (average {stats['committed'] / max(stats['commits'], 1):.0f} FAQs per fsync)")
+    print(f"  Corpus size:    {stats['corpus_size']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the FAQ ingestion service')
+    parser.add_argument('--items', type=int, default=100000, help='FAQs to submit (default: 100000)')
+    parser.add_argument('--batch', type=int, default=100, help='FAQs per request (default: 100)')
+    parser.add_argument('--clients', type=int, default=8, help='Concurrent client connections (default: 8)')
+    parser.add_argument('--commit-batch', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"Service --batch-size (default: {DEFAULT_BATCH_SIZE})")
+    parser.add_argument('--max-pending', type=int, default=DEFAULT_MAX_PENDING,
+                        help=f"Service --max-pending (default: {DEFAULT_MAX_PENDING})")
+    parser.add_argument('--seed', type=int, default=42, help='Corpus random seed (default: 42)')
+    args = parser.parse_args()
+
+    set_verbose(False)
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(load_test(args, directory))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Top-k nearest-question queries: latency of NearestQuestionIndex.most_similar
+against scoring every question, plus the index build and reload times.
+
+Usage:
+    python benchmarks/bench_most_similar.py --size 100000 --queries 1000
+"""
+
+import argparse
+import heapq
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from corpus import generate_corpus
+from similarity_index import NearestQuestionIndex, jaccard_similarity
+from text_processing import get_words
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark top-k nearest-question queries')
+    parser.add_argument('--size', type=int, default=100000, help='Number of FAQs (default: 100000)')
+    parser.add_argument('--queries', type=int, default=1000, help='Number of queries (default: 1000)')
+    parser.add_argument('--k', type=int, default=5, help='Results per query (default: 5)')
+    args = parser.parse_args()
+
+    questions = [faq['question'] for faq in generate_corpus(args.size)]
+    queries = [faq['question'] for faq in generate_corpus(args.queries, seed=7)]
+
+    start = time.perf_counter()
+    index = NearestQuestionIndex.from_questions(questions)
+    build = time.perf_counter() - start
+    serialized = json.dumps(index.to_dict())
+    start = time.perf_counter()
+    NearestQuestionIndex.from_dict(json.loads(serialized))
+    reload = time.perf_counter() - start
+
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        index.most_similar(query, args.k)
+        latencies.append(time.perf_counter() - start)
+
+    token_sets = [get_words(question) for question in questions]
+    sample = random.Random(0).sample(queries, min(20, len(queries)))
+    start = time.perf_counter()
+    for query in sample:
+        words = get_words(query)
+        heapq.nlargest(args.k, range(len(token_sets)), key=lambda i: jaccard_similarity(words, token_sets[i]))
+    full_scan = (time.perf_counter() - start) / len(sample)
+
+    print(f"{args.size} FAQs, {len(index.token_ids)} distinct tokens:")
+    print(f"  {'build index':<28} {build:8.3f}s")
+    print(f"  {'reload from JSON':<28} {reload:8.3f}s  ({len(serialized) / 1e6:.1f} MB)")
+    print(f"  {'most_similar p50':<28} {percentile(latencies, 0.5) * 1000:8.3f} ms")
+    print(f"  {'most_similar p99':<28} {percentile(latencies, 0.99) * 1000:8.3f} ms")
+    print(f"  {'score every question':<28} {full_scan * 1000:8.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmark for the parallel similarity search.
+Times find_similar_pairs on a synthetic FAQ corpus with 1, 2, 4 and 8
+workers and checks every run returns the serial result.
+
+Usage:
+    python benchmarks/bench_parallel_similarity.py --size 50000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from corpus import synthetic_questions
+from similarity_index import SimilarityIndex
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark parallel similarity search scaling')
+    parser.add_argument('--size', type=int, default=50000,
+                       help='Number of synthetic FAQs (default: 50000)')
+    parser.add_argument('--threshold', type=float, default=0.8,
+                       help='Jaccard similarity threshold (default: 0.8)')
+    parser.add_argument('--workers', default='1,2,4,8',
+                       help='Comma-separated worker counts (default: 1,2,4,8)')
+    args = parser.parse_args()
+
+    questions = synthetic_questions(args.size)
+    start = time.perf_counter()
+    index = SimilarityIndex.from_questions(questions, args.threshold)
+    print(f"Built index over {args.size} questions in {time.perf_counter() - start:.2f}s "
+          f"({os.cpu_count()} CPUs available)")
+
+    baseline = None
+    baseline_seconds = None
+    print(f"\n  {'workers':>7} {'seconds':>8} {'speedup':>7} {'pairs':>7}")
+    for workers in [int(w) for w in args.workers.split(',')]:
+        start = time.perf_counter()
+        pairs = index.all_pairs(workers)
+        elapsed = time.perf_counter() - start
+        if baseline is None:
+            baseline, baseline_seconds = pairs, elapsed
+        elif pairs != baseline:
+            raise SystemExit(f"Result with {workers} workers differs from the first run")
+        print(f"  {workers:>7} {elapsed:>8.2f} {baseline_seconds / elapsed:>7.2f} {len(pairs):>7}")
+
+
+if __name__ == '__main__':
+    main()
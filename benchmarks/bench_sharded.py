@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Sharded corpus against one monolithic file: loading a single shard, the
+corpus summary from the manifest, and exact deduplication per shard in
+parallel with the cross-shard merge.
+
+Usage:
+    python benchmarks/bench_sharded.py --size 100000 --workers 4
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from corpus import generate_corpus
+from detect_duplicates_enhanced import detect_and_remove_duplicates
+from faq_summary import FaqSummary
+from load_faqs import iter_faqs, load_faqs, write_faqs
+from sharded_corpus import ShardedCorpus, find_shard_duplicates
+
+
+def measure(function):
+    """(seconds, peak MB in this process, result): one timed call, then one traced call."""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        tracemalloc.start()
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return elapsed, peak / 1e6, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the sharded corpus layout')
+    parser.add_argument('--size', type=int, default=100000, help='Number of FAQs (default: 100000)')
+    parser.add_argument('--workers', type=int, default=4, help='Worker processes for sharded dedup (default: 4)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        faqs = generate_corpus(args.size)
+        monolith = os.path.join(tmp, 'faqs.json')
+        write_faqs(monolith, faqs)
+        corpus = ShardedCorpus.create(os.path.join(tmp, 'sharded'), faqs)
+        del faqs
+        smallest = min(corpus.shards, key=lambda name: corpus.shards[name]['count'])
+
+        rows = [
+            ('load whole file', lambda: load_faqs(monolith)),
+            (f"load shard {smallest} ({corpus.shards[smallest]['count']} FAQs)",
+             lambda: load_faqs(corpus.directory, shards=[smallest])),
+            ('summary by scanning the file', lambda: FaqSummary.from_faqs(iter_faqs(monolith))),
+            ('summary from stored shard summaries', lambda: ShardedCorpus(corpus.directory).summary()),
+            ('dedup whole file', lambda: detect_and_remove_duplicates(load_faqs(monolith))[1]),
+            (f"dedup shards, {args.workers} workers", lambda: find_shard_duplicates(corpus, workers=args.workers)),
+        ]
+        print(f"{args.size} FAQs, {len(corpus.shards)} shards, {os.cpu_count()} CPUs:")
+        for label, function in rows:
+            seconds, peak_mb, result = measure(function)
+            found = f"  ({len(result)} duplicates)" if label.startswith('dedup') else ''
+            print(f"  {label:<42} {seconds:8.3f}s {peak_mb:9.1f} MB{found}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Random access through the binary snapshot against parsing the
+pretty-printed JSON: in-process times to read one FAQ or the whole corpus,
+and whole-process startup of a script that reads one FAQ.
+
+Usage:
+    python benchmarks/bench_snapshot.py --size 100000
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from corpus import generate_corpus
+from faq_snapshot import FaqSnapshot, build_snapshot
+from load_faqs import load_faq_at, write_faqs
+
+
+def best_of(function, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def startup(code, repeat=3):
+    """Best wall time of a fresh interpreter running code."""
+    return best_of(lambda: subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True), repeat)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the binary FAQ snapshot')
+    parser.add_argument('--size', type=int, default=100000, help='Number of FAQs (default: 100000)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'faqs.json')
+        write_faqs(path, generate_corpus(args.size))
+        build_seconds = best_of(lambda: build_snapshot(path), repeat=1)
+
+        def json_load():
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+
+        def open_snapshot():
+            with FaqSnapshot.open(path) as snapshot:
+                return snapshot[len(snapshot) // 2]
+
+        def snapshot_load_all():
+            with FaqSnapshot.open(path) as snapshot:
+                return snapshot.load_all()
+
+        rows = [
+            ('json.load', json_load),
+            ('open snapshot + one FAQ', open_snapshot),
+            ('load_faq_at (snapshot)', lambda: load_faq_at(path, args.size // 2)),
+            ('snapshot load_all', snapshot_load_all),
+        ]
+        print(f"{args.size} FAQs ({os.path.getsize(path) / 1e6:.1f} MB JSON, "
+              f"{os.path.getsize(path + '.snapshot') / 1e6:.1f} MB snapshot, built in {build_seconds:.2f}s):")
+        for label, function in rows:
+            print(f"  {label:<36} {best_of(function) * 1000:9.1f} ms")
+
+        one_faq = f"[len(faqs), faqs[{args.size // 2}]]"
+        print("Process startup, load and read one FAQ:")
+        print(f"  {'python + json.load':<36} "
+              f"{startup(f'import json; faqs = json.load(open({path!r})); {one_faq}') * 1000:9.1f} ms")
+        print(f"  {'python + snapshot':<36} "
+              f"{startup(f'from faq_snapshot import FaqSnapshot; faqs = FaqSnapshot.open({path!r}); {one_faq}') * 1000:9.1f} ms")
+        print(f"  {'python (empty)':<36} {startup('pass') * 1000:9.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Time to validate a large FAQ file with validate_faqs, against the previous
+approach of one full loop of unittest assertions per rule, as
+tests/test_flat_faqs.py used to do.
+
+Usage:
+    python benchmarks/bench_validate.py --size 100000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import unittest
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from corpus import generate_corpus
+from load_faqs import load_faqs, write_faqs
+from validate_faqs import validate_faqs, validate_file
+
+REQUIRED_FIELDS = ['category', 'question', 'keywords', 'answer']
+
+
+def validate_per_rule(data):
+    """The previous tests/test_flat_faqs.py checks: one full pass of assertions per rule."""
+    case = unittest.TestCase()
+    questions = Counter(entry['question'] for entry in data)
+    case.assertEqual([q for q, count in questions.items() if count > 1], [])
+    for i, entry in enumerate(data):
+        for field in REQUIRED_FIELDS:
+            case.assertIn(field, entry, f"Entry {i} is missing required field: {field}")
+    for i, entry in enumerate(data):
+        case.assertIsInstance(entry['category'], str, f"Entry {i}: category should be a string")
+        case.assertIsInstance(entry['question'], str, f"Entry {i}: question should be a string")
+        case.assertIsInstance(entry['keywords'], list, f"Entry {i}: keywords should be a list")
+        case.assertIsInstance(entry['answer'], str, f"Entry {i}: answer should be a string")
+        for j, keyword in enumerate(entry['keywords']):
+            case.assertIsInstance(keyword, str, f"Entry {i}, keyword {j}: should be a string")
+    for i, entry in enumerate(data):
+        case.assertTrue(entry['category'].strip(), f"Entry {i}: category should not be empty")
+        case.assertTrue(entry['question'].strip(), f"Entry {i}: question should not be empty")
+        case.assertTrue(len(entry['keywords']) > 0, f"Entry {i}: keywords should not be empty")
+        case.assertTrue(entry['answer'].strip(), f"Entry {i}: answer should not be empty")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark single-pass FAQ validation')
+    parser.add_argument('--size', type=int, default=100000,
+                       help='Number of synthetic FAQs (default: 100000)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'faqs.json')
+        write_faqs(path, generate_corpus(args.size, duplicate_rate=0.0))
+        print(f"{args.size} FAQs, {os.path.getsize(path) / 1e6:.1f} MB")
+
+        start = time.perf_counter()
+        streamed = validate_file(path)
+        print(f"  validate_file (stream + parse):  {time.perf_counter() - start:7.3f}s")
+
+        data = load_faqs(path)
+        start = time.perf_counter()
+        violations = validate_faqs(data)
+        print(f"  validate_faqs (in memory):       {time.perf_counter() - start:7.3f}s")
+        start = time.perf_counter()
+        validate_per_rule(data)
+        print(f"  assertions per rule (in memory): {time.perf_counter() - start:7.3f}s")
+        assert violations == streamed
+        print(f"  violations: {len(violations)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Watch mode reindexing: the initial build, then edits of growing size
+applied to the resident state, against rerunning dedup and similarity
+from scratch. Parsing the file is left out; hashing the records to match
+them against the resident ones is the fixed cost of every update.
+
+Usage:
+    python benchmarks/bench_watch.py --size 20000
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from corpus import generate_corpus
+from detect_duplicates_enhanced import detect_and_remove_duplicates
+from faq_summary import FaqSummary
+from faq_watch import CorpusState
+from similarity_index import find_similar_pairs
+
+
+def from_scratch(faqs, threshold):
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        unique, _ = detect_and_remove_duplicates(faqs)
+    find_similar_pairs([faq.get('question', '') for faq in unique], threshold)
+    FaqSummary.from_faqs(faqs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark incremental reindexing in watch mode')
+    parser.add_argument('--size', type=int, default=20000, help='Number of FAQs (default: 20000)')
+    parser.add_argument('--threshold', type=float, default=0.8, help='Similarity threshold (default: 0.8)')
+    args = parser.parse_args()
+
+    faqs = generate_corpus(args.size)
+    extra = generate_corpus(1000, seed=7)
+    state = CorpusState(args.threshold)
+    stats = state.update(faqs)
+    print(f"{args.size} FAQs:")
+    print(f"  {'initial build':<28} {stats.seconds:8.3f}s")
+
+    start = time.perf_counter()
+    from_scratch(faqs, args.threshold)
+    print(f"  {'from scratch':<28} {time.perf_counter() - start:8.3f}s")
+
+    for edits in (1, 10, 100, 1000):
+        edited = list(faqs)
+        step = len(edited) // edits
+        for n in range(edits):
+            edited[n * step] = extra[n]
+        stats = state.update(edited)
+        print(f"  {f'{edits} edited FAQs':<28} {stats.seconds:8.3f}s  ({stats.pairs_compared} pairs compared)")
+        state.update(faqs)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Synthetic FAQ corpus generator for the benchmarks.
+
+Entries have the same fields as data/faqs.json. The size, the share of
+exact duplicates (the same question re-cased and re-spaced, as
+detect_duplicates catches), the share of near-duplicates (one word
+changed, as find_similar_questions catches), the category skew and the
+share of untidy category spellings (as normalize_categories fixes) are all
+configurable.
+
+Usage:
+    python benchmarks/corpus.py --size 10000 --output /tmp/faqs.json
+"""
+
+import argparse
+import os
+import random
+import sys
+from typing import List, Dict, Any
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from load_faqs import write_faqs
+from text_processing import normalize_text
+
+OPENERS = ['can i', 'where can i', 'how do i', 'is it possible to', 'what time can i', 'do you']
+VERBS = ['rent', 'book', 'find', 'get', 'use', 'buy', 'order', 'reserve', 'see', 'visit']
+CATEGORIES = [
+    'amenities & facilities', 'local area', 'food & dining', 'check-in & check-out', 'hotel services',
+    'arrival & transport', 'policies', 'tech', 'family', 'wellness & spa', 'safety & security',
+    'payments', 'emergencies', 'activities', 'connectivity', 'money', 'events & groups',
+    'eco & environment', 'beach & safety', 'amenities & safety',
+]
+ANSWER_WORDS = ['please', 'ask', 'reception', 'the', 'we', 'offer', 'daily', 'from', 'until',
+                'available', 'on', 'request', 'free', 'of', 'charge', 'guests', 'can', 'book', 'at', 'our']
+
+
+def synthetic_questions(size: int, seed: int = 42, vocabulary_size: int = 5000,
+                        near_duplicate_rate: float = 0.1) -> List[str]:
+    """Questions built from a shared phrase set plus rarer nouns, with some near-duplicates."""
+    rng = random.Random(seed)
+    nouns = [f"item{n}" for n in range(vocabulary_size)]
+    places = [f"place{n}" for n in range(vocabulary_size // 10)]
+    questions = []
+    for _ in range(size):
+        if questions and rng.random() < near_duplicate_rate:
+            words = rng.choice(questions).split()
+            words[rng.randrange(len(words))] = rng.choice(nouns)
+            questions.append(' '.join(words))
+        else:
+            questions.append(f"{rng.choice(OPENERS)} {rng.choice(VERBS)} a {rng.choice(nouns)} "
+                             f"{rng.choice(nouns)} near {rng.choice(places)}?")
+    return questions
+
+
+def _untidy(category: str, rng: random.Random) -> str:
+    """A spelling of category that normalize_category maps back to it."""
+    return rng.choice([category.upper(), category.title(), f"  {category}", f"{category} "])
+
+
+def generate_corpus(size: int, duplicate_rate: float = 0.05, near_duplicate_rate: float = 0.1,
+                    category_skew: float = 1.0, untidy_category_rate: float = 0.05,
+                    seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    Build a synthetic FAQ corpus.
+
+    Args:
+        size: Number of entries
+        duplicate_rate: Share of entries that repeat an earlier question,
+            with different casing or surrounding whitespace; every other
+            question is distinct after normalization
+        near_duplicate_rate: Share of entries that repeat an earlier question
+            with one word replaced
+        category_skew: Zipf exponent of the category distribution
+            (0 for uniform; larger values concentrate entries in few categories)
+        untidy_category_rate: Share of categories spelled with extra case or whitespace
+        seed: Random seed; the same arguments always give the same corpus
+
+    Returns:
+        List of FAQ dictionaries
+    """
+    rng = random.Random(seed)
+    fresh = iter(synthetic_questions(size, seed=seed, near_duplicate_rate=0.0))
+    weights = [1 / (rank + 1) ** category_skew for rank in range(len(CATEGORIES))]
+    nouns = [f"item{n}" for n in range(5000)]
+
+    faqs: List[Dict[str, Any]] = []
+    # Normalized questions so far, so only the duplicate_rate share repeats one
+    seen = set()
+    for _ in range(size):
+        roll = rng.random()
+        if faqs and roll < duplicate_rate:
+            original = rng.choice(faqs)
+            question = original['question'].strip()
+            question = rng.choice([question.upper(), question.capitalize(), f" {question}  "])
+            faqs.append(dict(original, question=question))
+            continue
+        if faqs and roll < duplicate_rate + near_duplicate_rate:
+            words = rng.choice(faqs)['question'].split()
+            words[rng.randrange(len(words))] = rng.choice(nouns)
+            question = ' '.join(words)
+        else:
+            question = next(fresh)
+        while normalize_text(question) in seen:
+            words = question.split()
+            words[rng.randrange(len(words))] = rng.choice(nouns)
+            question = ' '.join(words)
+        seen.add(normalize_text(question))
+
+        category = rng.choices(CATEGORIES, weights)[0]
+        if rng.random() < untidy_category_rate:
+            category = _untidy(category, rng)
+        keywords = [' '.join(rng.sample(nouns, rng.randint(1, 2))) for _ in range(rng.randint(2, 5))]
+        answer = ' '.join(rng.choice(ANSWER_WORDS) for _ in range(rng.randint(8, 60))).capitalize() + '.'
+        faqs.append({'category': category, 'question': question, 'keywords': keywords, 'answer': answer})
+    return faqs
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write a synthetic FAQ corpus')
+    parser.add_argument('--size', type=int, default=10000, help='Number of entries (default: 10000)')
+    parser.add_argument('--duplicate-rate', type=float, default=0.05, help='Share of exact duplicates (default: 0.05)')
+    parser.add_argument('--near-duplicate-rate', type=float, default=0.1,
+                        help='Share of near-duplicates (default: 0.1)')
+    parser.add_argument('--category-skew', type=float, default=1.0,
+                        help='Zipf exponent of the category distribution (default: 1.0)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed (default: 42)')
+    parser.add_argument('--output', required=True, help='Output FAQ file (JSON or JSONL)')
+    args = parser.parse_args()
+
+    faqs = generate_corpus(args.size, args.duplicate_rate, args.near_duplicate_rate,
+                           args.category_skew, seed=args.seed)
+    print(f"Wrote {write_faqs(args.output, faqs)} FAQs to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
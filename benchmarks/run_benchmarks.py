@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the FAQ data tooling.
+
+Times and memory-profiles the main entry points on synthetic corpora from
+corpus.py (1k, 10k and 100k entries by default) and reports how each one
+scales between sizes. Results can be saved as a JSON baseline and later runs
+compared against it, failing when a benchmark got slower or bigger than the
+tolerance allows.
+
+Usage:
+    python benchmarks/run_benchmarks.py --save benchmarks/baselines/baseline.json
+    python benchmarks/run_benchmarks.py --compare benchmarks/baselines/baseline.json
+    python benchmarks/run_benchmarks.py --sizes 1000,10000 --only load_faqs,normalize_categories
+"""
+
+import argparse
+import contextlib
+import datetime
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import List, Dict, Any, Callable, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from corpus import generate_corpus
+from load_faqs import load_faqs, write_faqs
+import detect_duplicates
+import detect_duplicates_enhanced
+from normalize_categories import normalize_categories
+from text_processing import clear_caches
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+CORPUS_OPTIONS = {
+    'duplicate_rate': 0.05,
+    'near_duplicate_rate': 0.1,
+    'category_skew': 1.0,
+    'untidy_category_rate': 0.05,
+    'seed': 42,
+}
+# Below this many seconds a slowdown is treated as timer noise
+NOISE_FLOOR_SECONDS = 0.005
+# Scaling exponents between consecutive sizes at or above this are flagged
+SUPERLINEAR_EXPONENT = 1.5
+
+
+class BenchmarkCase:
+    """The corpus one size of the suite runs against."""
+
+    def __init__(self, size: int, directory: str):
+        self.size = size
+        self.directory = directory
+        self.input_file = os.path.join(directory, f"faqs-{size}.json")
+        self.output_file = os.path.join(directory, f"normalized-{size}.json")
+        write_faqs(self.input_file, generate_corpus(size, **CORPUS_OPTIONS))
+        with _quiet():
+            self.faqs = load_faqs(self.input_file)
+
+
+BENCHMARKS: Dict[str, Callable[[BenchmarkCase], Any]] = {
+    'load_faqs': lambda case: load_faqs(case.input_file),
+    'detect_duplicates': lambda case: detect_duplicates.detect_and_remove_duplicates(case.faqs),
+    'detect_duplicates_enhanced': lambda case: detect_duplicates_enhanced.detect_and_remove_duplicates(case.faqs),
+    'find_similar_questions': lambda case: detect_duplicates_enhanced.find_similar_questions(case.faqs, 0.8),
+    'normalize_categories': lambda case: normalize_categories(case.input_file, case.output_file),
+}
+
+
+@contextlib.contextmanager
+def _quiet():
+    """Silence the progress output of the tools being measured."""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def measure(benchmark: Callable[[BenchmarkCase], Any], case: BenchmarkCase, repeat: int) -> Dict[str, float]:
+    """
+    Best wall time over repeat runs, then peak traced memory of one more run.
+    The text caches are emptied before every run so each one starts cold.
+    """
+    times = []
+    with _quiet():
+        for _ in range(repeat):
+            clear_caches()
+            start = time.perf_counter()
+            benchmark(case)
+            times.append(time.perf_counter() - start)
+        clear_caches()
+        tracemalloc.start()
+        try:
+            benchmark(case)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return {'seconds': min(times), 'peak_mb': peak / 1e6}
+
+
+def run_suite(sizes: List[int], names: List[str], repeat: int) -> Dict[str, Any]:
+    """Run every named benchmark at every size and return the results document."""
+    results: Dict[str, Dict[str, Dict[str, float]]] = {name: {} for name in names}
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            case = BenchmarkCase(size, directory)
+            for name in names:
+                result = measure(BENCHMARKS[name], case, repeat)
+                results[name][str(size)] = result
+                print(f"  {name:<28} {size:>7}  {result['seconds']:9.4f}s  {result['peak_mb']:8.1f} MB", flush=True)
+    return {
+        'meta': {
+            'created': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'repeat': repeat,
+            'corpus': CORPUS_OPTIONS,
+        },
+        'results': results,
+    }
+
+
+def scaling_exponents(by_size: Dict[str, Dict[str, float]]) -> List[tuple]:
+    """(size_from, size_to, exponent k) with time ~ size^k between consecutive sizes."""
+    sizes = sorted(int(size) for size in by_size)
+    exponents = []
+    for small, large in zip(sizes, sizes[1:]):
+        t_small, t_large = by_size[str(small)]['seconds'], by_size[str(large)]['seconds']
+        if t_small > 0 and t_large > 0:
+            exponents.append((small, large, math.log(t_large / t_small) / math.log(large / small)))
+    return exponents
+
+
+def print_scaling(document: Dict[str, Any]) -> None:
+    lines = []
+    for name, by_size in document['results'].items():
+        parts = []
+        for small, large, exponent in scaling_exponents(by_size):
+            flag = ' superlinear' if exponent >= SUPERLINEAR_EXPONENT else ''
+            parts.append(f"{small}->{large}: k={exponent:.2f}{flag}")
+        if parts:
+            lines.append(f"  {name:<28} " + ', '.join(parts))
+    if lines:
+        print(f"\nScaling (time ~ n^k between consecutive sizes):")
+        print('\n'.join(lines))
+
+
+def compare(document: Dict[str, Any], baseline: Dict[str, Any], time_tolerance: float,
+            memory_tolerance: float) -> List[str]:
+    """
+    Compare results against a baseline document.
+
+    Returns:
+        One message per regression (time or peak memory beyond the tolerance)
+    """
+    regressions = []
+    print(f"\nComparison with baseline from {baseline['meta'].get('created', 'unknown date')}:")
+    print(f"  {'benchmark':<28} {'size':>7} {'time':>8} {'memory':>8}")
+    for name, by_size in document['results'].items():
+        for size, result in by_size.items():
+            previous = baseline['results'].get(name, {}).get(size)
+            if previous is None:
+                continue
+            time_ratio = result['seconds'] / previous['seconds'] if previous['seconds'] else 1.0
+            memory_ratio = result['peak_mb'] / previous['peak_mb'] if previous['peak_mb'] else 1.0
+            flags = []
+            if (time_ratio > 1 + time_tolerance
+                    and result['seconds'] - previous['seconds'] > NOISE_FLOOR_SECONDS):
+                flags.append('SLOWER')
+                regressions.append(f"{name} at {size}: {previous['seconds']:.4f}s -> {result['seconds']:.4f}s")
+            if memory_ratio > 1 + memory_tolerance:
+                flags.append('BIGGER')
+                regressions.append(f"{name} at {size}: {previous['peak_mb']:.1f} MB -> {result['peak_mb']:.1f} MB")
+            print(f"  {name:<28} {size:>7} {time_ratio:7.2f}x {memory_ratio:7.2f}x  {' '.join(flags)}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the FAQ data tooling')
+    parser.add_argument('--sizes', default=','.join(str(size) for size in DEFAULT_SIZES),
+                        help='Comma-separated corpus sizes (default: 1000,10000,100000)')
+    parser.add_argument('--only', help=f"Comma-separated benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per benchmark; the best counts (default: 3)')
+    parser.add_argument('--save', help='Write the results to this JSON baseline file')
+    parser.add_argument('--compare', help='Compare the results against this JSON baseline file')
+    parser.add_argument('--time-tolerance', type=float, default=0.25,
+                        help='Allowed slowdown before flagging a regression (default: 0.25 = 25%%)')
+    parser.add_argument('--memory-tolerance', type=float, default=0.10,
+                        help='Allowed peak memory growth before flagging a regression (default: 0.10)')
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    names = args.only.split(',') if args.only else list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+
+    baseline: Optional[Dict[str, Any]] = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    print(f"Running {len(names)} benchmarks at sizes {', '.join(map(str, sizes))}:")
+    document = run_suite(sizes, names, args.repeat)
+    print_scaling(document)
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2)
+            f.write('\n')
+        print(f"\nResults saved to: {args.save}")
+
+    if baseline is not None:
+        regressions = compare(document, baseline, args.time_tolerance, args.memory_tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regressions:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            return 1
+        print(f"\nNo regressions.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
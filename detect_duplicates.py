@@ -5,14 +5,15 @@ Compares lowercase-trimmed "question" field and keeps only one instance of each.
 Logs any removed entries for review.
 """
 
+import argparse
 import json
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator
 from datetime import datetime
 
-def normalize_question(question: str) -> str:
-    """Normalize question by converting to lowercase and trimming whitespace."""
-    return question.lower().strip()
+from instrumentation import add_instrumentation_arguments, count, detail, instrumented, span
+from load_faqs import iter_faqs, write_faqs
+from text_processing import normalize_question, format_cache_stats
 
 def detect_and_remove_duplicates(faqs: List[Dict[str, Any]]) -> tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
     """
@@ -43,15 +44,58 @@ def detect_and_remove_duplicates(faqs: List[Dict[str, Any]]) -> tuple[List[Dict[
                 'normalized_question': normalized_question
             }
             removed_duplicates.append(duplicate_info)
-            print(f"Found duplicate question (index {i}): '{question}'")
-            print(f"  Original at index {original_index}: '{faqs[original_index]['question']}'")
+            detail(f"Found duplicate question (index {i}): '{question}'")
+            detail(f"  Original at index {original_index}: '{faqs[original_index]['question']}'")
         else:
             # This is unique, keep it
             seen_questions[normalized_question] = i
             unique_faqs.append(faq)
     
+    count('dedup.keys_built', len(faqs))
+    count('dedup.duplicates', len(removed_duplicates))
     return unique_faqs, removed_duplicates
 
+def iter_unique_faqs(faqs: Iterable[Dict[str, Any]], removed_duplicates: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """
+    Streaming variant of detect_and_remove_duplicates.
+    
+    Yields the first FAQ for each normalized question as it arrives and
+    appends duplicate details to removed_duplicates. Only the seen questions
+    are kept in memory, so duplicate entries record the original question
+    text instead of the full original FAQ.
+    
+    Args:
+        faqs: Iterable of FAQ objects, e.g. load_faqs.iter_faqs(path)
+        removed_duplicates: List that receives one entry per removed duplicate
+        
+    Yields:
+        Unique FAQ objects in input order
+    """
+    seen_questions = {}
+    keys_built = 0
+    
+    for i, faq in enumerate(faqs):
+        question = faq.get('question', '')
+        normalized_question = normalize_question(question)
+        keys_built += 1
+        
+        if normalized_question in seen_questions:
+            original_index, original_question = seen_questions[normalized_question]
+            removed_duplicates.append({
+                'original_index': original_index,
+                'duplicate_index': i,
+                'original_question': original_question,
+                'duplicate_faq': faq,
+                'normalized_question': normalized_question
+            })
+            count('dedup.duplicates')
+            detail(f"Found duplicate question (index {i}): '{question}'")
+            detail(f"  Original at index {original_index}: '{original_question}'")
+        else:
+            seen_questions[normalized_question] = (i, question)
+            yield faq
+    count('dedup.keys_built', keys_built)
+
 def save_duplicate_log(removed_duplicates: List[Dict[str, Any]], log_file: str):
     """Save detailed log of removed duplicates."""
     log_data = {
@@ -66,54 +110,65 @@ def save_duplicate_log(removed_duplicates: List[Dict[str, Any]], log_file: str):
     print(f"Duplicate log saved to: {log_file}")
 
 def main():
+    parser = argparse.ArgumentParser(description='Detect and remove duplicate FAQ questions')
+    add_instrumentation_arguments(parser)
+    args = parser.parse_args()
+    with instrumented(args, 'detect_duplicates'):
+        run()
+
+def run():
     input_file = 'data/faqs.json'
     output_file = 'data/faqs_deduplicated.json'
     log_file = 'duplicate_removal_log.json'
     
-    # Load the FAQ data
+    # Stream the FAQ data through deduplication into a partial output file.
+    # Loading, deduplication and writing are interleaved, so they share one span.
+    removed_duplicates = []
+    partial_file = f"{output_file}.partial"
     try:
-        with open(input_file, 'r', encoding='utf-8') as f:
-            faqs = json.load(f)
-        print(f"Loaded {len(faqs)} FAQs from {input_file}")
+        with span('load+dedup+serialize'):
+            unique_count = write_faqs(partial_file, iter_unique_faqs(iter_faqs(input_file), removed_duplicates))
     except FileNotFoundError:
         print(f"Error: File {input_file} not found")
         return
-    except json.JSONDecodeError as e:
+    except (json.JSONDecodeError, ValueError) as e:
         print(f"Error: Invalid JSON in {input_file}: {e}")
         return
-    
-    # Detect and remove duplicates
-    unique_faqs, removed_duplicates = detect_and_remove_duplicates(faqs)
+    total_count = unique_count + len(removed_duplicates)
+    print(f"Loaded {total_count} FAQs from {input_file}")
     
     # Print summary
     print(f"\nDuplicate Detection Summary:")
-    print(f"  Original FAQs: {len(faqs)}")
-    print(f"  Unique FAQs: {len(unique_faqs)}")
+    print(f"  Original FAQs: {total_count}")
+    print(f"  Unique FAQs: {unique_count}")
     print(f"  Duplicates removed: {len(removed_duplicates)}")
     
     if removed_duplicates:
-        print(f"\nDuplicate Questions Found:")
+        detail(f"\nDuplicate Questions Found:")
         for i, dup in enumerate(removed_duplicates, 1):
-            print(f"  {i}. '{dup['duplicate_faq']['question']}'")
-            print(f"     (duplicate of FAQ at index {dup['original_index']})")
+            detail(f"  {i}. '{dup['duplicate_faq']['question']}'")
+            detail(f"     (duplicate of FAQ at index {dup['original_index']})")
     else:
         print("\nNo duplicates found!")
     
     # Save results
     if removed_duplicates:
-        # Save deduplicated FAQs
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(unique_faqs, f, indent=2, ensure_ascii=False)
+        # Keep the deduplicated FAQs
+        os.replace(partial_file, output_file)
         print(f"\nDeduplicated FAQs saved to: {output_file}")
         
         # Save duplicate log
-        save_duplicate_log(removed_duplicates, log_file)
+        with span('serialize'):
+            save_duplicate_log(removed_duplicates, log_file)
         
         print(f"\nReview the log file to see details of removed duplicates.")
         print(f"If the results look correct, you can replace the original file with:")
         print(f"  mv {output_file} {input_file}")
     else:
+        os.remove(partial_file)
         print("\nNo duplicates found, no action needed.")
+    
+    print(f"\nText cache:\n{format_cache_stats()}")
 
 if __name__ == '__main__':
     main()
@@ -7,20 +7,14 @@ Logs any removed entries for review.
 
 import json
 import argparse
+import os
 from typing import List, Dict, Any, Tuple
 from datetime import datetime
 
-def normalize_text(text: str) -> str:
-    """Normalize text by converting to lowercase and trimming whitespace."""
-    return text.lower().strip()
-
-def create_duplicate_key(faq: Dict[str, Any], check_answer: bool = False) -> str:
-    """Create a key for duplicate detection based on question and optionally answer."""
-    question = normalize_text(faq.get('question', ''))
-    if check_answer:
-        answer = normalize_text(faq.get('answer', ''))
-        return f"{question}|{answer}"
-    return question
+from instrumentation import add_instrumentation_arguments, count, detail, instrumented, span
+from sharded_corpus import is_sharded
+from similarity_index import find_similar_pairs
+from text_processing import normalize_text, create_duplicate_key, format_cache_stats
 
 def detect_and_remove_duplicates(faqs: List[Dict[str, Any]], check_answer: bool = False) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
     """
@@ -55,60 +49,52 @@ def detect_and_remove_duplicates(faqs: List[Dict[str, Any]], check_answer: bool
                 'comparison_type': comparison_type
             }
             removed_duplicates.append(duplicate_info)
-            print(f"Found duplicate (index {i}):")
-            print(f"  Question: '{faq.get('question', '')}'")
+            detail(f"Found duplicate (index {i}):")
+            detail(f"  Question: '{faq.get('question', '')}'")
             if check_answer:
-                print(f"  Answer: '{faq.get('answer', '')[:100]}...'")
-            print(f"  Original at index {original_index}")
+                detail(f"  Answer: '{faq.get('answer', '')[:100]}...'")
+            detail(f"  Original at index {original_index}")
         else:
             # This is unique, keep it
             seen_keys[duplicate_key] = i
             unique_faqs.append(faq)
     
+    count('dedup.keys_built', len(faqs))
+    count('dedup.duplicates', len(removed_duplicates))
     return unique_faqs, removed_duplicates
 
-def find_similar_questions(faqs: List[Dict[str, Any]], similarity_threshold: float = 0.8) -> List[Dict[str, Any]]:
+def find_similar_questions(faqs: List[Dict[str, Any]], similarity_threshold: float = 0.8,
+                           workers: int = 1, backend: str = 'python') -> List[Dict[str, Any]]:
     """
     Find questions that are very similar but not exact duplicates.
     Uses basic string similarity (Jaccard similarity on words).
+    Candidate pairs come from an inverted token index, so only questions
+    sharing rare words are ever compared. With workers > 1 the candidate
+    scoring runs in a process pool; the result is the same as the serial run.
+    backend='sparse' computes the same pairs with blocked sparse matrix
+    products (requires numpy and scipy).
     """
-    from collections import Counter
-    import re
-    
-    def get_words(text: str) -> set:
-        """Extract words from text."""
-        words = re.findall(r'\b\w+\b', text.lower())
-        return set(words)
-    
-    def jaccard_similarity(set1: set, set2: set) -> float:
-        """Calculate Jaccard similarity between two sets."""
-        if not set1 and not set2:
-            return 1.0
-        if not set1 or not set2:
-            return 0.0
-        intersection = len(set1.intersection(set2))
-        union = len(set1.union(set2))
-        return intersection / union
-    
+    questions = [faq.get('question', '') for faq in faqs]
     similar_pairs = []
     
-    for i, faq1 in enumerate(faqs):
-        words1 = get_words(faq1.get('question', ''))
-        
-        for j, faq2 in enumerate(faqs[i+1:], i+1):
-            words2 = get_words(faq2.get('question', ''))
-            
-            similarity = jaccard_similarity(words1, words2)
-            if similarity >= similarity_threshold:
-                similar_pairs.append({
-                    'index1': i,
-                    'index2': j,
-                    'question1': faq1.get('question', ''),
-                    'question2': faq2.get('question', ''),
-                    'similarity': similarity,
-                    'faq1': faq1,
-                    'faq2': faq2
-                })
+    if backend == 'sparse':
+        from sparse_similarity import find_similar_pairs_sparse
+        pairs = find_similar_pairs_sparse(questions, similarity_threshold)
+    else:
+        pairs = find_similar_pairs(questions, similarity_threshold, workers)
+    
+    count('similarity.questions', len(questions))
+    count('similarity.pairs_found', len(pairs))
+    for i, j, similarity in pairs:
+        similar_pairs.append({
+            'index1': i,
+            'index2': j,
+            'question1': questions[i],
+            'question2': questions[j],
+            'similarity': similarity,
+            'faq1': faqs[i],
+            'faq2': faqs[j]
+        })
     
     return similar_pairs
 
@@ -127,24 +113,76 @@ def save_detailed_log(removed_duplicates: List[Dict[str, Any]], similar_question
     
     print(f"Detailed log saved to: {log_file}")
 
+def _find_similar(args: argparse.Namespace, unique_faqs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Run the similarity method chosen on the command line."""
+    if args.method == 'minhash':
+        from minhash import find_similar_questions_minhash, signature_cache_path
+        return find_similar_questions_minhash(
+            unique_faqs, args.threshold, bands=args.bands, rows=args.rows,
+            include_answer=args.minhash_answer,
+            cache_file=signature_cache_path(args.input)
+        )
+    if args.method == 'embedding':
+        from embeddings import find_similar_questions_embedding, embedding_cache_path
+        return find_similar_questions_embedding(
+            unique_faqs, args.threshold, top_k=args.top_k, embedder_spec=args.embedder,
+            cache_file=embedding_cache_path(args.input)
+        )
+    return find_similar_questions(unique_faqs, args.threshold, args.workers, args.backend)
+
 def main():
     parser = argparse.ArgumentParser(description='Detect and remove duplicate FAQ objects')
     parser.add_argument('--check-answer', action='store_true', 
                        help='Also consider answer field for duplicate detection')
     parser.add_argument('--find-similar', action='store_true',
                        help='Also find similar (but not exact) questions')
+    parser.add_argument('--method', choices=['jaccard', 'minhash', 'embedding'], default='jaccard',
+                       help='Similarity method for --find-similar (default: jaccard)')
+    parser.add_argument('--threshold', type=float, default=0.8,
+                       help='Similarity threshold for --find-similar (default: 0.8)')
+    parser.add_argument('--backend', choices=['python', 'sparse'], default='python',
+                       help='Engine for --method jaccard: inverted index or sparse matrices (default: python)')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Worker processes for --method jaccard (default: 1)')
+    parser.add_argument('--bands', type=int, default=32,
+                       help='Number of LSH bands for --method minhash (default: 32)')
+    parser.add_argument('--rows', type=int, default=4,
+                       help='Rows per LSH band for --method minhash (default: 4)')
+    parser.add_argument('--top-k', type=int, default=5,
+                       help='Most similar partners kept per question for --method embedding (default: 5)')
+    parser.add_argument('--embedder', default='hashing',
+                       help='Embedder name or module:Class for --method embedding (default: hashing)')
+    parser.add_argument('--minhash-answer', action='store_true',
+                       help='Include the answer text in MinHash shingles')
+    parser.add_argument('--fingerprint-store',
+                       help='SQLite fingerprint store; only FAQs added since the last run are checked')
     parser.add_argument('--input', default='data/faqs.json',
-                       help='Input FAQ JSON file (default: data/faqs.json)')
-    parser.add_argument('--output', default='data/faqs_deduplicated.json',
-                       help='Output deduplicated FAQ JSON file')
+                       help='Input FAQ JSON file or sharded corpus directory (default: data/faqs.json)')
+    parser.add_argument('--output',
+                       help='Output deduplicated FAQ JSON file (default: data/faqs_deduplicated.json, '
+                            'or <input>_deduplicated for a sharded corpus)')
+    parser.add_argument('--shards',
+                       help='Comma-separated shards to check in a sharded corpus (default: all)')
     parser.add_argument('--log', default='duplicate_removal_log.json',
                        help='Log file for removed duplicates')
+    add_instrumentation_arguments(parser)
     
     args = parser.parse_args()
+    with instrumented(args, 'detect_duplicates_enhanced'):
+        run(args)
+
+def run(args: argparse.Namespace):
+    if is_sharded(args.input):
+        run_sharded(args)
+        return
+    if args.shards:
+        print(f"Error: --shards needs a sharded corpus directory, not {args.input}")
+        return
+    args.output = args.output or 'data/faqs_deduplicated.json'
     
     # Load the FAQ data
     try:
-        with open(args.input, 'r', encoding='utf-8') as f:
+        with span('load'), open(args.input, 'r', encoding='utf-8') as f:
             faqs = json.load(f)
         print(f"Loaded {len(faqs)} FAQs from {args.input}")
     except FileNotFoundError:
@@ -155,13 +193,21 @@ def main():
         return
     
     # Detect and remove duplicates
-    unique_faqs, removed_duplicates = detect_and_remove_duplicates(faqs, args.check_answer)
+    with span('dedup'):
+        if args.fingerprint_store:
+            from fingerprint_store import FingerprintStore, detect_and_remove_duplicates_incremental
+            with FingerprintStore(args.fingerprint_store) as store:
+                unique_faqs, removed_duplicates = detect_and_remove_duplicates_incremental(
+                    faqs, store, args.check_answer, source_file=args.input)
+        else:
+            unique_faqs, removed_duplicates = detect_and_remove_duplicates(faqs, args.check_answer)
     
     # Find similar questions if requested
     similar_questions = []
     if args.find_similar:
-        print("\nLooking for similar questions...")
-        similar_questions = find_similar_questions(unique_faqs)
+        print(f"\nLooking for similar questions (method: {args.method})...")
+        with span('similarity'):
+            similar_questions = _find_similar(args, unique_faqs)
     
     # Print summary
     print(f"\nDuplicate Detection Summary:")
@@ -173,30 +219,31 @@ def main():
         print(f"  Similar questions found: {len(similar_questions)}")
     
     if removed_duplicates:
-        print(f"\nDuplicate Questions Found:")
+        detail(f"\nDuplicate Questions Found:")
         for i, dup in enumerate(removed_duplicates, 1):
-            print(f"  {i}. '{dup['duplicate_faq']['question']}'")
-            print(f"     (duplicate of FAQ at index {dup['original_index']})")
+            detail(f"  {i}. '{dup['duplicate_faq']['question']}'")
+            detail(f"     (duplicate of FAQ at index {dup['original_index']})")
     else:
         print("\nNo exact duplicates found!")
     
     if similar_questions:
-        print(f"\nSimilar Questions Found:")
+        detail(f"\nSimilar Questions Found:")
         for i, sim in enumerate(similar_questions, 1):
-            print(f"  {i}. Similarity: {sim['similarity']:.2f}")
-            print(f"     Question 1 (index {sim['index1']}): '{sim['question1']}'")
-            print(f"     Question 2 (index {sim['index2']}): '{sim['question2']}'")
+            detail(f"  {i}. Similarity: {sim['similarity']:.2f}")
+            detail(f"     Question 1 (index {sim['index1']}): '{sim['question1']}'")
+            detail(f"     Question 2 (index {sim['index2']}): '{sim['question2']}'")
     
     # Save results
     if removed_duplicates or similar_questions:
-        if removed_duplicates:
-            # Save deduplicated FAQs
-            with open(args.output, 'w', encoding='utf-8') as f:
-                json.dump(unique_faqs, f, indent=2, ensure_ascii=False)
-            print(f"\nDeduplicated FAQs saved to: {args.output}")
-        
-        # Save detailed log
-        save_detailed_log(removed_duplicates, similar_questions, args.log)
+        with span('serialize'):
+            if removed_duplicates:
+                # Save deduplicated FAQs
+                with open(args.output, 'w', encoding='utf-8') as f:
+                    json.dump(unique_faqs, f, indent=2, ensure_ascii=False)
+                print(f"\nDeduplicated FAQs saved to: {args.output}")
+            
+            # Save detailed log
+            save_detailed_log(removed_duplicates, similar_questions, args.log)
         
         if removed_duplicates:
             print(f"\nReview the log file to see details of removed duplicates.")
@@ -204,6 +251,64 @@ def main():
             print(f"  mv {args.output} {args.input}")
     else:
         print("\nNo duplicates or similar questions found, no action needed.")
+    
+    print(f"\nText cache:\n{format_cache_stats()}")
+
+def run_sharded(args: argparse.Namespace):
+    """Deduplicate each shard (in parallel with --workers), then merge keys across shards."""
+    from sharded_corpus import ShardedCorpus, find_shard_duplicates, remove_shard_duplicates
+    
+    corpus = ShardedCorpus(args.input)
+    try:
+        names = corpus.select(args.shards.split(',') if args.shards else None)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+    total = sum(corpus.shards[name]['count'] for name in names)
+    print(f"Loaded manifest of {len(corpus.shards)} shards ({len(corpus)} FAQs) from {args.input}")
+    comparison_type = "question and answer" if args.check_answer else "question only"
+    print(f"Checking for duplicates using: {comparison_type} in {len(names)} shards ({total} FAQs)")
+    
+    with span('dedup'):
+        removed_duplicates = find_shard_duplicates(corpus, args.check_answer, args.workers, names)
+    count('dedup.keys_built', total)
+    count('dedup.duplicates', len(removed_duplicates))
+    
+    similar_questions = []
+    if args.find_similar:
+        print(f"\nLooking for similar questions (method: {args.method})...")
+        removed = {(dup['duplicate_shard'], dup['duplicate_index']) for dup in removed_duplicates}
+        with span('load'):
+            unique_faqs = [faq for name in names for i, faq in enumerate(corpus.iter_faqs([name]))
+                           if (name, i) not in removed]
+        with span('similarity'):
+            similar_questions = _find_similar(args, unique_faqs)
+    
+    cross_shard = sum(1 for dup in removed_duplicates if dup['original_shard'] != dup['duplicate_shard'])
+    print(f"\nDuplicate Detection Summary:")
+    print(f"  Original FAQs: {total}")
+    print(f"  Unique FAQs: {total - len(removed_duplicates)}")
+    print(f"  Duplicates removed: {len(removed_duplicates)} ({cross_shard} across shards)")
+    if args.find_similar:
+        print(f"  Similar questions found: {len(similar_questions)}")
+    
+    if removed_duplicates:
+        detail(f"\nDuplicate Questions Found:")
+        for i, dup in enumerate(removed_duplicates, 1):
+            detail(f"  {i}. '{dup['comparison_key']}' ({dup['duplicate_shard']} #{dup['duplicate_index']})")
+            detail(f"     (duplicate of {dup['original_shard']} #{dup['original_index']})")
+    else:
+        print("\nNo exact duplicates found!")
+    
+    if not (removed_duplicates or similar_questions):
+        print("\nNo duplicates or similar questions found, no action needed.")
+        return
+    output = args.output or f"{args.input.rstrip(os.sep)}_deduplicated"
+    with span('serialize'):
+        if removed_duplicates:
+            remove_shard_duplicates(corpus, removed_duplicates, output, args.workers)
+            print(f"\nDeduplicated corpus saved to: {output}")
+        save_detailed_log(removed_duplicates, similar_questions, args.log)
 
 if __name__ == '__main__':
     main()
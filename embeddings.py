@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+Offline FAQ embeddings and approximate nearest-neighbour search.
+Computes an embedding for every FAQ with a pluggable local embedder, stores
+them as a float32 .npy matrix that is memory-mapped on load, and builds an
+IVF (inverted file) index for fast cosine-similarity lookup.
+
+Usage:
+    python embeddings.py build --input data/faqs.json
+    python embeddings.py query "can I rent a bike"
+"""
+
+import argparse
+import hashlib
+import importlib
+import json
+import os
+import re
+import sys
+import zlib
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional for the other scripts
+    np = None
+
+from load_faqs import iter_faqs
+
+_WORD_PATTERN = re.compile(r'\w+')
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("Embeddings require numpy (pip install numpy)")
+
+
+class HashingEmbedder:
+    """
+    Deterministic bag-of-features embedder that runs offline.
+
+    Word unigrams and bigrams are hashed into `dimension` signed buckets
+    (the hashing trick). With use_idf=True, bucket weights are scaled by an
+    inverse document frequency fitted on the corpus, giving a hashed TF-IDF
+    vector. Outputs are L2-normalized float32 rows.
+    """
+
+    name = 'hashing'
+
+    def __init__(self, dimension: int = 256, use_idf: bool = True, idf: Optional[Sequence[float]] = None):
+        _require_numpy()
+        self.dimension = dimension
+        self.use_idf = use_idf
+        self.idf = np.asarray(idf, dtype=np.float32) if idf is not None else None
+
+    @staticmethod
+    def features(text: str) -> List[str]:
+        words = _WORD_PATTERN.findall(text.lower())
+        return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+    def _bucket(self, feature: str) -> Tuple[int, float]:
+        h = zlib.crc32(feature.encode('utf-8'))
+        return h % self.dimension, (1.0 if (h >> 31) & 1 else -1.0)
+
+    def _raw(self, texts: Sequence[str]) -> 'np.ndarray':
+        matrix = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self.features(text):
+                bucket, sign = self._bucket(feature)
+                matrix[row, bucket] += sign
+        return matrix
+
+    def fit(self, texts: Sequence[str]) -> 'HashingEmbedder':
+        """Fit bucket IDF weights on a corpus (no-op when use_idf is False)."""
+        if self.use_idf:
+            document_frequency = np.count_nonzero(self._raw(texts), axis=0)
+            self.idf = (np.log((1 + len(texts)) / (1 + document_frequency)) + 1).astype(np.float32)
+        return self
+
+    def embed(self, texts: Sequence[str]) -> 'np.ndarray':
+        """Embed texts as L2-normalized float32 rows."""
+        matrix = self._raw(texts)
+        if self.use_idf and self.idf is not None:
+            matrix *= self.idf
+        return l2_normalize(matrix)
+
+    def config(self) -> Dict[str, Any]:
+        """JSON-serializable constructor options needed to embed queries consistently."""
+        return {
+            'dimension': self.dimension,
+            'use_idf': self.use_idf,
+            'idf': self.idf.tolist() if self.idf is not None else None,
+        }
+
+
+EMBEDDERS = {
+    HashingEmbedder.name: HashingEmbedder,
+}
+
+
+def load_embedder(spec: str, **options) -> Any:
+    """
+    Resolve an embedder by registered name or as 'module:Class' for a local
+    model wrapper. Custom embedders need dimension, fit(texts), embed(texts)
+    returning float32 rows, and config() returning their constructor options.
+    """
+    if spec in EMBEDDERS:
+        return EMBEDDERS[spec](**options)
+    if ':' not in spec:
+        raise ValueError(f"Unknown embedder '{spec}' (choose from: {', '.join(EMBEDDERS)}, or module:Class)")
+    module_name, attribute = spec.split(':', 1)
+    return getattr(importlib.import_module(module_name), attribute)(**options)
+
+
+def embedder_from_config(config: Dict[str, Any]) -> Any:
+    """Recreate the embedder that produced a stored matrix."""
+    return load_embedder(config['spec'], **config['options'])
+
+
+def l2_normalize(matrix: 'np.ndarray') -> 'np.ndarray':
+    """Scale rows to unit length (zero rows stay zero)."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32)
+
+
+def faq_embedding_text(faq: Dict[str, Any]) -> str:
+    """Text embedded for one FAQ: question plus keywords."""
+    return ' '.join([faq.get('question', '')] + list(faq.get('keywords', [])))
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def embedding_paths(faq_file: str) -> Dict[str, str]:
+    """Artifact locations next to the FAQ file."""
+    root = os.path.splitext(faq_file)[0]
+    return {
+        'matrix': f"{root}.embeddings.npy",
+        'meta': f"{root}.embeddings.json",
+        'ivf': f"{root}.ivf.npz",
+    }
+
+
+def save_embeddings(paths: Dict[str, str], matrix: 'np.ndarray', embedder_spec: str, embedder: Any,
+                    texts: Sequence[str]) -> None:
+    """Write the float32 matrix as .npy and its metadata as JSON."""
+    output = np.lib.format.open_memmap(paths['matrix'], mode='w+', dtype=np.float32, shape=matrix.shape)
+    output[:] = matrix
+    output.flush()
+    del output
+    meta = {
+        'embedder': {'spec': embedder_spec, 'options': embedder.config()},
+        'count': int(matrix.shape[0]),
+        'dimension': int(matrix.shape[1]),
+        'content_hashes': [content_hash(text) for text in texts],
+    }
+    with open(paths['meta'], 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+
+
+def load_embeddings(paths: Dict[str, str]) -> Tuple['np.ndarray', Dict[str, Any]]:
+    """Memory-map the stored matrix (read-only) and load its metadata."""
+    _require_numpy()
+    with open(paths['meta'], 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+    return np.load(paths['matrix'], mmap_mode='r'), meta
+
+
+class IVFIndex:
+    """
+    Inverted-file ANN index for unit vectors.
+
+    Vectors are clustered with spherical k-means; each query scans only the
+    n_probe clusters whose centroids are closest, then ranks those vectors by
+    exact cosine similarity.
+    """
+
+    def __init__(self, centroids: 'np.ndarray', order: 'np.ndarray', offsets: 'np.ndarray'):
+        self.centroids = centroids
+        self.order = order
+        self.offsets = offsets
+
+    @classmethod
+    def build(cls, vectors: 'np.ndarray', n_lists: Optional[int] = None,
+              iterations: int = 10, seed: int = 0) -> 'IVFIndex':
+        _require_numpy()
+        count = vectors.shape[0]
+        if count == 0:
+            return cls(np.zeros((0, vectors.shape[1]), dtype=np.float32),
+                       np.empty(0, dtype=np.int64), np.zeros(1, dtype=np.int64))
+        if n_lists is None:
+            n_lists = max(1, int(np.sqrt(count)))
+        n_lists = max(1, min(n_lists, count))
+        rng = np.random.RandomState(seed)
+        centroids = np.array(vectors[rng.choice(count, n_lists, replace=False)], dtype=np.float32)
+        for _ in range(iterations):
+            assignment = np.argmax(vectors @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, vectors)
+            # Clusters that lost every member keep their previous centroid
+            occupied = np.bincount(assignment, minlength=n_lists) > 0
+            centroids[occupied] = sums[occupied]
+            centroids = l2_normalize(centroids)
+        assignment = np.argmax(vectors @ centroids.T, axis=1)
+        order = np.argsort(assignment, kind='stable').astype(np.int64)
+        offsets = np.searchsorted(assignment[order], np.arange(n_lists + 1)).astype(np.int64)
+        return cls(centroids, order, offsets)
+
+    def save(self, file_path: str) -> None:
+        np.savez(file_path, centroids=self.centroids, order=self.order, offsets=self.offsets)
+
+    @classmethod
+    def load(cls, file_path: str) -> 'IVFIndex':
+        _require_numpy()
+        with np.load(file_path) as data:
+            return cls(data['centroids'], data['order'], data['offsets'])
+
+    def search(self, vectors: 'np.ndarray', query: 'np.ndarray', k: int = 5,
+               n_probe: int = 4) -> List[Tuple[int, float]]:
+        """Top-k (row, cosine similarity) pairs among the probed clusters."""
+        n_probe = min(n_probe, len(self.centroids))
+        nearest_lists = np.argsort(-(self.centroids @ query), kind='stable')[:n_probe]
+        rows = np.concatenate([self.order[self.offsets[c]:self.offsets[c + 1]] for c in nearest_lists])
+        if not len(rows):
+            return []
+        rows.sort()
+        similarities = np.asarray(vectors[rows]) @ query
+        top = np.argsort(-similarities, kind='stable')[:k]
+        return [(int(rows[i]), float(similarities[i])) for i in top]
+
+
+def brute_force_search(vectors: 'np.ndarray', query: 'np.ndarray', k: int = 5) -> List[Tuple[int, float]]:
+    """Exact top-k cosine similarity over every row."""
+    similarities = np.asarray(vectors) @ query
+    top = np.argsort(-similarities, kind='stable')[:k]
+    return [(int(i), float(similarities[i])) for i in top]
+
+
+class EmbeddingSearch:
+    """
+    Query API over stored FAQ embeddings and their IVF index.
+
+    Raises ValueError when the stored embeddings were not built from the
+    current FAQ file (entries edited, inserted or removed), since result
+    rows would then point at the wrong FAQs.
+    """
+
+    def __init__(self, faq_file: str):
+        self.paths = embedding_paths(faq_file)
+        self.vectors, self.meta = load_embeddings(self.paths)
+        self.faqs = list(iter_faqs(faq_file))
+        hashes = [content_hash(faq_embedding_text(faq)) for faq in self.faqs]
+        if hashes != self.meta.get('content_hashes') or len(hashes) != self.vectors.shape[0]:
+            raise ValueError(f"Embeddings in {self.paths['matrix']} are stale for {faq_file}; "
+                             f"rebuild them with: python embeddings.py build --input {faq_file}")
+        self.embedder = embedder_from_config(self.meta['embedder'])
+        self.ivf = IVFIndex.load(self.paths['ivf'])
+
+    def search(self, text: str, k: int = 5, n_probe: int = 4, exact: bool = False) -> List[Tuple[int, float]]:
+        """Top-k (FAQ index, cosine similarity) for a free-text query."""
+        query = self.embedder.embed([text])[0]
+        if exact:
+            return brute_force_search(self.vectors, query, k)
+        return self.ivf.search(self.vectors, query, k, n_probe)
+
+
+def embedding_cache_path(faq_file: str) -> str:
+    """Location of the content-hash embedding cache for a FAQ file."""
+    return f"{faq_file}.embedding-cache.npz"
+
+
+class EmbeddingCache:
+    """
+    Embeddings keyed by a hash of the embedder settings plus the text, so a
+    rerun only embeds texts that changed. Saving keeps only the entries used
+    by the latest run, which bounds the cache to the corpus size.
+    """
+
+    def __init__(self, embedder_spec: str, embedder: Any, cache_file: Optional[str] = None):
+        _require_numpy()
+        self.embedder = embedder
+        self.cache_file = cache_file
+        self.prefix = f"{embedder_spec}:{json.dumps(embedder.config(), sort_keys=True)}:"
+        self.entries: Dict[str, 'np.ndarray'] = {}
+        self.used_keys: List[str] = []
+        self.hits = 0
+        self.misses = 0
+        if cache_file and os.path.exists(cache_file):
+            try:
+                with np.load(cache_file) as data:
+                    self.entries = dict(zip(data['hashes'].tolist(), data['vectors']))
+            except (OSError, KeyError, ValueError) as e:
+                print(f"Ignoring unreadable embedding cache {cache_file}: {e}")
+
+    def key(self, text: str) -> str:
+        return content_hash(self.prefix + text)
+
+    def embed(self, texts: Sequence[str], batch_size: int = 1024) -> 'np.ndarray':
+        """L2-normalized float32 matrix for texts, embedding cache misses in batches."""
+        keys = [self.key(text) for text in texts]
+        pending: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in self.entries:
+                pending.setdefault(key, text)
+        pending_items = list(pending.items())
+        for start in range(0, len(pending_items), batch_size):
+            batch = pending_items[start:start + batch_size]
+            vectors = l2_normalize(np.asarray(self.embedder.embed([text for _, text in batch]), dtype=np.float32))
+            for (key, _), vector in zip(batch, vectors):
+                self.entries[key] = vector
+        self.misses += len(pending_items)
+        self.hits += len(keys) - len(pending_items)
+
+        dimension = self.embedder.dimension
+        matrix = np.empty((len(texts), dimension), dtype=np.float32)
+        for row, key in enumerate(keys):
+            matrix[row] = self.entries[key]
+        self.used_keys = keys
+        return matrix
+
+    def save(self) -> None:
+        """Write the entries used by the last embed() call."""
+        if not self.cache_file:
+            return
+        keys = list(dict.fromkeys(self.used_keys))
+        vectors = np.array([self.entries[key] for key in keys], dtype=np.float32).reshape(len(keys), -1)
+        np.savez(self.cache_file, hashes=np.array(keys), vectors=vectors)
+
+
+def find_similar_pairs_embedding(vectors: 'np.ndarray', similarity_threshold: float = 0.8,
+                                 top_k: int = 5, block_size: int = 1024) -> List[Tuple[int, int, float]]:
+    """
+    Pairs (index1, index2, cosine) with index1 < index2 and cosine at or above
+    the threshold, keeping at most top_k partners per index1.
+
+    Similarities are computed one block of rows at a time (block x n), so the
+    full n x n matrix never exists.
+    """
+    total = vectors.shape[0]
+    pairs: List[Tuple[int, int, float]] = []
+    for start in range(0, total, block_size):
+        stop = min(start + block_size, total)
+        similarities = vectors[start:stop] @ vectors.T
+        for offset, row in enumerate(similarities):
+            i = start + offset
+            later = row[i + 1:]
+            candidates = np.flatnonzero(later >= similarity_threshold)
+            if len(candidates) > top_k:
+                best = np.argpartition(-later[candidates], top_k - 1)[:top_k]
+                candidates = np.sort(candidates[best])
+            pairs.extend((i, i + 1 + int(j), float(later[j])) for j in candidates)
+    return pairs
+
+
+def find_similar_questions_embedding(faqs: List[Dict[str, Any]], similarity_threshold: float = 0.8,
+                                     top_k: int = 5, embedder_spec: str = 'hashing',
+                                     batch_size: int = 1024,
+                                     cache_file: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Embedding counterpart of find_similar_questions. Returns pairs in the
+    same format, with 'similarity' holding the cosine similarity of the
+    question embeddings.
+    """
+    options = {'use_idf': False} if embedder_spec == HashingEmbedder.name else {}
+    cache = EmbeddingCache(embedder_spec, load_embedder(embedder_spec, **options), cache_file)
+    questions = [faq.get('question', '') for faq in faqs]
+    vectors = cache.embed(questions, batch_size)
+    print(f"Embedded {cache.misses} questions ({cache.hits} reused from cache)")
+    cache.save()
+
+    similar_pairs = []
+    for i, j, similarity in find_similar_pairs_embedding(vectors, similarity_threshold, top_k):
+        similar_pairs.append({
+            'index1': i,
+            'index2': j,
+            'question1': questions[i],
+            'question2': questions[j],
+            'similarity': similarity,
+            'faq1': faqs[i],
+            'faq2': faqs[j]
+        })
+    return similar_pairs
+
+
+def build_embeddings(faq_file: str, embedder_spec: str = 'hashing', dimension: int = 256,
+                     n_lists: Optional[int] = None) -> Dict[str, str]:
+    """Embed every FAQ in faq_file and write the matrix, metadata and IVF index."""
+    _require_numpy()
+    texts = [faq_embedding_text(faq) for faq in iter_faqs(faq_file)]
+    embedder = load_embedder(embedder_spec, dimension=dimension).fit(texts)
+    matrix = embedder.embed(texts)
+    paths = embedding_paths(faq_file)
+    save_embeddings(paths, matrix, embedder_spec, embedder, texts)
+    IVFIndex.build(matrix, n_lists).save(paths['ivf'])
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build or query offline FAQ embeddings')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build = subparsers.add_parser('build', help='Embed every FAQ and build the ANN index')
+    build.add_argument('--input', default='data/faqs.json',
+                       help='Input FAQ file (default: data/faqs.json)')
+    build.add_argument('--embedder', default='hashing',
+                       help="Embedder name or module:Class (default: hashing)")
+    build.add_argument('--dimension', type=int, default=256,
+                       help='Embedding dimension (default: 256)')
+    build.add_argument('--lists', type=int,
+                       help='Number of IVF lists (default: sqrt of the FAQ count)')
+    query = subparsers.add_parser('query', help='Find the FAQs closest to a query')
+    query.add_argument('text', help='Query text')
+    query.add_argument('--input', default='data/faqs.json',
+                       help='FAQ file the embeddings were built from (default: data/faqs.json)')
+    query.add_argument('--top', type=int, default=5,
+                       help='Number of results (default: 5)')
+    query.add_argument('--probe', type=int, default=4,
+                       help='IVF lists to scan (default: 4)')
+    query.add_argument('--exact', action='store_true',
+                       help='Use brute-force cosine similarity instead of the IVF index')
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        paths = build_embeddings(args.input, args.embedder, args.dimension, args.lists)
+        print(f"Embeddings saved to: {paths['matrix']}")
+        print(f"Metadata saved to: {paths['meta']}")
+        print(f"IVF index saved to: {paths['ivf']}")
+    else:
+        try:
+            search = EmbeddingSearch(args.input)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return 1
+        for rank, (faq_id, similarity) in enumerate(search.search(args.text, args.top, args.probe, args.exact), 1):
+            print(f"  {rank}. [{faq_id}] {similarity:.3f} {search.faqs[faq_id].get('question', '')}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Prebuilt search index for FAQ lookup.
+Builds an artifact from faqs.json holding lowercased questions, a
+keyword -> FAQ id map and question token postings, and answers
+searchFaq-style queries (src/lib/faq.ts) from it without touching every FAQ.
+
+Usage:
+    python faq_index.py build --input data/faqs.json --output data/faqs.index.json
+    python faq_index.py query "can I rent a bicycle"
+"""
+
+import argparse
+import hashlib
+import json
+import re
+from collections import defaultdict
+from typing import List, Dict, Any, Optional, Set
+
+from load_faqs import iter_faqs
+
+INDEX_VERSION = 2
+
+_FNV_OFFSET = 0x811c9dc5
+_FNV_PRIME = 0x01000193
+
+_TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def source_hash(file_path: str) -> str:
+    """SHA-1 of the FAQ file the index is built from."""
+    digest = hashlib.sha1()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def content_hash(faqs: List[Dict[str, Any]]) -> str:
+    """
+    32-bit FNV-1a over the UTF-16 code units of every question and keyword,
+    the same value contentHash() in src/lib/faq.ts computes from faqs.json.
+    The app uses it to detect an index built from other questions or
+    keywords, even when the FAQ count is unchanged.
+    """
+    value = _FNV_OFFSET
+
+    def feed(units) -> None:
+        nonlocal value
+        for unit in units:
+            value = ((value ^ unit) * _FNV_PRIME) & 0xffffffff
+
+    for faq in faqs:
+        feed((1,))
+        for text in [faq.get('question', ''), *faq.get('keywords', [])]:
+            feed(memoryview(text.encode('utf-16-le')).cast('H'))
+            feed((0,))
+    return f"{value:08x}"
+
+
+def build_search_index(faqs: List[Dict[str, Any]], source: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Build the search index artifact.
+
+    Keyword ids repeat when a FAQ lists the same keyword twice, because
+    searchFaq scores every keyword entry separately.
+
+    Args:
+        faqs: List of FAQ objects in corpus order (ids are list positions)
+        source: Hash of the source file, stored for staleness checks
+
+    Returns:
+        Dict with 'contentHash', 'questions', 'keywordIndex' and 'tokenPostings'
+    """
+    questions = []
+    keyword_index: Dict[str, List[int]] = defaultdict(list)
+    token_postings: Dict[str, List[int]] = defaultdict(list)
+
+    for faq_id, faq in enumerate(faqs):
+        question = faq.get('question', '').lower()
+        questions.append(question)
+        for keyword in faq.get('keywords', []):
+            keyword_index[keyword.lower()].append(faq_id)
+        for token in sorted(set(_TOKEN_PATTERN.findall(question))):
+            token_postings[token].append(faq_id)
+
+    return {
+        'version': INDEX_VERSION,
+        'sourceHash': source,
+        'count': len(faqs),
+        'contentHash': content_hash(faqs),
+        'questions': questions,
+        'keywordIndex': dict(keyword_index),
+        'tokenPostings': dict(token_postings),
+    }
+
+
+class FaqSearchIndex:
+    """
+    Reference query engine over a search index artifact.
+
+    Scoring matches searchFaq: +2 when the query is a substring of the
+    question, +1 for every keyword that is a substring of the query, ties
+    broken by corpus order. Python's str.lower() stands in for JavaScript's
+    toLowerCase(); they agree outside a few special-cased Unicode letters.
+    """
+
+    def __init__(self, artifact: Dict[str, Any]):
+        if artifact.get('version') != INDEX_VERSION:
+            raise ValueError(f"Unsupported search index version: {artifact.get('version')}")
+        self.questions: List[str] = artifact['questions']
+        self.keyword_index: Dict[str, List[int]] = artifact['keywordIndex']
+        self.token_postings: Dict[str, List[int]] = artifact['tokenPostings']
+        self.source_hash: Optional[str] = artifact.get('sourceHash')
+        # Only substrings with a keyword's length can be keywords
+        self.keyword_lengths = sorted({len(keyword) for keyword in self.keyword_index if keyword})
+        self.empty_keyword_ids = self.keyword_index.get('', [])
+
+    @classmethod
+    def load(cls, file_path: str) -> 'FaqSearchIndex':
+        with open(file_path, 'r', encoding='utf-8') as file:
+            return cls(json.load(file))
+
+    def _matching_keywords(self, query: str) -> Set[str]:
+        """Distinct keywords occurring in the query, found by probing its substrings."""
+        found = set()
+        for start in range(len(query)):
+            for length in self.keyword_lengths:
+                if start + length > len(query):
+                    break
+                candidate = query[start:start + length]
+                if candidate in self.keyword_index:
+                    found.add(candidate)
+        return found
+
+    def _question_candidates(self, query: str) -> List[int]:
+        """
+        FAQ ids whose question could contain the query. A word fully enclosed
+        by non-word characters inside the query must be a whole token of any
+        question containing it, so its posting list bounds the candidates.
+        """
+        enclosed = [
+            match.group() for match in _TOKEN_PATTERN.finditer(query)
+            if match.start() > 0 and match.end() < len(query)
+        ]
+        if not enclosed:
+            return range(len(self.questions))
+        postings = [self.token_postings.get(token, []) for token in enclosed]
+        return min(postings, key=len)
+
+    def scores(self, query: str) -> Dict[int, int]:
+        """Score of every FAQ with a positive score."""
+        q = query.lower()
+        scores: Dict[int, int] = defaultdict(int)
+
+        for faq_id in self._question_candidates(q):
+            if q in self.questions[faq_id]:
+                scores[faq_id] += 2
+
+        for keyword in self._matching_keywords(q):
+            for faq_id in self.keyword_index[keyword]:
+                scores[faq_id] += 1
+        for faq_id in self.empty_keyword_ids:
+            scores[faq_id] += 1
+        return scores
+
+    def search(self, query: str, top_n: int = 3) -> List[int]:
+        """Ids of the top_n best-scoring FAQs, as searchFaq would order them."""
+        ranked = sorted(self.scores(query).items(), key=lambda item: (-item[1], item[0]))
+        return [faq_id for faq_id, _ in ranked[:top_n]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build or query the prebuilt FAQ search index')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build = subparsers.add_parser('build', help='Build the search index artifact')
+    build.add_argument('--input', default='data/faqs.json',
+                       help='Input FAQ JSON file (default: data/faqs.json)')
+    build.add_argument('--output', default='data/faqs.index.json',
+                       help='Output index file (default: data/faqs.index.json)')
+    query = subparsers.add_parser('query', help='Search the index like searchFaq')
+    query.add_argument('text', help='Query text')
+    query.add_argument('--index', default='data/faqs.index.json',
+                       help='Index file (default: data/faqs.index.json)')
+    query.add_argument('--input', default='data/faqs.json',
+                       help='FAQ file the index was built from (default: data/faqs.json)')
+    query.add_argument('--top', type=int, default=3,
+                       help='Number of results (default: 3)')
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        faqs = list(iter_faqs(args.input))
+        artifact = build_search_index(faqs, source_hash(args.input))
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(artifact, f, ensure_ascii=False, separators=(',', ':'))
+        print(f"Search index for {len(faqs)} FAQs saved to: {args.output}")
+        print(f"  Distinct keywords: {len(artifact['keywordIndex'])}")
+        print(f"  Distinct question tokens: {len(artifact['tokenPostings'])}")
+    else:
+        index = FaqSearchIndex.load(args.index)
+        if index.source_hash != source_hash(args.input):
+            print(f"Warning: {args.index} is stale, rebuild it with: python faq_index.py build")
+        faqs = list(iter_faqs(args.input))
+        for rank, faq_id in enumerate(index.search(args.text, args.top), 1):
+            print(f"  {rank}. [{faq_id}] {faqs[faq_id].get('question', '')}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Compiled binary snapshot of a FAQ file for fast random access.
+
+The snapshot (<file>.snapshot) sits next to the JSON file and is opened with
+mmap, so opening it reads only the header. It holds:
+    - every FAQ as compact JSON inside one JSON array, with the byte offset
+      of each entry, so a single entry decodes on its own
+    - a string table of the normalized categories and the question tokens
+    - per-FAQ string ids of the category and the token ids of its question,
+      as fixed-width arrays
+
+The header records the size, mtime and SHA-1 of the source file and the
+text normalizer fingerprint. load_faq_at() reads single entries from a
+fresh snapshot and falls back to the JSON whenever it is missing or stale;
+precomputed categories and tokens are only trusted when the normalizer is
+unchanged. Loading or deduplicating the whole corpus is no faster from the
+snapshot than from the JSON (building every dict dominates either way), so
+those paths keep reading the JSON.
+
+Usage:
+    python faq_snapshot.py build data/faqs.json
+    python faq_snapshot.py info data/faqs.json
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+from array import array
+from typing import List, Dict, Any, Iterator, Optional
+
+SNAPSHOT_MAGIC = b'FAQSNAP\x00'
+SNAPSHOT_VERSION = 2
+
+# Magic, version, FAQ count, string count, source size, source mtime_ns,
+# source SHA-1, normalizer fingerprint, then (offset, length) of each section
+_HEADER = struct.Struct('<8sIIIQQ20s40s' + 'QQ' * 6)
+_SECTIONS = ('records', 'record_offsets', 'strings', 'string_offsets', 'fields', 'tokens')
+# Per FAQ: string id of the normalized category, then its first token
+_FIELDS = 2
+
+
+def snapshot_path(file_path: str) -> str:
+    """Location of the binary snapshot for a FAQ file."""
+    return f"{file_path}.snapshot"
+
+
+def file_sha1(file_path: str) -> bytes:
+    digest = hashlib.sha1()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.digest()
+
+
+class _StringTable:
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.data = bytearray()
+        self.offsets = array('Q', [0])
+
+    def intern(self, text: str) -> int:
+        string_id = self.ids.get(text)
+        if string_id is None:
+            string_id = self.ids[text] = len(self.offsets) - 1
+            self.data += text.encode('utf-8')
+            self.offsets.append(len(self.data))
+        return string_id
+
+
+def build_snapshot(file_path: str, output_file: Optional[str] = None) -> str:
+    """
+    Compile a FAQ file into a snapshot.
+
+    Returns:
+        The snapshot path
+    """
+    from load_faqs import fsync_directory, iter_faqs
+    from text_processing import get_words, normalize_category, normalizer_fingerprint
+
+    output_file = output_file or snapshot_path(file_path)
+    stat = os.stat(file_path)
+    source_digest = file_sha1(file_path)
+
+    records = bytearray(b'[')
+    record_offsets = array('Q')
+    strings = _StringTable()
+    fields = array('I')
+    tokens = array('I')
+    for faq in iter_faqs(file_path):
+        if record_offsets:
+            records += b','
+        record_offsets.append(len(records))
+        records += json.dumps(faq, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        fields.extend((strings.intern(normalize_category(faq.get('category', ''))), len(tokens)))
+        tokens.extend(sorted(strings.intern(token) for token in get_words(faq.get('question', ''))))
+    # Entries end one byte before the next offset (a comma, or the closing bracket)
+    records += b']'
+    record_offsets.append(len(records))
+    fields.extend((0, len(tokens)))
+
+    sections = [bytes(records), record_offsets.tobytes(), bytes(strings.data), strings.offsets.tobytes(),
+                fields.tobytes(), tokens.tobytes()]
+    placement = []
+    position = _HEADER.size
+    for section in sections:
+        # Keep every array 8-byte aligned within the file
+        position += -position % 8
+        placement.extend((position, len(section)))
+        position += len(section)
+
+    header = _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(record_offsets) - 1, len(strings.offsets) - 1,
+                          stat.st_size, stat.st_mtime_ns, source_digest,
+                          normalizer_fingerprint().encode('ascii'), *placement)
+    temp_path = f"{output_file}.tmp"
+    with open(temp_path, 'wb') as file:
+        file.write(header)
+        for offset, section in zip(placement[::2], sections):
+            file.write(b'\x00' * (offset - file.tell()))
+            file.write(section)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, output_file)
+    fsync_directory(os.path.dirname(os.path.abspath(output_file)))
+    return output_file
+
+
+class FaqSnapshot:
+    """
+    Memory-mapped, read-only view of a snapshot.
+
+    Sections are decoded on first use, so opening one costs a header read
+    and entries are only parsed when they are accessed.
+    """
+
+    def __init__(self, snapshot_file: str):
+        self.snapshot_file = snapshot_file
+        with open(snapshot_file, 'rb') as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (magic, version, self.count, self.string_count, self.source_size, self.source_mtime_ns,
+             self.source_sha1, fingerprint, *placement) = _HEADER.unpack_from(self._map)
+        except struct.error:
+            self._map.close()
+            raise ValueError(f"Truncated snapshot: {snapshot_file}")
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            self._map.close()
+            raise ValueError(f"Not a version {SNAPSHOT_VERSION} FAQ snapshot: {snapshot_file}")
+        if any(offset + length > len(self._map) for offset, length in zip(placement[::2], placement[1::2])):
+            self._map.close()
+            raise ValueError(f"Truncated snapshot: {snapshot_file}")
+        self.normalizer_fingerprint = fingerprint.decode('ascii')
+        self._view = view = memoryview(self._map)
+        sections = {name: view[offset:offset + length]
+                    for name, offset, length in zip(_SECTIONS, placement[::2], placement[1::2])}
+        self._records = sections['records']
+        self._record_offsets = sections['record_offsets'].cast('Q')
+        self._strings = sections['strings']
+        self._string_offsets = sections['string_offsets'].cast('Q')
+        self._fields = sections['fields'].cast('I')
+        self._tokens = sections['tokens'].cast('I')
+        self._normalizer_current: Optional[bool] = None
+
+    @classmethod
+    def open(cls, file_path: str) -> Optional['FaqSnapshot']:
+        """The snapshot of a FAQ file, or None if there is none or it is stale."""
+        try:
+            snapshot = cls(snapshot_path(file_path))
+        except (OSError, ValueError):
+            return None
+        if snapshot.is_current(file_path):
+            return snapshot
+        snapshot.close()
+        return None
+
+    def is_current(self, file_path: str) -> bool:
+        """
+        Whether the snapshot was built from this version of the file. The size
+        and mtime decide; a file that was only touched is confirmed by hash.
+        """
+        stat = os.stat(file_path)
+        if stat.st_size != self.source_size:
+            return False
+        return stat.st_mtime_ns == self.source_mtime_ns or file_sha1(file_path) == self.source_sha1
+
+    def close(self) -> None:
+        for view in (self._records, self._record_offsets, self._strings, self._string_offsets,
+                     self._fields, self._tokens, self._view):
+            view.release()
+        self._map.close()
+
+    def __enter__(self) -> 'FaqSnapshot':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        """Decode entry N on its own."""
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError(f"FAQ index {index} out of range")
+        start, end = self._record_offsets[index], self._record_offsets[index + 1] - 1
+        return json.loads(self._records[start:end].tobytes())
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for index in range(self.count):
+            yield self[index]
+
+    def load_all(self) -> List[Dict[str, Any]]:
+        """Every FAQ, decoded from the compact array in one call."""
+        return json.loads(self._records.tobytes())
+
+    def string(self, string_id: int) -> str:
+        return self._strings[self._string_offsets[string_id]:self._string_offsets[string_id + 1]].tobytes().decode('utf-8')
+
+    def _precomputed(self) -> bool:
+        """Whether the stored categories and tokens match the current normalizer."""
+        if self._normalizer_current is None:
+            from text_processing import normalizer_fingerprint
+            self._normalizer_current = self.normalizer_fingerprint == normalizer_fingerprint()
+        return self._normalizer_current
+
+    def category(self, index: int) -> str:
+        """Normalized category of entry N."""
+        if not self._precomputed():
+            from text_processing import normalize_category
+            return normalize_category(self[index].get('category', ''))
+        return self.string(self._fields[index * _FIELDS])
+
+    def token_ids(self, index: int) -> List[int]:
+        """String ids of the question tokens of entry N, ascending."""
+        start = self._fields[index * _FIELDS + 1]
+        return self._tokens[start:self._fields[(index + 1) * _FIELDS + 1]].tolist()
+
+    def question_tokens(self, index: int) -> frozenset:
+        """get_words of the question of entry N."""
+        if not self._precomputed():
+            from text_processing import get_words
+            return get_words(self[index].get('question', ''))
+        return frozenset(self.string(token_id) for token_id in self.token_ids(index))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build or inspect the binary snapshot of a FAQ file')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build = subparsers.add_parser('build', help='Compile the FAQ file into <file>.snapshot')
+    build.add_argument('input', nargs='?', default='data/faqs.json',
+                       help='FAQ JSON file (default: data/faqs.json)')
+    info = subparsers.add_parser('info', help='Show whether the snapshot is current')
+    info.add_argument('input', nargs='?', default='data/faqs.json',
+                      help='FAQ JSON file (default: data/faqs.json)')
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        output_file = build_snapshot(args.input)
+        print(f"Snapshot saved to: {output_file} ({os.path.getsize(output_file)} bytes)")
+        return
+    try:
+        snapshot = FaqSnapshot(snapshot_path(args.input))
+    except (OSError, ValueError) as e:
+        print(f"No usable snapshot for {args.input}: {e}")
+        return
+    with snapshot:
+        state = 'current' if snapshot.is_current(args.input) else 'stale, rebuild it with: python faq_snapshot.py build'
+        print(f"Snapshot {snapshot.snapshot_file}: {len(snapshot)} FAQs, {snapshot.string_count} strings, {state}")
+        if not snapshot._precomputed():
+            print("  Precomputed categories and tokens predate the current normalizer and are recomputed on use")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Compact columnar in-memory representation of a FAQ corpus.
+
+FaqStore keeps FAQs as columns instead of one dict per entry: categories are
+dictionary-encoded as integer codes, question and answer text live in
+contiguous UTF-8 buffers with offsets, and keywords are one flattened buffer
+with per-entry offsets. Rows are read back through lightweight dict-like
+views, so code written against load_faqs can use a store unchanged.
+
+Usage:
+    store = FaqStore.load('data/faqs.json')
+    store.category_counts()
+    store[0]['question']
+"""
+
+import sys
+from array import array
+from collections import Counter
+from collections.abc import Mapping
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+
+from load_faqs import iter_faqs
+
+# Code stored for entries without a (string) category
+_NO_CATEGORY = 0xFFFFFFFF
+
+
+class _TextColumn:
+    """Strings concatenated into one UTF-8 buffer, addressed by offsets."""
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.offsets = array('Q', [0])
+
+    def append(self, text: str) -> None:
+        self.buffer += text.encode('utf-8')
+        self.offsets.append(len(self.buffer))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        return self.buffer[self.offsets[index]:self.offsets[index + 1]].decode('utf-8')
+
+    def nbytes(self) -> int:
+        return len(self.buffer) + self.offsets.itemsize * len(self.offsets)
+
+
+class FaqRow(Mapping):
+    """Read-only dict-like view of one FAQ in a FaqStore."""
+
+    __slots__ = ('_store', '_index')
+
+    def __init__(self, store: 'FaqStore', index: int):
+        self._store = store
+        self._index = index
+
+    def __getitem__(self, key: str) -> Any:
+        return self._store._value(self._index, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._store._layout(self._index))
+
+    def __len__(self) -> int:
+        return len(self._store._layout(self._index))
+
+    def __repr__(self) -> str:
+        return f"FaqRow({self.to_dict()!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """A plain dict copy of this FAQ, with keys in their original order."""
+        return {key: self[key] for key in self}
+
+
+class FaqStore:
+    """
+    Column-oriented FAQ corpus.
+
+    The category, question, answer and keywords fields are stored in columns
+    when they have their usual types (strings, and a list of strings for
+    keywords). Any other field, or a usual field with an unusual value, is kept
+    as-is in a per-row side table, so converting back with to_dicts() is
+    lossless and preserves key order.
+    """
+
+    def __init__(self, faqs: Optional[Iterable[Dict[str, Any]]] = None):
+        self.categories: List[str] = []
+        self._category_codes_by_name: Dict[str, int] = {}
+        self.category_codes = array('I')
+        self.questions = _TextColumn()
+        self.answers = _TextColumn()
+        self.keywords = _TextColumn()
+        self.keyword_offsets = array('I', [0])
+        self.layouts: List[Tuple[str, ...]] = []
+        self._layout_codes_by_keys: Dict[Tuple[str, ...], int] = {}
+        self.layout_codes = array('H')
+        self.extras: Dict[int, Dict[str, Any]] = {}
+        if faqs is not None:
+            self.extend(faqs)
+
+    @classmethod
+    def load(cls, file_path: str) -> 'FaqStore':
+        """
+        Stream a FAQ file (any layout iter_faqs accepts) into a new store,
+        without materializing the list of dicts.
+        """
+        store = cls(iter_faqs(file_path))
+        print(f"Successfully loaded {len(store)} FAQs from {file_path}")
+        return store
+
+    def _intern(self, codes_by_value: Dict, values: List, value) -> int:
+        code = codes_by_value.get(value)
+        if code is None:
+            code = codes_by_value[value] = len(values)
+            values.append(value)
+        return code
+
+    def append(self, faq: Dict[str, Any]) -> None:
+        """Add one FAQ dictionary to the end of the store."""
+        index = len(self)
+        extras = {}
+
+        category = faq.get('category')
+        if isinstance(category, str):
+            self.category_codes.append(self._intern(self._category_codes_by_name, self.categories, category))
+        else:
+            self.category_codes.append(_NO_CATEGORY)
+            if 'category' in faq:
+                extras['category'] = category
+
+        for key, column in (('question', self.questions), ('answer', self.answers)):
+            value = faq.get(key)
+            if isinstance(value, str):
+                column.append(value)
+            else:
+                column.append('')
+                if key in faq:
+                    extras[key] = value
+
+        keywords = faq.get('keywords')
+        if isinstance(keywords, list) and all(isinstance(k, str) for k in keywords):
+            for keyword in keywords:
+                self.keywords.append(keyword)
+        elif 'keywords' in faq:
+            extras['keywords'] = keywords
+        self.keyword_offsets.append(len(self.keywords))
+
+        for key, value in faq.items():
+            if key not in ('category', 'question', 'answer', 'keywords'):
+                extras[key] = value
+        if extras:
+            self.extras[index] = extras
+
+        self.layout_codes.append(self._intern(self._layout_codes_by_keys, self.layouts, tuple(faq)))
+
+    def extend(self, faqs: Iterable[Dict[str, Any]]) -> None:
+        for faq in faqs:
+            self.append(faq)
+
+    def __len__(self) -> int:
+        return len(self.layout_codes)
+
+    def __getitem__(self, index: int) -> FaqRow:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"FAQ index {index} out of range")
+        return FaqRow(self, index)
+
+    def __iter__(self) -> Iterator[FaqRow]:
+        for index in range(len(self)):
+            yield FaqRow(self, index)
+
+    def _layout(self, index: int) -> Tuple[str, ...]:
+        return self.layouts[self.layout_codes[index]]
+
+    def _value(self, index: int, key: str) -> Any:
+        if key not in self._layout(index):
+            raise KeyError(key)
+        extras = self.extras.get(index)
+        if extras and key in extras:
+            return extras[key]
+        if key == 'category':
+            return self.categories[self.category_codes[index]]
+        if key == 'question':
+            return self.questions[index]
+        if key == 'answer':
+            return self.answers[index]
+        return self.keywords_at(index)
+
+    def question(self, index: int) -> str:
+        """Question text of one entry ('' when it has none)."""
+        return self.questions[index]
+
+    def answer(self, index: int) -> str:
+        """Answer text of one entry ('' when it has none)."""
+        return self.answers[index]
+
+    def category(self, index: int) -> Optional[str]:
+        """Category of one entry, or None when it has no string category."""
+        code = self.category_codes[index]
+        return None if code == _NO_CATEGORY else self.categories[code]
+
+    def keywords_at(self, index: int) -> List[str]:
+        """Keyword list of one entry."""
+        return [self.keywords[k] for k in range(self.keyword_offsets[index], self.keyword_offsets[index + 1])]
+
+    def category_counts(self) -> Dict[str, int]:
+        """Number of entries per category, counted over the integer codes."""
+        counts = Counter(self.category_codes)
+        counts.pop(_NO_CATEGORY, None)
+        return {self.categories[code]: count for code, count in counts.items()}
+
+    def to_dicts(self) -> Iterator[Dict[str, Any]]:
+        """Yield every FAQ as a plain dict, e.g. for write_faqs."""
+        for row in self:
+            yield row.to_dict()
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the store's columns and tables."""
+        total = self.questions.nbytes() + self.answers.nbytes() + self.keywords.nbytes()
+        for column in (self.category_codes, self.keyword_offsets, self.layout_codes):
+            total += column.itemsize * len(column)
+        total += sum(sys.getsizeof(category) for category in self.categories)
+        total += sum(sys.getsizeof(layout) for layout in self.layouts)
+        total += sys.getsizeof(self.extras)
+        for extras in self.extras.values():
+            total += sys.getsizeof(extras) + sum(sys.getsizeof(value) for value in extras.values())
+        return total
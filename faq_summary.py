@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+One-pass aggregation of FAQ corpus statistics.
+
+FaqSummary collects per-category counts, keyword frequencies, the answer
+length distribution and field presence in a single scan. Summaries of
+separate shards or stream segments merge exactly, and serialize to JSON, so
+a summary over a sharded corpus costs one scan in total.
+
+Usage:
+    summary = FaqSummary.from_faqs(iter_faqs('data/faqs.json'))
+    summary.merge(FaqSummary.from_dict(shard_summary))
+"""
+
+import argparse
+import json
+from collections import Counter
+from typing import List, Dict, Any, Iterable, Tuple
+
+
+def _subtract(counter: Counter, items: Iterable[Any]) -> None:
+    """Decrement each item once, dropping counts that reach zero."""
+    for item in items:
+        counter[item] -= 1
+        if counter[item] <= 0:
+            del counter[item]
+
+
+class FaqSummary:
+    """Mergeable statistics over a stream of FAQ dictionaries."""
+
+    def __init__(self):
+        self.total = 0
+        self.categories: Counter = Counter()
+        # Keyword frequencies, case-folded the way searchFaq matches them
+        self.keywords: Counter = Counter()
+        # Exact answer length (characters) -> number of answers with that length
+        self.answer_lengths: Counter = Counter()
+        self.field_presence: Counter = Counter()
+
+    @classmethod
+    def from_faqs(cls, faqs: Iterable[Dict[str, Any]]) -> 'FaqSummary':
+        """Summarize a list, stream or faq_store.FaqStore of FAQs."""
+        return cls().update(faqs)
+
+    def add(self, faq: Dict[str, Any]) -> None:
+        """Count one FAQ."""
+        self.total += 1
+        self.field_presence.update(faq.keys())
+        category = faq.get('category')
+        if isinstance(category, str):
+            self.categories[category] += 1
+        keywords = faq.get('keywords')
+        if isinstance(keywords, list):
+            self.keywords.update(k.lower() for k in keywords if isinstance(k, str))
+        answer = faq.get('answer')
+        if isinstance(answer, str):
+            self.answer_lengths[len(answer)] += 1
+
+    def remove(self, faq: Dict[str, Any]) -> None:
+        """Uncount one FAQ that was added before, e.g. when it is edited or deleted."""
+        self.total -= 1
+        _subtract(self.field_presence, faq.keys())
+        category = faq.get('category')
+        if isinstance(category, str):
+            _subtract(self.categories, [category])
+        keywords = faq.get('keywords')
+        if isinstance(keywords, list):
+            _subtract(self.keywords, [k.lower() for k in keywords if isinstance(k, str)])
+        answer = faq.get('answer')
+        if isinstance(answer, str):
+            _subtract(self.answer_lengths, [len(answer)])
+
+    def update(self, faqs: Iterable[Dict[str, Any]]) -> 'FaqSummary':
+        """Count every FAQ in faqs and return self."""
+        if hasattr(faqs, 'category_codes'):
+            return self._update_from_store(faqs)
+        for faq in faqs:
+            self.add(faq)
+        return self
+
+    def _update_from_store(self, store) -> 'FaqSummary':
+        # Columnar fast path: categories are counted over integer codes and
+        # keywords over the flattened column, without building row views.
+        # Values the store keeps in its side table are never str-typed
+        # columns, so they are skipped exactly as add() skips them.
+        self.total += len(store)
+        for layout_code, count in Counter(store.layout_codes).items():
+            for field in store.layouts[layout_code]:
+                self.field_presence[field] += count
+        self.categories.update(store.category_counts())
+        self.keywords.update(store.keywords[k].lower() for k in range(len(store.keywords)))
+        for index, extras in store.extras.items():
+            if isinstance(extras.get('keywords'), list):
+                self.keywords.update(k.lower() for k in extras['keywords'] if isinstance(k, str))
+        for index in range(len(store)):
+            if 'answer' in store.layouts[store.layout_codes[index]] and 'answer' not in store.extras.get(index, ()):
+                self.answer_lengths[len(store.answers[index])] += 1
+        return self
+
+    def merge(self, other: 'FaqSummary') -> 'FaqSummary':
+        """Fold another summary (e.g. of another shard) into this one and return self."""
+        self.total += other.total
+        self.categories.update(other.categories)
+        self.keywords.update(other.keywords)
+        self.answer_lengths.update(other.answer_lengths)
+        self.field_presence.update(other.field_presence)
+        return self
+
+    def __add__(self, other: 'FaqSummary') -> 'FaqSummary':
+        return FaqSummary().merge(self).merge(other)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FaqSummary):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    @classmethod
+    def merge_all(cls, summaries: Iterable['FaqSummary']) -> 'FaqSummary':
+        """Combine per-shard summaries into one."""
+        merged = cls()
+        for summary in summaries:
+            merged.merge(summary)
+        return merged
+
+    def answer_length_stats(self) -> Dict[str, float]:
+        """Count, min, max, mean and median answer length in characters."""
+        count = sum(self.answer_lengths.values())
+        if not count:
+            return {'count': 0, 'min': 0, 'max': 0, 'mean': 0.0, 'median': 0}
+        lengths = sorted(self.answer_lengths)
+        return {
+            'count': count,
+            'min': lengths[0],
+            'max': lengths[-1],
+            'mean': sum(length * n for length, n in self.answer_lengths.items()) / count,
+            'median': self.answer_length_percentile(50),
+        }
+
+    def answer_length_percentile(self, percentile: float) -> int:
+        """Smallest answer length with at least percentile% of answers at or below it."""
+        count = sum(self.answer_lengths.values())
+        target = count * percentile / 100
+        seen = 0
+        for length in sorted(self.answer_lengths):
+            seen += self.answer_lengths[length]
+            if seen >= target:
+                return length
+        return 0
+
+    def answer_length_histogram(self, bucket_size: int = 100) -> List[Tuple[int, int]]:
+        """(bucket start, number of answers) pairs for non-empty buckets."""
+        buckets: Counter = Counter()
+        for length, n in self.answer_lengths.items():
+            buckets[length // bucket_size * bucket_size] += n
+        return sorted(buckets.items())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form, e.g. for storing per-shard summaries."""
+        return {
+            'total': self.total,
+            'categories': dict(self.categories),
+            'keywords': dict(self.keywords),
+            'answer_lengths': {str(length): n for length, n in self.answer_lengths.items()},
+            'field_presence': dict(self.field_presence),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'FaqSummary':
+        summary = cls()
+        summary.total = data['total']
+        summary.categories.update(data['categories'])
+        summary.keywords.update(data['keywords'])
+        summary.answer_lengths.update({int(length): n for length, n in data['answer_lengths'].items()})
+        summary.field_presence.update(data['field_presence'])
+        return summary
+
+    def print_report(self, top_keywords: int = 10) -> None:
+        """Print the summary report."""
+        print(f"Total FAQs: {self.total}")
+        print(f"Categories: {len(self.categories)}")
+        for category in sorted(self.categories):
+            print(f"  - {category}: {self.categories[category]} FAQs")
+
+        if self.field_presence:
+            print(f"\nField presence:")
+            for field, count in self.field_presence.most_common():
+                print(f"  {field}: {count}/{self.total}")
+
+        if self.keywords:
+            print(f"\nTop keywords ({len(self.keywords)} distinct):")
+            for keyword, count in self.keywords.most_common(top_keywords):
+                print(f"  {keyword}: {count}")
+
+        stats = self.answer_length_stats()
+        if stats['count']:
+            print(f"\nAnswer length: min {stats['min']}, median {stats['median']}, "
+                  f"mean {stats['mean']:.0f}, max {stats['max']} characters")
+
+
+def main():
+    # Imported here: load_faqs and sharded_corpus report through this module
+    from load_faqs import iter_faqs
+    from sharded_corpus import ShardedCorpus, is_sharded
+
+    parser = argparse.ArgumentParser(description='Summarize one or more FAQ files in a single pass')
+    parser.add_argument('inputs', nargs='+',
+                        help='FAQ files (JSON or JSONL) or sharded corpus directories; summaries are merged')
+    parser.add_argument('--json', action='store_true', help='Print the merged summary as JSON')
+    args = parser.parse_args()
+
+    summary = FaqSummary.merge_all(
+        ShardedCorpus(path).summary() if is_sharded(path) else FaqSummary.from_faqs(iter_faqs(path))
+        for path in args.inputs
+    )
+    if args.json:
+        print(json.dumps(summary.to_dict(), indent=2, ensure_ascii=False))
+    else:
+        summary.print_report()
+
+
+if __name__ == '__main__':
+    main()
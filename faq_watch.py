@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Watch mode: keep the parsed corpus and its duplicate and similarity state in
+memory, and refresh the derived reports whenever the FAQ file changes.
+
+Every record is identified by a hash of its content. On a change the new
+file is parsed and its records are matched to the resident ones by hash;
+only records that appeared or disappeared have their duplicate keys,
+question tokens, similarity pairs and summary counts updated. Finding the
+similar questions of a new record probes the full token postings through
+its rarest tokens, so the work tracks the size of the edit rather than the
+corpus. Parsing and hashing the new file remain a linear scan.
+
+The reports are published atomically to the output directory:
+    duplicates.json  exact duplicates (create_duplicate_key), by file position
+    similar.json     similar questions among the unique FAQs, by file position
+    summary.json     FaqSummary of the corpus
+
+Usage:
+    python load_faqs.py --watch --input data/faqs.json --output-dir data/derived
+"""
+
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+from typing import List, Dict, Any, Iterable, NamedTuple, Optional, Set, Tuple
+
+from faq_summary import FaqSummary
+from instrumentation import count
+from load_faqs import iter_faqs, write_json_atomic
+from similarity_index import jaccard_similarity, prefix_length
+from text_processing import create_duplicate_key, get_words
+
+DEFAULT_INTERVAL = 0.5
+
+
+def record_hash(faq: Dict[str, Any]) -> bytes:
+    """Content hash of one FAQ, independent of key order and formatting."""
+    return hashlib.sha1(json.dumps(faq, sort_keys=True, ensure_ascii=False).encode('utf-8')).digest()
+
+
+class UpdateStats(NamedTuple):
+    """What one refresh changed."""
+    added: int
+    removed: int
+    total: int
+    pairs_compared: int
+    seconds: float
+
+
+class CorpusState:
+    """
+    Resident corpus with incrementally maintained duplicate groups,
+    similarity pairs and summary.
+
+    Records get a stable id when they first appear; reports translate ids to
+    current file positions.
+    """
+
+    def __init__(self, threshold: float = 0.8, check_answer: bool = False):
+        if not 0 < threshold <= 1:
+            raise ValueError(f"Similarity threshold must be in (0, 1], got {threshold}")
+        self.threshold = threshold
+        self.check_answer = check_answer
+        # Record ids in file order
+        self.order: List[int] = []
+        self.records: Dict[int, Dict[str, Any]] = {}
+        self.hashes: Dict[int, bytes] = {}
+        self.by_hash: Dict[bytes, List[int]] = {}
+        # Duplicate key -> ids sharing it; keys held by more than one id
+        self.keys: Dict[int, str] = {}
+        self.key_members: Dict[str, Set[int]] = {}
+        self.duplicate_keys: Set[str] = set()
+        # Question tokens and full postings (every token, not a prefix)
+        self.tokens: Dict[int, frozenset] = {}
+        self.postings: Dict[str, Set[int]] = {}
+        self.empty_questions: Set[int] = set()
+        # id -> {other id: similarity} for pairs at or above the threshold
+        self.neighbors: Dict[int, Dict[int, float]] = {}
+        self.summary = FaqSummary()
+        self._next_id = 0
+
+    def update(self, faqs: Iterable[Dict[str, Any]]) -> UpdateStats:
+        """Make the state match a new version of the corpus."""
+        start = time.perf_counter()
+        order = []
+        added = []
+        taken: Dict[bytes, int] = {}
+        for faq in faqs:
+            digest = record_hash(faq)
+            ids = self.by_hash.get(digest, ())
+            reused = taken.get(digest, 0)
+            if reused < len(ids):
+                taken[digest] = reused + 1
+                order.append(ids[reused])
+            else:
+                order.append(None)
+                added.append((len(order) - 1, digest, faq))
+
+        removed = [record_id for digest, ids in self.by_hash.items() for record_id in ids[taken.get(digest, 0):]]
+        for record_id in removed:
+            self._remove(record_id)
+        compared = 0
+        for position, digest, faq in added:
+            record_id, checked = self._add(digest, faq)
+            order[position] = record_id
+            compared += checked
+        self.order = order
+        count('watch.pairs_compared', compared)
+        return UpdateStats(len(added), len(removed), len(order), compared, time.perf_counter() - start)
+
+    def _add(self, digest: bytes, faq: Dict[str, Any]) -> Tuple[int, int]:
+        record_id = self._next_id
+        self._next_id += 1
+        self.records[record_id] = faq
+        self.hashes[record_id] = digest
+        self.by_hash.setdefault(digest, []).append(record_id)
+        self.summary.add(faq)
+
+        key = create_duplicate_key(faq, self.check_answer)
+        self.keys[record_id] = key
+        members = self.key_members.setdefault(key, set())
+        members.add(record_id)
+        if len(members) > 1:
+            self.duplicate_keys.add(key)
+
+        tokens = get_words(faq.get('question', ''))
+        self.tokens[record_id] = tokens
+        if not tokens:
+            candidates = set(self.empty_questions)
+            self.empty_questions.add(record_id)
+        else:
+            # Any record reaching the threshold shares one of these tokens; the
+            # rarest ones keep the candidate set small
+            probe = sorted(tokens, key=lambda token: len(self.postings.get(token, ())))
+            candidates = set()
+            for token in probe[:prefix_length(len(tokens), self.threshold)]:
+                candidates.update(self.postings.get(token, ()))
+            for token in tokens:
+                self.postings.setdefault(token, set()).add(record_id)
+
+        for other in candidates:
+            similarity = jaccard_similarity(tokens, self.tokens[other])
+            if similarity >= self.threshold:
+                self.neighbors.setdefault(record_id, {})[other] = similarity
+                self.neighbors.setdefault(other, {})[record_id] = similarity
+        return record_id, len(candidates)
+
+    def _remove(self, record_id: int) -> None:
+        faq = self.records.pop(record_id)
+        digest = self.hashes.pop(record_id)
+        self.by_hash[digest].remove(record_id)
+        if not self.by_hash[digest]:
+            del self.by_hash[digest]
+        self.summary.remove(faq)
+
+        key = self.keys.pop(record_id)
+        members = self.key_members[key]
+        members.discard(record_id)
+        if len(members) < 2:
+            self.duplicate_keys.discard(key)
+        if not members:
+            del self.key_members[key]
+
+        tokens = self.tokens.pop(record_id)
+        self.empty_questions.discard(record_id)
+        for token in tokens:
+            posting = self.postings[token]
+            posting.discard(record_id)
+            if not posting:
+                del self.postings[token]
+        for other in self.neighbors.pop(record_id, {}):
+            self.neighbors[other].pop(record_id)
+            if not self.neighbors[other]:
+                del self.neighbors[other]
+
+    def duplicates(self) -> List[Dict[str, Any]]:
+        """Exact duplicates as detect_and_remove_duplicates reports them, with file positions."""
+        positions = {record_id: i for i, record_id in enumerate(self.order)}
+        comparison_type = "question and answer" if self.check_answer else "question only"
+        found = []
+        for key in self.duplicate_keys:
+            original, *later = sorted(self.key_members[key], key=positions.__getitem__)
+            for record_id in later:
+                found.append({
+                    'original_index': positions[original],
+                    'duplicate_index': positions[record_id],
+                    'original_faq': self.records[original],
+                    'duplicate_faq': self.records[record_id],
+                    'comparison_key': key,
+                    'comparison_type': comparison_type,
+                })
+        found.sort(key=lambda duplicate: duplicate['duplicate_index'])
+        return found
+
+    def similar_pairs(self) -> List[Dict[str, Any]]:
+        """
+        Similar questions among the first FAQ of every duplicate key, as
+        find_similar_questions reports them, but with file positions.
+        """
+        positions = {record_id: i for i, record_id in enumerate(self.order)}
+
+        def is_first(record_id: int) -> bool:
+            key = self.keys[record_id]
+            return key not in self.duplicate_keys or min(self.key_members[key], key=positions.__getitem__) == record_id
+
+        pairs = []
+        for record_id, others in self.neighbors.items():
+            if not is_first(record_id):
+                continue
+            for other, similarity in others.items():
+                if positions[record_id] < positions[other] and is_first(other):
+                    pairs.append((positions[record_id], positions[other], similarity, record_id, other))
+        pairs.sort()
+        return [{
+            'index1': i,
+            'index2': j,
+            'question1': self.records[first].get('question', ''),
+            'question2': self.records[second].get('question', ''),
+            'similarity': similarity,
+        } for i, j, similarity, first, second in pairs]
+
+
+class FaqWatcher:
+    """Polls a FAQ file and republishes the derived reports after every change."""
+
+    def __init__(self, file_path: str, output_dir: str, threshold: float = 0.8, check_answer: bool = False):
+        self.file_path = file_path
+        self.output_dir = output_dir
+        self.state = CorpusState(threshold, check_answer)
+        self.version: Optional[Tuple[int, int]] = None
+
+    def _file_version(self) -> Tuple[int, int]:
+        stat = os.stat(self.file_path)
+        return stat.st_size, stat.st_mtime_ns
+
+    def poll(self) -> Optional[UpdateStats]:
+        """
+        Refresh if the file changed since the last successful refresh.
+
+        Returns:
+            What changed, or None if the file is unchanged, missing or cannot
+            be parsed yet (e.g. an editor is still writing or replacing it;
+            the next poll retries)
+        """
+        try:
+            version = self._file_version()
+            if version == self.version:
+                return None
+            faqs = list(iter_faqs(self.file_path))
+        except (OSError, json.JSONDecodeError, ValueError) as e:
+            print(f"Skipping unreadable {self.file_path}: {e}")
+            return None
+        stats = self.state.update(faqs)
+        self.version = version
+        self.publish()
+        return stats
+
+    def publish(self) -> None:
+        """Atomically replace every report in the output directory."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        source = {'file': self.file_path, 'updated': datetime.now().isoformat(), 'total': len(self.state.order)}
+        duplicates = self.state.duplicates()
+        similar = self.state.similar_pairs()
+        write_json_atomic(os.path.join(self.output_dir, 'duplicates.json'),
+                          dict(source, total_duplicates=len(duplicates), duplicates=duplicates))
+        write_json_atomic(os.path.join(self.output_dir, 'similar.json'),
+                          dict(source, threshold=self.state.threshold, total_similar=len(similar), similar=similar))
+        write_json_atomic(os.path.join(self.output_dir, 'summary.json'),
+                          dict(source, summary=self.state.summary.to_dict()))
+
+    def run(self, interval: float = DEFAULT_INTERVAL) -> None:
+        """Poll until interrupted."""
+        print(f"Watching {self.file_path}; reports go to {self.output_dir} (Ctrl-C to stop)")
+        try:
+            while True:
+                stats = self.poll()
+                if stats:
+                    print(f"{datetime.now():%H:%M:%S} {stats.total} FAQs: +{stats.added} -{stats.removed} "
+                          f"in {stats.seconds * 1000:.1f} ms ({stats.pairs_compared} pairs compared), "
+                          f"{len(self.state.duplicate_keys)} duplicate keys")
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
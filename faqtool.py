@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Single-pass FAQ processing pipeline.
+Loads the FAQ file once, streams every entry through the requested stages
+as generators and writes the result once.
+
+Usage:
+    python faqtool.py run normalize dedup validate --input data/faqs.json
+
+Running "normalize dedup validate" gives the same output as running
+normalize_categories.py, then detect_duplicates.py, then
+validate_faqs.py on the result.
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import List, Dict, Any, Callable, Iterable, Iterator
+
+from instrumentation import add_instrumentation_arguments, detail, instrumented, span
+from load_faqs import iter_faqs, write_faqs
+from normalize_categories import iter_normalized_faqs
+from detect_duplicates import iter_unique_faqs, save_duplicate_log
+from jsonl_store import index_path
+from validate_faqs import Violation, iter_validated_faqs
+
+
+class PipelineContext:
+    """Results collected by the stages while the FAQs stream through."""
+
+    def __init__(self):
+        self.normalize_stats: Dict[str, Any] = {}
+        self.removed_duplicates: List[Dict[str, Any]] = []
+        self.violations: List[Violation] = []
+        self.output_count = 0
+
+
+STAGES: Dict[str, Callable[[Iterable[Dict[str, Any]], PipelineContext], Iterator[Dict[str, Any]]]] = {
+    'normalize': lambda faqs, context: iter_normalized_faqs(faqs, context.normalize_stats),
+    'dedup': lambda faqs, context: iter_unique_faqs(faqs, context.removed_duplicates),
+    'validate': lambda faqs, context: iter_validated_faqs(faqs, context.violations),
+}
+
+
+def build_pipeline(faqs: Iterable[Dict[str, Any]], stage_names: List[str],
+                   context: PipelineContext) -> Iterator[Dict[str, Any]]:
+    """Chain the named stages over a FAQ stream, in order."""
+    stream = iter(faqs)
+    for name in stage_names:
+        if name not in STAGES:
+            raise ValueError(f"Unknown stage '{name}' (choose from: {', '.join(STAGES)})")
+        stream = STAGES[name](stream, context)
+    return stream
+
+
+def run_pipeline(input_file: str, output_file: str, stage_names: List[str],
+                 dry_run: bool = False) -> PipelineContext:
+    """
+    Stream input_file through the stages and write the result to output_file.
+
+    The output is written to a partial file alongside output_file and only
+    moved into place when validation (if requested) passes and dry_run is off.
+    """
+    context = PipelineContext()
+    root, extension = os.path.splitext(output_file)
+    partial_file = f"{root}.partial{extension}"
+    # The stages run interleaved inside the single streaming write
+    with span('pipeline'):
+        context.output_count = write_faqs(partial_file, build_pipeline(iter_faqs(input_file), stage_names, context))
+
+    if dry_run or context.violations:
+        os.remove(partial_file)
+    else:
+        os.replace(partial_file, output_file)
+    # A JSONL partial file leaves an offset index that no longer matches anything
+    if os.path.exists(index_path(partial_file)):
+        os.remove(index_path(partial_file))
+    return context
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Run FAQ processing stages in a single pass')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    run = subparsers.add_parser('run', help='Stream the FAQ file through a sequence of stages')
+    run.add_argument('stages', nargs='+', choices=list(STAGES),
+                     help='Stages to apply, in order')
+    run.add_argument('--input', default='data/faqs.json',
+                     help='Input FAQ file (default: data/faqs.json)')
+    run.add_argument('--output',
+                     help='Output FAQ file (default: overwrite the input)')
+    run.add_argument('--log', default='duplicate_removal_log.json',
+                     help='Log file for removed duplicates')
+    run.add_argument('--dry-run', action='store_true',
+                     help='Run every stage but do not write the output file')
+    add_instrumentation_arguments(run)
+
+    args = parser.parse_args()
+    with instrumented(args, 'faqtool'):
+        return run_command(args)
+
+
+def run_command(args: argparse.Namespace) -> int:
+    output_file = args.output or args.input
+
+    try:
+        context = run_pipeline(args.input, output_file, args.stages, args.dry_run)
+    except FileNotFoundError:
+        print(f"Error: File {args.input} not found")
+        return 1
+    except (json.JSONDecodeError, ValueError) as e:
+        print(f"Error: Invalid JSON in {args.input}: {e}")
+        return 1
+
+    print(f"\nPipeline Summary ({' -> '.join(args.stages)}):")
+    if 'normalize' in args.stages:
+        print(f"  Categories changed: {context.normalize_stats.get('changes_made', 0)}")
+    if 'dedup' in args.stages:
+        print(f"  Duplicates removed: {len(context.removed_duplicates)}")
+        if context.removed_duplicates:
+            save_duplicate_log(context.removed_duplicates, args.log)
+    print(f"  FAQs output: {context.output_count}")
+
+    if context.violations:
+        print(f"\nValidation failed with {len(context.violations)} violations:")
+        for violation in context.violations:
+            detail(f"  - {violation}")
+        print(f"\nOutput not written.")
+        return 1
+
+    if args.dry_run:
+        print(f"\nDry run, output not written.")
+    else:
+        print(f"\nFile saved as: {output_file}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Persistent fingerprint store for incremental duplicate detection.
+Keeps the create_duplicate_key keys (question only, and question + answer)
+of every FAQ already processed in SQLite, so a rerun after appending FAQs
+only hashes, checks and inserts the new entries.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from typing import List, Dict, Any, Optional, Tuple
+
+from instrumentation import detail
+from text_processing import create_duplicate_key, normalizer_fingerprint
+
+# Bump to force a rebuild for changes the source fingerprint cannot see
+STORE_FORMAT_VERSION = 1
+
+KINDS = {
+    'question': False,
+    'question_answer': True,
+}
+
+
+def normalization_rules_version() -> str:
+    """
+    Fingerprint of the normalization rules. Any edit to the text_processing
+    normalizers or create_duplicate_key changes it and invalidates existing stores.
+    """
+    return f"{STORE_FORMAT_VERSION}:{normalizer_fingerprint()}"
+
+
+def _key_hash(key: str) -> bytes:
+    return hashlib.sha1(key.encode('utf-8')).digest()
+
+
+def _entries_length(file_path: str, size: int) -> int:
+    """
+    Bytes at the start of a FAQ file that hold all of its entries: everything
+    before the closing bracket of a top-level JSON array, or the whole file
+    for JSON Lines and other layouts. Appending entries leaves them as they are.
+    """
+    if file_path.endswith('.jsonl'):
+        return size
+    tail_start = max(0, size - 4096)
+    with open(file_path, 'rb') as file:
+        file.seek(tail_start)
+        tail = file.read().rstrip()
+    if tail.endswith(b']'):
+        return tail_start + len(tail[:-1].rstrip())
+    return size
+
+
+def _source_prefix(file_path: str, checked_length: int = 0) -> Tuple[Dict[str, Any], str]:
+    """
+    Size, mtime and the length and SHA-1 of the entry bytes of a FAQ file,
+    plus the SHA-1 of its first checked_length bytes from the same read.
+    """
+    stat = os.stat(file_path)
+    length = _entries_length(file_path, stat.st_size)
+    digest = hashlib.sha1()
+    digests = {}
+    position = 0
+    with open(file_path, 'rb') as file:
+        for boundary in sorted({length, checked_length}):
+            while position < boundary:
+                chunk = file.read(min(boundary - position, 1 << 20))
+                if not chunk:
+                    break
+                digest.update(chunk)
+                position += len(chunk)
+            digests[boundary] = digest.hexdigest()
+    source = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'length': length, 'sha1': digests[length]}
+    return source, digests[checked_length]
+
+
+def _same_version(source: Optional[Dict[str, Any]], stat: os.stat_result) -> bool:
+    return source is not None and (source['size'], source['mtime_ns']) == (stat.st_size, stat.st_mtime_ns)
+
+
+class FingerprintStore:
+    """
+    SQLite-backed set of duplicate keys for a FAQ corpus that grows by appending.
+
+    Entries are processed in corpus order and only once. The store remembers how
+    many entries it has seen and, when they were read from a file, the length
+    and SHA-1 of the bytes that held them; otherwise a rolling digest of their
+    content. If the corpus no longer starts with exactly those entries (any of
+    them was edited, inserted or removed rather than appended to) or the
+    normalization rules changed, the store resets and the next run rebuilds it.
+
+    Checking a file costs one stat when it is unchanged and one SHA-1 pass over
+    the old entry bytes after an append, instead of re-serializing every entry.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path)
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (
+                name TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS fingerprints (
+                kind TEXT NOT NULL,
+                key_hash BLOB NOT NULL,
+                faq_index INTEGER NOT NULL,
+                PRIMARY KEY (kind, key_hash)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS duplicates (
+                kind TEXT NOT NULL,
+                duplicate_index INTEGER NOT NULL,
+                original_index INTEGER NOT NULL,
+                PRIMARY KEY (kind, duplicate_index)
+            ) WITHOUT ROWID;
+        """)
+        # source_prefix of the file last checked by matches_prefix, reused by add
+        self._checked_source: Optional[Tuple[str, Dict[str, Any]]] = None
+        if self._get_meta('rules_version') != normalization_rules_version():
+            self.reset()
+
+    def __enter__(self) -> 'FingerprintStore':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def _get_meta(self, name: str) -> Optional[str]:
+        row = self.connection.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, name: str, value: str) -> None:
+        self.connection.execute("INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)", (name, value))
+
+    def reset(self) -> None:
+        """Drop every stored fingerprint and stamp the current rules version."""
+        with self.connection:
+            self.connection.execute("DELETE FROM fingerprints")
+            self.connection.execute("DELETE FROM duplicates")
+            self.connection.execute("DELETE FROM meta")
+            self._set_meta('rules_version', normalization_rules_version())
+            self._set_meta('processed_count', '0')
+            self._set_meta('prefix_digest', '')
+            self._set_meta('source_prefix', '')
+
+    @property
+    def processed_count(self) -> int:
+        return int(self._get_meta('processed_count') or 0)
+
+    @staticmethod
+    def _prefix_digest(digest: str, faqs: List[Dict[str, Any]]) -> str:
+        """Extend a rolling digest with the content of each entry, in order."""
+        for faq in faqs:
+            entry = json.dumps(faq, sort_keys=True, ensure_ascii=False).encode('utf-8')
+            digest = hashlib.sha1(digest.encode('ascii') + hashlib.sha1(entry).digest()).hexdigest()
+        return digest
+
+    def matches_prefix(self, faqs: List[Dict[str, Any]], source_file: Optional[str] = None) -> bool:
+        """
+        Whether faqs still starts with exactly the entries this store has
+        processed. source_file is the file faqs were loaded from, if any.
+        """
+        count = self.processed_count
+        if count == 0:
+            return True
+        if count > len(faqs):
+            return False
+        stored = self._get_meta('source_prefix')
+        if source_file is not None and stored:
+            source = json.loads(stored)
+            stat = os.stat(source_file)
+            if _same_version(source, stat):
+                return True
+            if stat.st_size < source['length']:
+                return False
+            current, checked = _source_prefix(source_file, source['length'])
+            self._checked_source = (source_file, current)
+            return checked == source['sha1']
+        digest = self._get_meta('prefix_digest')
+        return bool(digest) and self._prefix_digest('', faqs[:count]) == digest
+
+    def add(self, faqs: List[Dict[str, Any]], source_file: Optional[str] = None) -> List[Tuple[str, int, int]]:
+        """
+        Check and insert every entry after processed_count. source_file is the
+        file faqs were loaded from, if any; the next matches_prefix call then
+        checks its bytes instead of the entries.
+
+        Returns:
+            (kind, duplicate_index, original_index) for each new duplicate found
+        """
+        start = self.processed_count
+        new_duplicates = []
+        with self.connection:
+            for i in range(start, len(faqs)):
+                for kind, check_answer in KINDS.items():
+                    key_hash = _key_hash(create_duplicate_key(faqs[i], check_answer))
+                    row = self.connection.execute(
+                        "SELECT faq_index FROM fingerprints WHERE kind = ? AND key_hash = ?", (kind, key_hash)
+                    ).fetchone()
+                    if row:
+                        self.connection.execute(
+                            "INSERT INTO duplicates (kind, duplicate_index, original_index) VALUES (?, ?, ?)",
+                            (kind, i, row[0])
+                        )
+                        new_duplicates.append((kind, i, row[0]))
+                    else:
+                        self.connection.execute(
+                            "INSERT INTO fingerprints (kind, key_hash, faq_index) VALUES (?, ?, ?)",
+                            (kind, key_hash, i)
+                        )
+            if len(faqs) > start:
+                self._set_meta('processed_count', str(len(faqs)))
+            if source_file is not None:
+                stored = self._get_meta('source_prefix')
+                stat = os.stat(source_file)
+                if not _same_version(json.loads(stored) if stored else None, stat):
+                    checked = self._checked_source
+                    if checked and checked[0] == source_file and _same_version(checked[1], stat):
+                        source = checked[1]
+                    else:
+                        source = _source_prefix(source_file)[0]
+                    self._set_meta('source_prefix', json.dumps(source))
+                self._set_meta('prefix_digest', '')
+            elif len(faqs) > start or not self._get_meta('prefix_digest'):
+                # A digest left empty by a file-backed run has to cover the whole prefix
+                digest = self._get_meta('prefix_digest')
+                if digest:
+                    digest = self._prefix_digest(digest, faqs[start:])
+                else:
+                    digest = self._prefix_digest('', faqs)
+                self._set_meta('prefix_digest', digest)
+                self._set_meta('source_prefix', '')
+        return new_duplicates
+
+    def duplicates(self, kind: str) -> List[Tuple[int, int]]:
+        """All recorded (duplicate_index, original_index) pairs for a key kind, in corpus order."""
+        return self.connection.execute(
+            "SELECT duplicate_index, original_index FROM duplicates WHERE kind = ? ORDER BY duplicate_index",
+            (kind,)
+        ).fetchall()
+
+
+def detect_and_remove_duplicates_incremental(faqs: List[Dict[str, Any]], store: FingerprintStore,
+                                             check_answer: bool = False,
+                                             source_file: Optional[str] = None) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Same result as detect_duplicates_enhanced.detect_and_remove_duplicates, but
+    only entries added since the store was last updated are keyed and checked.
+
+    Args:
+        faqs: List of FAQ objects (the full corpus)
+        store: Fingerprint store for this corpus
+        check_answer: If True, also consider answer field for duplicate detection
+        source_file: File faqs were loaded from; lets the store confirm an
+            append from the file bytes instead of hashing every entry
+
+    Returns:
+        Tuple of (unique_faqs, removed_duplicates)
+    """
+    if not store.matches_prefix(faqs, source_file):
+        print("Fingerprint store does not match the FAQ file, rebuilding it")
+        store.reset()
+
+    comparison_type = "question and answer" if check_answer else "question only"
+    kind = 'question_answer' if check_answer else 'question'
+    start = store.processed_count
+    print(f"Checking for duplicates using: {comparison_type} ({len(faqs) - start} new FAQs)")
+
+    for dup_kind, i, original_index in store.add(faqs, source_file):
+        if dup_kind == kind:
+            detail(f"Found duplicate (index {i}):")
+            detail(f"  Question: '{faqs[i].get('question', '')}'")
+            detail(f"  Original at index {original_index}")
+
+    removed_duplicates = []
+    duplicate_indices = set()
+    for i, original_index in store.duplicates(kind):
+        duplicate_indices.add(i)
+        removed_duplicates.append({
+            'original_index': original_index,
+            'duplicate_index': i,
+            'original_faq': faqs[original_index],
+            'duplicate_faq': faqs[i],
+            'comparison_key': create_duplicate_key(faqs[i], check_answer),
+            'comparison_type': comparison_type
+        })
+    unique_faqs = [faq for i, faq in enumerate(faqs) if i not in duplicate_indices]
+    return unique_faqs, removed_duplicates
@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+"""
+Asynchronous batch ingestion service for the FAQ corpus.
+
+Clients POST batches of new FAQs (a JSON array) to /faqs over local HTTP,
+on a TCP port or a Unix socket. Every FAQ is validated, has its category
+normalized and is checked against the duplicate keys of the whole corpus,
+all in memory. Accepted FAQs are group-committed: a single writer task
+appends everything queued since its last commit to the JSONL corpus with
+one write and one fsync, and each request is answered once its FAQs are on
+disk. When more than max_pending FAQs are waiting for the writer, new
+batches wait too (backpressure) instead of growing the queue.
+
+Before submitting, a client can POST {"question": ..., "k": 5} to /similar
+to see the committed FAQs whose questions are closest to a candidate.
+
+Usage:
+    python ingest_service.py --corpus data/faqs.jsonl --port 8765
+    curl --data-binary @new_faqs.json http://127.0.0.1:8765/faqs
+    curl --data '{"question": "Can I rent a bike?"}' http://127.0.0.1:8765/similar
+    curl http://127.0.0.1:8765/stats
+"""
+
+import argparse
+import asyncio
+import json
+import os
+from http import HTTPStatus
+from typing import List, Dict, Any, NamedTuple, Optional, Set, Tuple
+
+from instrumentation import add_instrumentation_arguments, count, detail, instrumented
+from jsonl_store import JsonlFaqFile, is_jsonl
+from similarity_index import NearestQuestionIndex
+from text_processing import create_duplicate_key, normalize_category
+from validate_faqs import FAQ_SCHEMA, FaqValidator, Violation
+
+DEFAULT_PORT = 8765
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_MAX_PENDING = 10000
+# How long the writer lingers for more FAQs before committing a small batch
+DEFAULT_COMMIT_INTERVAL = 0.002
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+# Entries are screened one at a time; uniqueness is what the duplicate keys are for
+_ENTRY_SCHEMA = {field: rule._replace(unique=False) for field, rule in FAQ_SCHEMA.items()}
+
+
+class IngestResult(NamedTuple):
+    """Outcome of one submitted batch. Indices refer to positions in the batch."""
+    accepted: int
+    duplicates: List[int]
+    invalid: List[Violation]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'accepted': self.accepted,
+            'duplicates': self.duplicates,
+            'invalid': [{'index': v.index, 'field': v.field, 'rule': v.rule, 'message': v.message}
+                        for v in self.invalid],
+        }
+
+
+class FaqIngestService:
+    """
+    In-memory screening plus group commit for one JSONL corpus file.
+
+    The duplicate keys of the existing corpus are loaded once at start-up.
+    Only the writer task touches the file, so a single service must own it.
+    """
+
+    def __init__(self, corpus_file: str, check_answer: bool = False, batch_size: int = DEFAULT_BATCH_SIZE,
+                 max_pending: int = DEFAULT_MAX_PENDING, commit_interval: float = DEFAULT_COMMIT_INTERVAL):
+        if not is_jsonl(corpus_file):
+            raise ValueError(f"The ingestion service appends to a JSONL corpus, not {corpus_file} "
+                             f"(convert with: python jsonl_store.py to-jsonl {corpus_file} <file>.jsonl)")
+        self.corpus_file = corpus_file
+        self.check_answer = check_answer
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.commit_interval = commit_interval
+
+        self.store = (JsonlFaqFile(corpus_file) if os.path.exists(corpus_file)
+                      else JsonlFaqFile.create(corpus_file, []))
+        self.keys: Set[str] = {create_duplicate_key(faq, check_answer) for faq in self.store}
+        # Questions of the committed FAQs; ids are corpus positions
+        self.questions = NearestQuestionIndex.from_questions([faq.get('question', '') for faq in self.store])
+        self.validator = FaqValidator(_ENTRY_SCHEMA)
+        self.stats = {'received': 0, 'accepted': 0, 'duplicates': 0, 'invalid': 0,
+                      'categories_changed': 0, 'commits': 0, 'committed': 0}
+
+        # FAQs screened but not yet handed to the writer, and one future per batch
+        self._pending: List[Dict[str, Any]] = []
+        self._futures: List[asyncio.Future] = []
+        # FAQs accepted but not yet on disk (pending plus the batch being written)
+        self._queued = 0
+        self._writer: Optional[asyncio.Task] = None
+        self._closing = False
+
+    async def start(self) -> None:
+        """Start the writer task on the running event loop."""
+        self._wakeup = asyncio.Event()
+        self._full = asyncio.Event()
+        self._space = asyncio.Condition()
+        self._writer = asyncio.create_task(self._run_writer())
+
+    async def close(self) -> None:
+        """Commit everything still queued and stop the writer."""
+        if self._writer is None:
+            return
+        self._closing = True
+        self._wakeup.set()
+        await self._writer
+        self._writer = None
+
+    async def __aenter__(self) -> 'FaqIngestService':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def screen(self, faqs: List[Any]) -> IngestResult:
+        """
+        Validate, normalize and deduplicate a batch against the corpus keys.
+        Keys of accepted FAQs are claimed right away, so a later duplicate is
+        rejected even before the first copy is on disk.
+
+        Returns:
+            The result, with the accepted FAQs left in self._pending
+        """
+        duplicates: List[int] = []
+        invalid: List[Violation] = []
+        accepted = 0
+        check_entry = self.validator.check_entry
+        keys = self.keys
+        for i, faq in enumerate(faqs):
+            if not isinstance(faq, dict):
+                invalid.append(Violation(i, None, 'type', f"Entry {i} should be an object"))
+                continue
+            found = len(invalid)
+            check_entry(faq, i, invalid)
+            if len(invalid) > found:
+                continue
+
+            category = normalize_category(faq['category'])
+            if category != faq['category']:
+                self.stats['categories_changed'] += 1
+                faq = dict(faq, category=category)
+            key = create_duplicate_key(faq, self.check_answer)
+            if key in keys:
+                duplicates.append(i)
+                detail(f"Duplicate rejected: '{faq['question']}'")
+                continue
+            keys.add(key)
+            self._pending.append(faq)
+            accepted += 1
+
+        self.stats['received'] += len(faqs)
+        self.stats['accepted'] += accepted
+        self.stats['duplicates'] += len(duplicates)
+        self.stats['invalid'] += len({v.index for v in invalid})
+        return IngestResult(accepted, duplicates, invalid)
+
+    async def submit(self, faqs: List[Any]) -> IngestResult:
+        """Screen a batch and return once its accepted FAQs are committed to disk."""
+        if self._writer is None or self._closing:
+            raise RuntimeError("The ingestion service is not running")
+        # Wait while the queue is full; a batch larger than max_pending waits for an empty queue
+        async with self._space:
+            await self._space.wait_for(
+                lambda: not self._queued or self._queued + len(faqs) <= self.max_pending
+            )
+            result = self.screen(faqs)
+            if not result.accepted:
+                return result
+            self._queued += result.accepted
+            done = asyncio.get_running_loop().create_future()
+            self._futures.append(done)
+            self._wakeup.set()
+            if len(self._pending) >= self.batch_size:
+                self._full.set()
+        await done
+        return result
+
+    async def _run_writer(self) -> None:
+        while True:
+            if not self._pending:
+                if self._closing:
+                    return
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            if len(self._pending) < self.batch_size and not self._closing:
+                # Linger briefly so concurrent batches share one commit
+                self._full.clear()
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.commit_interval)
+                except asyncio.TimeoutError:
+                    pass
+            batch, futures = self._pending, self._futures
+            self._pending, self._futures = [], []
+
+            try:
+                await asyncio.to_thread(self.store.extend, batch, True)
+            except Exception as e:
+                # Nothing of this batch is reported as stored, so its keys are released
+                for faq in batch:
+                    self.keys.discard(create_duplicate_key(faq, self.check_answer))
+                self.stats['accepted'] -= len(batch)
+                for future in futures:
+                    future.set_exception(e)
+            else:
+                for faq in batch:
+                    self.questions.add(faq['question'])
+                self.stats['commits'] += 1
+                self.stats['committed'] += len(batch)
+                count('ingest.commits')
+                count('ingest.committed', len(batch))
+                for future in futures:
+                    future.set_result(None)
+            async with self._space:
+                self._queued -= len(batch)
+                self._space.notify_all()
+
+    def most_similar(self, question: str, k: int = 5) -> List[Dict[str, Any]]:
+        """The committed FAQs whose questions are closest to a candidate question."""
+        return [{'index': i, 'question': self.store[i]['question'], 'similarity': similarity}
+                for i, similarity in self.questions.most_similar(question, k)]
+
+    def status(self) -> Dict[str, Any]:
+        """Counters plus the current corpus and queue sizes."""
+        return dict(self.stats, corpus_size=len(self.store), queued=self._queued)
+
+    async def _route(self, method: str, path: str, body: bytes) -> Tuple[int, Any]:
+        if path == '/faqs':
+            if method != 'POST':
+                return HTTPStatus.METHOD_NOT_ALLOWED, {'error': 'Use POST to submit FAQs'}
+            try:
+                faqs = json.loads(body)
+            except ValueError as e:
+                return HTTPStatus.BAD_REQUEST, {'error': f"Invalid JSON: {e}"}
+            if not isinstance(faqs, list):
+                return HTTPStatus.BAD_REQUEST, {'error': 'Expected a JSON array of FAQs'}
+            try:
+                result = await self.submit(faqs)
+            except Exception as e:
+                # The writer failed every FAQ of the commit this batch was part of
+                return HTTPStatus.INTERNAL_SERVER_ERROR, {'error': f"Commit failed: {e}"}
+            return HTTPStatus.OK, result.to_dict()
+        if path == '/similar':
+            if method != 'POST':
+                return HTTPStatus.METHOD_NOT_ALLOWED, {'error': 'Use POST to look up similar FAQs'}
+            try:
+                query = json.loads(body)
+            except ValueError as e:
+                return HTTPStatus.BAD_REQUEST, {'error': f"Invalid JSON: {e}"}
+            if (not isinstance(query, dict) or not isinstance(query.get('question'), str)
+                    or not isinstance(query.get('k', 5), int)):
+                return HTTPStatus.BAD_REQUEST, {'error': 'Expected {"question": <string>, "k": <integer>}'}
+            return HTTPStatus.OK, {'similar': self.most_similar(query['question'], query.get('k', 5))}
+        if path == '/stats':
+            if method != 'GET':
+                return HTTPStatus.METHOD_NOT_ALLOWED, {'error': 'Use GET for stats'}
+            return HTTPStatus.OK, self.status()
+        return HTTPStatus.NOT_FOUND, {'error': f"No such endpoint: {path}"}
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve HTTP/1.1 requests on one connection until the client closes it."""
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except _HttpError as e:
+                    _write_response(writer, e.status, {'error': str(e)}, keep_alive=False)
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                method, path, body, keep_alive = request
+                status, payload = await self._route(method, path, body)
+                _write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+class _HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+async def _read_headers(reader: asyncio.StreamReader) -> Dict[str, str]:
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            return headers
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+
+def _content_length(headers: Dict[str, str]) -> int:
+    if 'transfer-encoding' in headers:
+        raise _HttpError(HTTPStatus.LENGTH_REQUIRED, 'Chunked bodies are not supported; send Content-Length')
+    try:
+        length = int(headers.get('content-length', 0))
+    except ValueError:
+        raise _HttpError(HTTPStatus.BAD_REQUEST, 'Invalid Content-Length')
+    if length > MAX_BODY_BYTES:
+        raise _HttpError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"Bodies are limited to {MAX_BODY_BYTES} bytes")
+    return length
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, bytes, bool]]:
+    """(method, path, body, keep_alive) of the next request, or None at end of stream."""
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, version = line.decode('latin-1').split()
+    except ValueError:
+        raise _HttpError(HTTPStatus.BAD_REQUEST, 'Malformed request line')
+    headers = await _read_headers(reader)
+    length = _content_length(headers)
+    body = await reader.readexactly(length) if length else b''
+    connection = headers.get('connection', '').lower()
+    keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+    return method, target.split('?', 1)[0], body, keep_alive
+
+
+def _write_response(writer: asyncio.StreamWriter, status: int, payload: Any, keep_alive: bool) -> None:
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    head = (f"HTTP/1.1 {int(status)} {HTTPStatus(status).phrase}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    writer.write(head.encode('latin-1') + body)
+
+
+async def serve(service: FaqIngestService, host: str = '127.0.0.1', port: int = DEFAULT_PORT,
+                unix_socket: Optional[str] = None) -> asyncio.AbstractServer:
+    """Start the service and listen on a TCP port, or on unix_socket when given."""
+    await service.start()
+    if unix_socket:
+        return await asyncio.start_unix_server(service.handle_connection, unix_socket)
+    return await asyncio.start_server(service.handle_connection, host, port)
+
+
+class IngestClient:
+    """Minimal keep-alive HTTP client for the service, used by scripts and tests."""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = DEFAULT_PORT, unix_socket: Optional[str] = None):
+        self.host = host
+        self.port = port
+        self.unix_socket = unix_socket
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def __aenter__(self) -> 'IngestClient':
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def connect(self) -> None:
+        if self.unix_socket:
+            self._reader, self._writer = await asyncio.open_unix_connection(self.unix_socket)
+        else:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            await self._writer.wait_closed()
+            self._writer = None
+
+    async def request(self, method: str, path: str, payload: Any = None) -> Tuple[int, Any]:
+        """Send one request on the open connection. Returns (status, decoded JSON body)."""
+        body = b'' if payload is None else json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self._writer.write(f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                           f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+                           .encode('latin-1') + body)
+        await self._writer.drain()
+        status_line = await self._reader.readline()
+        if not status_line:
+            raise ConnectionError("The ingestion service closed the connection")
+        status = int(status_line.split()[1])
+        headers = await _read_headers(self._reader)
+        data = await self._reader.readexactly(int(headers.get('content-length', 0)))
+        return status, json.loads(data) if data else None
+
+    async def submit(self, faqs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """POST a batch to /faqs. Raises ConnectionError on a non-200 answer."""
+        status, result = await self.request('POST', '/faqs', faqs)
+        if status != HTTPStatus.OK:
+            raise ConnectionError(f"Ingestion failed with HTTP {status}: {result.get('error')}")
+        return result
+
+
+async def _serve_forever(args: argparse.Namespace) -> None:
+    service = FaqIngestService(args.corpus, args.check_answer, args.batch_size,
+                               args.max_pending, args.commit_interval)
+    print(f"Loaded {len(service.keys)} duplicate keys from {args.corpus}")
+    server = await serve(service, args.host, args.port, args.socket)
+    where = args.socket or f"http://{args.host}:{args.port}"
+    print(f"Accepting FAQ batches at {where}/faqs (Ctrl-C to stop)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+        print(f"\nIngestion summary: {json.dumps(service.status())}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Accept FAQ batches over local HTTP and append them to a corpus')
+    parser.add_argument('--corpus', default='data/faqs.jsonl',
+                        help='JSONL corpus to deduplicate against and append to (default: data/faqs.jsonl)')
+    parser.add_argument('--host', default='127.0.0.1', help='Address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f"TCP port (default: {DEFAULT_PORT})")
+    parser.add_argument('--socket', help='Listen on this Unix socket instead of a TCP port')
+    parser.add_argument('--check-answer', action='store_true',
+                        help='Also consider the answer field for duplicate detection')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"Commit as soon as this many FAQs are queued (default: {DEFAULT_BATCH_SIZE})")
+    parser.add_argument('--max-pending', type=int, default=DEFAULT_MAX_PENDING,
+                        help=f"FAQs queued for disk before submitters wait (default: {DEFAULT_MAX_PENDING})")
+    parser.add_argument('--commit-interval', type=float, default=DEFAULT_COMMIT_INTERVAL,
+                        help=f"Seconds to gather FAQs into one commit (default: {DEFAULT_COMMIT_INTERVAL})")
+    add_instrumentation_arguments(parser)
+    args = parser.parse_args()
+
+    with instrumented(args, 'ingest_service'):
+        try:
+            asyncio.run(_serve_forever(args))
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Lightweight timing and counting instrumentation for the FAQ scripts.
+
+Stages are wrapped in named spans (nested spans are reported as
+"outer/inner") and events are tallied in counters. Both cost one
+perf_counter call or one dict update, so they stay on in normal runs. The
+scripts accept the shared flags added by add_instrumentation_arguments:
+
+    --quiet               suppress per-item output (which can dominate run time)
+    --timing-report FILE  write spans, counters and text cache stats as JSON
+    --profile [PREFIX]    run under cProfile and tracemalloc, writing PREFIX.prof
+"""
+
+import argparse
+import cProfile
+import json
+import pstats
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from typing import List, Dict, Any, Iterator, Optional
+
+from text_processing import cache_stats
+
+# Span name -> [calls, total seconds]
+_spans: Dict[str, List[float]] = {}
+_stack: List[str] = []
+_counters: Counter = Counter()
+_verbose = True
+_started = time.perf_counter()
+
+
+def reset() -> None:
+    """Forget all spans and counters recorded so far."""
+    global _started
+    _spans.clear()
+    _stack.clear()
+    _counters.clear()
+    _started = time.perf_counter()
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time the enclosed block under name, nested inside any open span."""
+    _stack.append(name)
+    full_name = '/'.join(_stack)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        _stack.pop()
+        record = _spans.setdefault(full_name, [0, 0.0])
+        record[0] += 1
+        record[1] += elapsed
+
+
+def count(name: str, amount: int = 1) -> None:
+    """Add amount to the named counter."""
+    _counters[name] += amount
+
+
+def set_verbose(verbose: bool) -> None:
+    """Turn per-item output from detail() on or off."""
+    global _verbose
+    _verbose = verbose
+
+
+def is_verbose() -> bool:
+    return _verbose
+
+
+def detail(*args: Any, **kwargs: Any) -> None:
+    """print() for per-item output, skipped entirely when verbose output is off."""
+    if _verbose:
+        print(*args, **kwargs)
+
+
+def timing_report() -> Dict[str, Any]:
+    """Machine-readable snapshot of spans, counters and text cache statistics."""
+    return {
+        'wall_seconds': time.perf_counter() - _started,
+        'spans': {name: {'calls': calls, 'seconds': seconds} for name, (calls, seconds) in _spans.items()},
+        'counters': dict(_counters),
+        'text_cache': cache_stats(),
+    }
+
+
+def format_timing_report() -> str:
+    """Human-readable span and counter summary."""
+    report = timing_report()
+    lines = [f"Timing ({report['wall_seconds']:.3f}s wall):"]
+    for name, stats in report['spans'].items():
+        calls = f" x{stats['calls']}" if stats['calls'] > 1 else ''
+        lines.append(f"  {name:<40} {stats['seconds']:9.4f}s{calls}")
+    for name, value in sorted(report['counters'].items()):
+        lines.append(f"  {name:<40} {value:>10}")
+    return '\n'.join(lines)
+
+
+def write_timing_report(file_path: str) -> None:
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(timing_report(), f, indent=2)
+        f.write('\n')
+
+
+@contextmanager
+def profiled(output_prefix: str, top: int = 15) -> Iterator[None]:
+    """
+    Run the enclosed block under cProfile and tracemalloc. Writes the profile
+    to <output_prefix>.prof and prints the top functions by cumulative time
+    and the top allocation sites.
+    """
+    profiler = cProfile.Profile()
+    tracemalloc.start()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        profile_file = f"{output_prefix}.prof"
+        profiler.dump_stats(profile_file)
+        print(f"\nProfile saved to: {profile_file} (inspect with: python -m pstats {profile_file})")
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(top)
+        print(f"Peak traced memory: {peak / 1e6:.1f} MB. Top allocation sites:")
+        for stat in snapshot.statistics('lineno')[:top]:
+            print(f"  {stat}")
+
+
+def add_instrumentation_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add --quiet, --timing-report and --profile to a script's argument parser."""
+    parser.add_argument('--quiet', action='store_true',
+                        help='Do not print every duplicate, pair or change found')
+    parser.add_argument('--timing-report', metavar='FILE',
+                        help='Write a JSON report of stage timings and counters')
+    parser.add_argument('--profile', nargs='?', const='profile', metavar='PREFIX',
+                        help='Profile the run with cProfile and tracemalloc (writes PREFIX.prof, default: profile.prof)')
+
+
+@contextmanager
+def instrumented(args: argparse.Namespace, name: str) -> Iterator[None]:
+    """
+    Apply the flags from add_instrumentation_arguments around a script run:
+    the whole run is one span called name, and the timing summary is printed
+    (and written, if requested) at the end.
+    """
+    reset()
+    set_verbose(not getattr(args, 'quiet', False))
+    profile_prefix: Optional[str] = getattr(args, 'profile', None)
+    try:
+        if profile_prefix:
+            with profiled(profile_prefix), span(name):
+                yield
+        else:
+            with span(name):
+                yield
+    finally:
+        print(f"\n{format_timing_report()}")
+        if getattr(args, 'timing_report', None):
+            write_timing_report(args.timing_report)
+            print(f"Timing report saved to: {args.timing_report}")
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+JSON Lines storage for the FAQ corpus.
+Each FAQ is one compact JSON object per line. A sidecar index file
+(<file>.idx) holds the byte offset of every record, so single entries can
+be read, appended or edited without loading or rewriting the whole corpus.
+
+Convert between formats with:
+    python jsonl_store.py to-jsonl data/faqs.json data/faqs.jsonl
+    python jsonl_store.py to-json data/faqs.jsonl data/faqs.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import struct
+from array import array
+from typing import List, Dict, Any, Iterable, Iterator
+
+from load_faqs import fsync_directory, iter_faqs, write_faqs
+
+INDEX_MAGIC = b'FAQIDX1\x00'
+# Magic, then the data file's mtime_ns and size when the index was written
+_INDEX_HEADER = struct.Struct('<8sQQ')
+
+
+def is_jsonl(file_path: str) -> bool:
+    """Whether a path uses the JSON Lines layout."""
+    return file_path.endswith('.jsonl')
+
+
+def index_path(file_path: str) -> str:
+    """Location of the byte-offset index for a JSONL file."""
+    return f"{file_path}.idx"
+
+
+def encode_record(faq: Dict[str, Any]) -> bytes:
+    """Serialize one FAQ as a single JSONL line."""
+    return json.dumps(faq, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+
+
+class JsonlFaqFile:
+    """
+    Random-access view of a JSONL FAQ file.
+
+    The offset index is rebuilt with one sequential scan whenever it is
+    missing or was written for a different version of the data file.
+    """
+
+    def __init__(self, file_path: str):
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"FAQ file not found at: {file_path}")
+        self.file_path = file_path
+        self.index_file = index_path(file_path)
+        self.offsets = self._load_index()
+
+    @classmethod
+    def create(cls, file_path: str, faqs: Iterable[Dict[str, Any]]) -> 'JsonlFaqFile':
+        """Write FAQs to a new JSONL file (replacing any existing one) and index it."""
+        temp_path = f"{file_path}.tmp"
+        with open(temp_path, 'wb') as file:
+            for faq in faqs:
+                file.write(encode_record(faq))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, file_path)
+        fsync_directory(os.path.dirname(os.path.abspath(file_path)))
+        if os.path.exists(index_path(file_path)):
+            os.remove(index_path(file_path))
+        return cls(file_path)
+
+    def _load_index(self) -> 'array':
+        stat = os.stat(self.file_path)
+        try:
+            with open(self.index_file, 'rb') as file:
+                magic, mtime_ns, size = _INDEX_HEADER.unpack(file.read(_INDEX_HEADER.size))
+                if magic == INDEX_MAGIC and mtime_ns == stat.st_mtime_ns and size == stat.st_size:
+                    offsets = array('Q')
+                    offsets.frombytes(file.read())
+                    return offsets
+        except (OSError, struct.error):
+            pass
+        return self.reindex()
+
+    def reindex(self) -> 'array':
+        """Scan the data file and rewrite the offset index."""
+        offsets = array('Q')
+        position = 0
+        with open(self.file_path, 'rb') as file:
+            for line in file:
+                if line.strip():
+                    offsets.append(position)
+                position += len(line)
+        self.offsets = offsets
+        self._write_index()
+        return offsets
+
+    def _write_index(self, first_changed: int = 0) -> None:
+        """Write the header and every offset from first_changed onward."""
+        stat = os.stat(self.file_path)
+        header = _INDEX_HEADER.pack(INDEX_MAGIC, stat.st_mtime_ns, stat.st_size)
+        mode = 'r+b' if first_changed and os.path.exists(self.index_file) else 'wb'
+        with open(self.index_file, mode) as file:
+            file.write(header)
+            if mode == 'wb':
+                first_changed = 0
+            file.seek(_INDEX_HEADER.size + first_changed * self.offsets.itemsize)
+            file.write(self.offsets[first_changed:].tobytes())
+            file.truncate()
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def _record_end(self, index: int) -> int:
+        if index + 1 < len(self.offsets):
+            return self.offsets[index + 1]
+        return os.path.getsize(self.file_path)
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        """Read entry N by seeking straight to its offset."""
+        if index < 0:
+            index += len(self.offsets)
+        if not 0 <= index < len(self.offsets):
+            raise IndexError(f"FAQ index {index} out of range")
+        with open(self.file_path, 'rb') as file:
+            file.seek(self.offsets[index])
+            return json.loads(file.readline())
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        with open(self.file_path, 'rb') as file:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+
+    def append(self, faq: Dict[str, Any]) -> int:
+        """Append one FAQ, touching only the end of the data and index files. Returns its index."""
+        return self.extend([faq])[0]
+
+    def extend(self, faqs: Iterable[Dict[str, Any]], sync: bool = False) -> List[int]:
+        """
+        Append several FAQs in one write. Returns their indices.
+
+        With sync=True the data file is fsynced before returning, so the new
+        records survive a crash (the index is rebuilt if it did not).
+
+        The offsets only change once every record is written; if the write
+        fails, the data file is truncated back to its previous end.
+        """
+        records = [encode_record(faq) for faq in faqs]
+        first_new = len(self.offsets)
+        new_offsets = array('Q')
+        with open(self.file_path, 'a+b') as file:
+            original_size = position = file.tell()
+            try:
+                data = b''
+                if position:
+                    file.seek(position - 1)
+                    if file.read(1) != b'\n':
+                        data = b'\n'
+                        position += 1
+                for record in records:
+                    new_offsets.append(position)
+                    position += len(record)
+                file.write(data + b''.join(records))
+                file.flush()
+                if sync:
+                    os.fsync(file.fileno())
+            except BaseException:
+                file.truncate(original_size)
+                raise
+        self.offsets.extend(new_offsets)
+        self._write_index(first_new)
+        return list(range(first_new, len(self.offsets)))
+
+    def update(self, index: int, faq: Dict[str, Any]) -> None:
+        """
+        Replace entry N in place.
+
+        A record that fits in the old line is padded with trailing spaces and
+        written over it, leaving the rest of the file untouched. A longer
+        record is written into a copy of the file that then replaces it, so
+        a crash leaves either the old or the new version on disk.
+        """
+        if not 0 <= index < len(self.offsets):
+            raise IndexError(f"FAQ index {index} out of range")
+        start = self.offsets[index]
+        end = self._record_end(index)
+        record = encode_record(faq)
+        old_length = end - start
+
+        if len(record) <= old_length:
+            with open(self.file_path, 'r+b') as file:
+                file.seek(start)
+                file.write(record[:-1] + b' ' * (old_length - len(record)) + b'\n')
+            self._write_index(len(self.offsets))
+            return
+
+        temp_path = f"{self.file_path}.tmp"
+        try:
+            with open(self.file_path, 'rb') as source, open(temp_path, 'wb') as file:
+                remaining = start
+                while remaining:
+                    chunk = source.read(min(remaining, 1 << 16))
+                    file.write(chunk)
+                    remaining -= len(chunk)
+                file.write(record)
+                source.seek(end)
+                shutil.copyfileobj(source, file)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, self.file_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        fsync_directory(os.path.dirname(os.path.abspath(self.file_path)))
+        shift = len(record) - old_length
+        for later in range(index + 1, len(self.offsets)):
+            self.offsets[later] += shift
+        self._write_index(index + 1)
+
+
+def json_to_jsonl(json_path: str, jsonl_path: str) -> int:
+    """Convert a JSON array FAQ file to JSONL plus offset index. Returns the entry count."""
+    return len(JsonlFaqFile.create(jsonl_path, iter_faqs(json_path)))
+
+
+def jsonl_to_json(jsonl_path: str, json_path: str) -> int:
+    """Convert a JSONL FAQ file to the pretty-printed JSON array layout. Returns the entry count."""
+    return write_faqs(json_path, iter(JsonlFaqFile(jsonl_path)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert FAQ files between JSON and JSON Lines')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    to_jsonl = subparsers.add_parser('to-jsonl', help='Convert a JSON array file to JSONL')
+    to_jsonl.add_argument('input', help='Input FAQ JSON file')
+    to_jsonl.add_argument('output', help='Output FAQ JSONL file')
+    to_json = subparsers.add_parser('to-json', help='Convert a JSONL file to a JSON array')
+    to_json.add_argument('input', help='Input FAQ JSONL file')
+    to_json.add_argument('output', help='Output FAQ JSON file')
+
+    args = parser.parse_args()
+
+    if args.command == 'to-jsonl':
+        count = json_to_jsonl(args.input, args.output)
+        print(f"Converted {count} FAQs to {args.output} (index: {index_path(args.output)})")
+    else:
+        count = jsonl_to_json(args.input, args.output)
+        print(f"Converted {count} FAQs to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
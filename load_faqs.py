@@ -5,15 +5,27 @@ Script to load and parse faqs.json into a list of dictionaries for processing.
 
 import json
 import os
-from typing import List, Dict, Any
+import re
+import stat
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Tuple
 
+# Bytes of text read per refill while streaming a FAQ file
+STREAM_CHUNK_SIZE = 64 * 1024
 
-def load_faqs(file_path: str) -> List[Dict[str, Any]]:
+_WHITESPACE = ' \t\n\r'
+_NUMBER_START = '-0123456789'
+# Text that could still be part of a number, up to the end of the buffer
+_NUMBER_TAIL = re.compile(r'[0-9.eE+\-]*\Z')
+
+
+def load_faqs(file_path: str, shards: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
     """
     Load the faqs.json file and parse it into a list of dictionaries.
     
     Args:
-        file_path (str): Path to the faqs.json file
+        file_path (str): Path to the faqs.json file, or a sharded corpus directory
+        shards (Iterable[str], optional): For a sharded corpus, the shards to
+            load (default: all); the other shard files are not read
         
     Returns:
         List[Dict[str, Any]]: List of FAQ dictionaries
@@ -25,6 +37,20 @@ def load_faqs(file_path: str) -> List[Dict[str, Any]]:
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"FAQ file not found at: {file_path}")
     
+    if os.path.isdir(file_path):
+        from sharded_corpus import ShardedCorpus
+        corpus = ShardedCorpus(file_path)
+        names = corpus.select(shards)
+        faqs = corpus.load(names)
+        print(f"Successfully loaded {len(faqs)} FAQs from {len(names)} of {len(corpus.shards)} shards in {file_path}")
+        return faqs
+    
+    if file_path.endswith('.jsonl'):
+        from jsonl_store import JsonlFaqFile
+        faqs = list(JsonlFaqFile(file_path))
+        print(f"Successfully loaded {len(faqs)} FAQs from {file_path}")
+        return faqs
+    
     try:
         with open(file_path, 'r', encoding='utf-8') as file:
             faqs = json.load(file)
@@ -39,26 +65,425 @@ def load_faqs(file_path: str) -> List[Dict[str, Any]]:
         raise json.JSONDecodeError(f"Invalid JSON in {file_path}: {e}")
 
 
+def load_faq_at(file_path: str, index: int) -> Dict[str, Any]:
+    """
+    Load a single FAQ by position.
+    
+    For JSONL files this seeks straight to the entry through the sidecar
+    byte-offset index, and a JSON array file with a current binary snapshot
+    (faq_snapshot.py) decodes just that entry from it; other JSON array
+    files are streamed up to the entry.
+    
+    Args:
+        file_path (str): Path to a .json or .jsonl FAQ file
+        index (int): Zero-based position of the FAQ
+        
+    Returns:
+        Dict[str, Any]: The FAQ at that position
+        
+    Raises:
+        IndexError: If the file has fewer entries
+    """
+    if file_path.endswith('.jsonl'):
+        from jsonl_store import JsonlFaqFile
+        return JsonlFaqFile(file_path)[index]
+    
+    from faq_snapshot import FaqSnapshot
+    snapshot = FaqSnapshot.open(file_path)
+    if snapshot:
+        with snapshot:
+            return snapshot[index]
+    
+    for position, faq in enumerate(iter_faqs(file_path)):
+        if position == index:
+            return faq
+    raise IndexError(f"FAQ index {index} out of range")
+
+
+class _JsonStreamReader:
+    """
+    Incremental tokenizer over a JSON text file.
+    Keeps only the unconsumed tail of the file in memory and decodes one
+    value at a time with json.JSONDecoder.raw_decode.
+    """
+
+    def __init__(self, file, chunk_size: int = STREAM_CHUNK_SIZE):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.pos = 0
+        # File offset (in characters) of buffer[0]
+        self.offset = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        """Append the next chunk, dropping consumed text. Returns False at end of file."""
+        if self.eof:
+            return False
+        # Read at least as much as is pending so a value larger than one chunk
+        # is retried a logarithmic rather than linear number of times
+        chunk = self.file.read(max(self.chunk_size, len(self.buffer) - self.pos))
+        if not chunk:
+            self.eof = True
+            return False
+        self.offset += self.pos
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def _error(self, message: str) -> json.JSONDecodeError:
+        """Decode error positioned within the current read window."""
+        return json.JSONDecodeError(message, self.buffer, self.pos)
+
+    def position(self) -> int:
+        """File offset (in characters) of the next unconsumed character."""
+        return self.offset + self.pos
+
+    def peek(self) -> str:
+        """Next non-whitespace character, or '' at end of file."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer) or not self._fill():
+                return self.buffer[self.pos:self.pos + 1]
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise self._error(f"Expecting '{char}'")
+        self.pos += 1
+
+    def decode_value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                if self._fill():
+                    continue
+                raise self._error(e.msg)
+            # A number may continue past the buffer edge ("12." then "5"), so
+            # refill until a delimiter follows it or the file ends
+            if (self.buffer[self.pos] in _NUMBER_START and _NUMBER_TAIL.match(self.buffer, end)
+                    and self._fill()):
+                continue
+            self.pos = end
+            return value
+
+    def seek_member(self, key: str) -> None:
+        """Skip object members until the value of `key` is next."""
+        self.expect('{')
+        while self.peek() != '}':
+            member = self.decode_value()
+            if not isinstance(member, str):
+                raise self._error("Expecting property name")
+            self.expect(':')
+            if member == key:
+                return
+            self.decode_value()
+            if self.peek() == ',':
+                self.pos += 1
+        raise ValueError(f"Expected FAQ data to contain a '{key}' list")
+
+    def iter_raw_members(self) -> Iterator[Tuple[str, str, int, int]]:
+        """
+        Yield (key_text, value_text, start, end) for each member of the object
+        that starts at the current position: the undecoded JSON of the key and
+        value, and the file offsets of the value.
+        """
+        self.expect('{')
+        while self.peek() != '}':
+            key_start = self.position()
+            if not isinstance(self.decode_value(), str):
+                raise self._error("Expecting property name")
+            key_text = self.buffer[key_start - self.offset:self.pos]
+            self.expect(':')
+            self.peek()
+            start = self.position()
+            self.decode_value()
+            end = self.position()
+            yield key_text, self.buffer[start - self.offset:end - self.offset], start, end
+            if self.peek() == ',':
+                self.pos += 1
+            elif self.peek() != '}':
+                raise self._error("Expecting ',' delimiter")
+        self.pos += 1
+
+    def iter_array(self, decode_element: Optional[Callable[[], Any]] = None) -> Iterator[Any]:
+        """Yield the elements of the array that starts at the current position."""
+        decode_element = decode_element or self.decode_value
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield decode_element()
+            separator = self.peek()
+            self.pos += 1
+            if separator == ']':
+                return
+            if separator != ',':
+                self.pos -= 1
+                raise self._error("Expecting ',' delimiter")
+
+
+def iter_faqs(file_path: str, chunk_size: int = STREAM_CHUNK_SIZE,
+              shards: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Stream FAQ dictionaries from a JSON file one at a time.
+    
+    Accepts either a top-level array of FAQs (data/faqs.json), an object
+    wrapping the array under a "faqs" key (data/faqs.json.backup), a
+    JSON Lines file (*.jsonl, one FAQ per line) or a sharded corpus
+    directory (sharded_corpus.py; only the selected shards are read). Memory use
+    is bounded by the largest single FAQ plus one read chunk, not the file size.
+    For the wrapped layout, content after the "faqs" array is not read.
+    
+    Args:
+        file_path (str): Path to the FAQ JSON file
+        chunk_size (int): Characters read per refill
+        shards (Iterable[str], optional): Shards to read from a sharded corpus
+        
+    Yields:
+        Dict[str, Any]: One FAQ dictionary at a time, in file order
+        
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        json.JSONDecodeError: If the JSON is invalid
+        ValueError: If the file holds neither layout
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"FAQ file not found at: {file_path}")
+    
+    if os.path.isdir(file_path):
+        from sharded_corpus import ShardedCorpus
+        yield from ShardedCorpus(file_path).iter_faqs(shards)
+        return
+    
+    if file_path.endswith('.jsonl'):
+        from jsonl_store import JsonlFaqFile
+        yield from JsonlFaqFile(file_path)
+        return
+    
+    with open(file_path, 'r', encoding='utf-8') as file:
+        reader = _JsonStreamReader(file, chunk_size)
+        top_level = _seek_faq_array(reader)
+        yield from reader.iter_array()
+        if top_level and reader.peek():
+            raise reader._error("Extra data")
+
+
+def _seek_faq_array(reader: _JsonStreamReader) -> bool:
+    """
+    Position reader at the FAQ array of either JSON layout.
+    Returns True for a top-level array, False for the {"faqs": [...]} wrapper.
+    """
+    layout = reader.peek()
+    if layout == '{':
+        reader.seek_member('faqs')
+        if reader.peek() != '[':
+            raise ValueError("Expected FAQ data to be a list")
+        return False
+    if layout == '[':
+        return True
+    raise ValueError("Expected FAQ data to be a list")
+
+
+def _decode_raw(text: str) -> Any:
+    # text was read as Latin-1, one character per byte; recover the UTF-8 JSON
+    return json.loads(text.encode('latin-1').decode('utf-8'))
+
+
+def iter_faqs_with_offsets(file_path: str,
+                           chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Tuple[Dict[str, Any], Dict[str, Tuple[int, int]]]]:
+    """
+    Stream FAQs from a JSON file together with the byte offsets of their values.
+    
+    Accepts the same JSON layouts as iter_faqs (not JSON Lines, whose records
+    are addressed through jsonl_store instead). The offsets let a caller
+    rewrite single values in place with patch_faq_values.
+    
+    Args:
+        file_path (str): Path to the FAQ JSON file
+        chunk_size (int): Bytes read per refill
+        
+    Yields:
+        Tuple of (faq, offsets), where offsets maps each key of faq to the
+        (start, end) byte offsets of its value's JSON text in the file
+        
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        json.JSONDecodeError: If the JSON is invalid
+        ValueError: If the file holds neither layout or an entry is not an object
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"FAQ file not found at: {file_path}")
+    if file_path.endswith('.jsonl'):
+        raise ValueError("Byte offsets are only available for JSON array files")
+    
+    # Latin-1 maps each byte to one character, so reader positions are byte offsets
+    with open(file_path, 'r', encoding='latin-1', newline='') as file:
+        reader = _JsonStreamReader(file, chunk_size)
+        
+        def decode_entry() -> Tuple[Dict[str, Any], Dict[str, Tuple[int, int]]]:
+            if reader.peek() != '{':
+                raise ValueError("Expected each FAQ to be an object")
+            faq, offsets = {}, {}
+            for key_text, value_text, start, end in reader.iter_raw_members():
+                key = _decode_raw(key_text)
+                faq[key] = _decode_raw(value_text)
+                offsets[key] = (start, end)
+            return faq, offsets
+        
+        top_level = _seek_faq_array(reader)
+        yield from reader.iter_array(decode_entry)
+        if top_level and reader.peek():
+            raise reader._error("Extra data")
+
+
+def patch_faq_values(file_path: str, patches: Iterable[Tuple[int, int, Any]]) -> bool:
+    """
+    Overwrite single JSON values in place, at byte offsets from iter_faqs_with_offsets.
+    
+    A new value shorter than the old one is padded with trailing spaces, so
+    the file never changes length and stays valid JSON after every write.
+    Nothing is written unless every new value fits in the space of the old one.
+    
+    Args:
+        file_path (str): FAQ JSON file the offsets were read from
+        patches: (start, end, new_value) for each value to replace
+        
+    Returns:
+        bool: True if the patches were written, False if one did not fit
+    """
+    encoded = []
+    for start, end, value in patches:
+        data = json.dumps(value, ensure_ascii=False).encode('utf-8')
+        if len(data) > end - start:
+            return False
+        encoded.append((start, data.ljust(end - start)))
+    
+    if encoded:
+        with open(file_path, 'r+b') as file:
+            for start, data in encoded:
+                file.seek(start)
+                file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+    return True
+
+
+def write_faqs(file_path: str, faqs: Iterable[Dict[str, Any]]) -> int:
+    """
+    Stream FAQs to a JSON array file, one entry at a time.
+    
+    The output is byte-identical to json.dump(list(faqs), indent=2,
+    ensure_ascii=False). Entries go to a temporary file in the same directory
+    that is fsynced and then atomically renamed over file_path, so readers
+    never see a partial file and file_path may also be the file the FAQs are
+    being streamed from. A *.jsonl destination is written as
+    JSON Lines with a fresh offset index instead.
+    
+    Args:
+        file_path (str): Destination JSON file
+        faqs (Iterable[Dict[str, Any]]): FAQs to write
+        
+    Returns:
+        int: Number of FAQs written
+    """
+    if file_path.endswith('.jsonl'):
+        from jsonl_store import JsonlFaqFile
+        return len(JsonlFaqFile.create(file_path, faqs))
+    
+    import tempfile
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, temp_path = tempfile.mkstemp(prefix='.faqs-', suffix='.tmp', dir=directory)
+    count = 0
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as file:
+            for faq in faqs:
+                entry = json.dumps(faq, indent=2, ensure_ascii=False).replace('\n', '\n  ')
+                file.write(('[\n  ' if count == 0 else ',\n  ') + entry)
+                count += 1
+            file.write('\n]' if count else '[]')
+            file.flush()
+            os.fsync(file.fileno())
+        os.chmod(temp_path, _replacement_mode(file_path))
+        os.replace(temp_path, file_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    fsync_directory(directory)
+    return count
+
+
+def write_json_atomic(file_path: str, data: Any) -> None:
+    """
+    Replace a JSON file (a report, manifest or other derived artifact) the
+    way write_faqs replaces FAQ files: through an fsynced temporary file and
+    an atomic rename, so readers see either the old or the new version.
+    """
+    import tempfile
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, temp_path = tempfile.mkstemp(prefix='.json-', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as file:
+            json.dump(data, file, indent=2, ensure_ascii=False)
+            file.write('\n')
+            file.flush()
+            os.fsync(file.fileno())
+        os.chmod(temp_path, _replacement_mode(file_path))
+        os.replace(temp_path, file_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    fsync_directory(directory)
+
+
+def _replacement_mode(file_path: str) -> int:
+    # mkstemp creates files readable only by their owner; keep the mode of
+    # the file being replaced, or the umask default for a new one
+    try:
+        return stat.S_IMODE(os.stat(file_path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def fsync_directory(directory: str) -> None:
+    """Make a rename within directory durable (a no-op where directories cannot be opened)."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
 def display_faq_summary(faqs: List[Dict[str, Any]]) -> None:
     """
     Display a summary of the loaded FAQs.
     
     Args:
-        faqs (List[Dict[str, Any]]): List of FAQ dictionaries
+        faqs (List[Dict[str, Any]]): List of FAQ dictionaries, a
+            faq_store.FaqStore (aggregated over its columns) or a
+            sharded_corpus.ShardedCorpus (aggregated from its manifest,
+            without opening shard bodies)
     """
     print(f"\n=== FAQ Summary ===")
-    print(f"Total FAQs: {len(faqs)}")
-    
-    # Get unique categories
-    categories = set()
-    for faq in faqs:
-        if 'category' in faq:
-            categories.add(faq['category'])
-    
-    print(f"Categories: {len(categories)}")
-    for category in sorted(categories):
-        count = sum(1 for faq in faqs if faq.get('category') == category)
-        print(f"  - {category}: {count} FAQs")
+    if hasattr(faqs, 'shards'):
+        for name, shard in faqs.shards.items():
+            print(f"  Shard {name}: {shard['count']} FAQs")
+        faqs.summary().print_report()
+        return
+    from faq_summary import FaqSummary
+    FaqSummary.from_faqs(faqs).print_report()
     
     # Show structure of first FAQ
     if faqs:
@@ -71,13 +496,13 @@ def display_faq_summary(faqs: List[Dict[str, Any]]) -> None:
                 print(f"  {key}: {type(value).__name__}")
 
 
-def main():
+DEFAULT_FAQS_PATH = "/Users/tyler/Projects/openai-realtime-agents/data/faqs.json"
+
+
+def main(faqs_file_path: str = DEFAULT_FAQS_PATH):
     """
     Main function to demonstrate loading and processing the FAQs.
     """
-    # Path to the faqs.json file
-    faqs_file_path = "/Users/tyler/Projects/openai-realtime-agents/data/faqs.json"
-    
     try:
         # Load the FAQs
         faqs_list = load_faqs(faqs_file_path)
@@ -103,7 +528,27 @@ def main():
 
 
 if __name__ == "__main__":
-    faqs_data = main()
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Load and summarize a FAQ file')
+    parser.add_argument('--input', default=DEFAULT_FAQS_PATH, help='FAQ file (JSON or JSONL)')
+    parser.add_argument('--watch', action='store_true',
+                        help='Keep the corpus in memory and republish derived reports whenever the file changes')
+    parser.add_argument('--output-dir', help='Directory for --watch reports (default: <input>_derived)')
+    parser.add_argument('--interval', type=float, default=0.5, help='Seconds between checks for --watch (default: 0.5)')
+    parser.add_argument('--threshold', type=float, default=0.8,
+                        help='Similarity threshold for --watch (default: 0.8)')
+    parser.add_argument('--check-answer', action='store_true',
+                        help='Also consider the answer field for duplicates in --watch')
+    args = parser.parse_args()
+
+    if args.watch:
+        from faq_watch import FaqWatcher
+        output_dir = args.output_dir or f"{os.path.splitext(args.input)[0]}_derived"
+        FaqWatcher(args.input, output_dir, args.threshold, args.check_answer).run(args.interval)
+        raise SystemExit(0)
+
+    faqs_data = main(args.input)
     
     # Example of how to use the loaded data for processing
     if faqs_data:
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+MinHash / locality-sensitive hashing for near-duplicate FAQ detection.
+Builds MinHash signatures over word shingles and uses banded LSH to find
+candidate pairs in roughly linear time. Signatures are kept in a compact
+uint32 NumPy matrix that can be cached next to the FAQ file.
+
+Run directly to measure recall against the exact Jaccard search:
+    python minhash.py --input data/faqs.json --threshold 0.5
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import time
+import zlib
+from collections import defaultdict
+from typing import List, Dict, Any, Optional, Sequence, Set, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional for the other scripts
+    np = None
+
+from text_processing import get_words
+
+# Mersenne prime 2^31 - 1: a * x + b stays below 2^62 for 31-bit inputs,
+# so the permutation hashes never overflow uint64.
+_MERSENNE_PRIME = (1 << 31) - 1
+_MAX_HASH = _MERSENNE_PRIME
+
+SIGNATURE_CACHE_VERSION = 1
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("MinHash support requires numpy (pip install numpy)")
+
+
+def get_shingles(text: str, shingle_size: int = 1) -> Set[str]:
+    """
+    Extract word shingles (runs of shingle_size consecutive words) from text.
+    With shingle_size=1 this is the same word set used by find_similar_questions.
+    """
+    if shingle_size <= 1:
+        return get_words(text)
+    words = re.findall(r'\b\w+\b', text.lower())
+    if len(words) < shingle_size:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[k:k + shingle_size]) for k in range(len(words) - shingle_size + 1)}
+
+
+def faq_text(faq: Dict[str, Any], include_answer: bool = False) -> str:
+    """Text that MinHash signatures are built from."""
+    if include_answer:
+        return f"{faq.get('question', '')} {faq.get('answer', '')}"
+    return faq.get('question', '')
+
+
+class MinHasher:
+    """Deterministic family of num_perm universal hash permutations."""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1, shingle_size: int = 1):
+        _require_numpy()
+        self.num_perm = num_perm
+        self.seed = seed
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        self.a = rng.randint(1, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self.b = rng.randint(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> 'np.ndarray':
+        """MinHash signature (uint32 vector of length num_perm) for one text."""
+        shingles = get_shingles(text, self.shingle_size)
+        if not shingles:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint32)
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode('utf-8')) & _MERSENNE_PRIME for s in shingles),
+            dtype=np.uint64, count=len(shingles)
+        )
+        permuted = (self.a[:, None] * hashes[None, :] + self.b[:, None]) % _MERSENNE_PRIME
+        return permuted.min(axis=1).astype(np.uint32)
+
+    def signatures(self, texts: Sequence[str]) -> 'np.ndarray':
+        """Signature matrix of shape (len(texts), num_perm), dtype uint32."""
+        matrix = np.empty((len(texts), self.num_perm), dtype=np.uint32)
+        for row, text in enumerate(texts):
+            matrix[row] = self.signature(text)
+        return matrix
+
+
+def signature_cache_path(faq_file: str) -> str:
+    """Location of the cached signature matrix for a FAQ file."""
+    return f"{faq_file}.minhash.npz"
+
+
+def _texts_digest(texts: Sequence[str], hasher: MinHasher) -> str:
+    digest = hashlib.sha1()
+    digest.update(f"{SIGNATURE_CACHE_VERSION}:{hasher.num_perm}:{hasher.seed}:{hasher.shingle_size}".encode('utf-8'))
+    for text in texts:
+        digest.update(b'\x00')
+        digest.update(text.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def load_or_compute_signatures(texts: Sequence[str], hasher: MinHasher,
+                               cache_file: Optional[str] = None) -> 'np.ndarray':
+    """
+    Return the signature matrix for texts, reusing cache_file when it was
+    built from the same texts with the same hash parameters.
+    """
+    digest = _texts_digest(texts, hasher)
+    if cache_file and os.path.exists(cache_file):
+        try:
+            with np.load(cache_file) as cached:
+                if str(cached['digest']) == digest:
+                    print(f"Loaded MinHash signatures from: {cache_file}")
+                    return cached['signatures']
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Ignoring unreadable signature cache {cache_file}: {e}")
+
+    signatures = hasher.signatures(texts)
+    if cache_file:
+        np.savez(cache_file, signatures=signatures, digest=np.array(digest))
+        print(f"MinHash signatures saved to: {cache_file}")
+    return signatures
+
+
+def lsh_candidate_pairs(signatures: 'np.ndarray', bands: int, rows: int) -> Set[Tuple[int, int]]:
+    """
+    Banded LSH: documents whose signatures agree on every row of at least one
+    band become candidate pairs.
+    """
+    if bands * rows > signatures.shape[1]:
+        raise ValueError(f"bands * rows ({bands * rows}) exceeds signature length ({signatures.shape[1]})")
+
+    candidates = set()
+    for band in range(bands):
+        buckets: Dict[bytes, List[int]] = defaultdict(list)
+        band_slice = np.ascontiguousarray(signatures[:, band * rows:(band + 1) * rows])
+        for doc_id in range(band_slice.shape[0]):
+            buckets[band_slice[doc_id].tobytes()].append(doc_id)
+        for members in buckets.values():
+            for pos, i in enumerate(members):
+                for j in members[pos + 1:]:
+                    candidates.add((i, j))
+    return candidates
+
+
+def find_similar_pairs_minhash(signatures: 'np.ndarray', similarity_threshold: float = 0.8,
+                               bands: int = 32, rows: int = 4) -> List[Tuple[int, int, float]]:
+    """
+    Find (index1, index2, estimated_similarity) pairs whose MinHash estimate of
+    Jaccard similarity meets the threshold, sorted by index1 then index2.
+    """
+    candidates = sorted(lsh_candidate_pairs(signatures, bands, rows))
+    if not candidates:
+        return []
+    left = np.fromiter((i for i, _ in candidates), dtype=np.int64, count=len(candidates))
+    right = np.fromiter((j for _, j in candidates), dtype=np.int64, count=len(candidates))
+    used = signatures[:, :bands * rows]
+    estimates = (used[left] == used[right]).mean(axis=1)
+    return [
+        (i, j, float(estimate))
+        for (i, j), estimate in zip(candidates, estimates)
+        if estimate >= similarity_threshold
+    ]
+
+
+def find_similar_questions_minhash(faqs: List[Dict[str, Any]], similarity_threshold: float = 0.8,
+                                   bands: int = 32, rows: int = 4, include_answer: bool = False,
+                                   shingle_size: int = 1, seed: int = 1,
+                                   cache_file: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    MinHash/LSH counterpart of find_similar_questions. Returns pairs in the
+    same format, with 'similarity' holding the MinHash estimate.
+    """
+    hasher = MinHasher(num_perm=bands * rows, seed=seed, shingle_size=shingle_size)
+    texts = [faq_text(faq, include_answer) for faq in faqs]
+    signatures = load_or_compute_signatures(texts, hasher, cache_file)
+
+    similar_pairs = []
+    for i, j, similarity in find_similar_pairs_minhash(signatures, similarity_threshold, bands, rows):
+        similar_pairs.append({
+            'index1': i,
+            'index2': j,
+            'question1': faqs[i].get('question', ''),
+            'question2': faqs[j].get('question', ''),
+            'similarity': similarity,
+            'faq1': faqs[i],
+            'faq2': faqs[j]
+        })
+    return similar_pairs
+
+
+def evaluate_recall(faqs: List[Dict[str, Any]], similarity_threshold: float,
+                    settings: Sequence[Tuple[int, int]], seed: int = 1) -> List[Dict[str, Any]]:
+    """
+    Compare MinHash/LSH results against the exact find_similar_questions pairs
+    for each (bands, rows) setting.
+
+    Returns:
+        One result dict per setting with recall, precision, pair counts and runtime
+    """
+    from detect_duplicates_enhanced import find_similar_questions
+
+    exact = {(p['index1'], p['index2']) for p in find_similar_questions(faqs, similarity_threshold)}
+    results = []
+    for bands, rows in settings:
+        start = time.perf_counter()
+        hasher = MinHasher(num_perm=bands * rows, seed=seed)
+        signatures = hasher.signatures([faq_text(faq) for faq in faqs])
+        found = {(i, j) for i, j, _ in find_similar_pairs_minhash(signatures, similarity_threshold, bands, rows)}
+        elapsed = time.perf_counter() - start
+        true_positives = len(exact & found)
+        results.append({
+            'bands': bands,
+            'rows': rows,
+            'exact_pairs': len(exact),
+            'minhash_pairs': len(found),
+            'recall': true_positives / len(exact) if exact else 1.0,
+            'precision': true_positives / len(found) if found else 1.0,
+            'seconds': elapsed
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure MinHash/LSH recall against exact Jaccard similarity')
+    parser.add_argument('--input', default='data/faqs.json',
+                       help='Input FAQ JSON file (default: data/faqs.json)')
+    parser.add_argument('--threshold', type=float, default=0.5,
+                       help='Jaccard similarity threshold (default: 0.5)')
+    parser.add_argument('--settings', default='16x2,32x4,20x5,16x8,64x2',
+                       help='Comma-separated BANDSxROWS settings to evaluate')
+    parser.add_argument('--seed', type=int, default=1,
+                       help='Random seed for the hash permutations')
+
+    args = parser.parse_args()
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        faqs = json.load(f)
+    print(f"Loaded {len(faqs)} FAQs from {args.input}")
+
+    settings = []
+    for setting in args.settings.split(','):
+        bands, rows = setting.lower().split('x')
+        settings.append((int(bands), int(rows)))
+
+    print(f"\nMinHash recall at Jaccard threshold {args.threshold}:")
+    print(f"  {'bands':>5} {'rows':>4} {'exact':>6} {'found':>6} {'recall':>7} {'precision':>9} {'seconds':>8}")
+    for result in evaluate_recall(faqs, args.threshold, settings, args.seed):
+        print(f"  {result['bands']:>5} {result['rows']:>4} {result['exact_pairs']:>6} "
+              f"{result['minhash_pairs']:>6} {result['recall']:>7.2f} {result['precision']:>9.2f} "
+              f"{result['seconds']:>8.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -2,67 +2,177 @@
 """
 Script to normalize category values in FAQs JSON file.
 Converts every "category" string to lowercase and trims whitespace.
+
+Usage:
+    python normalize_categories.py [--input data/faqs.json] [--output data/faqs.json] [--patch]
 """
 
-import json
+import argparse
+import os
+from collections import Counter
+from typing import Dict, Any, Iterable, Iterator, List, Tuple
+
+from faq_summary import FaqSummary
+from instrumentation import add_instrumentation_arguments, count, detail, instrumented, span
+from load_faqs import iter_faqs, iter_faqs_with_offsets, patch_faq_values, write_faqs
+from jsonl_store import JsonlFaqFile, is_jsonl
+from text_processing import normalize_category, format_cache_stats
 
-def normalize_categories(input_file, output_file):
+def iter_normalized_faqs(faqs: Iterable[Dict[str, Any]], stats: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
     """
-    Read FAQs JSON file, normalize category values, and write back.
+    Normalize the category of each FAQ as it streams through.
     
     Args:
-        input_file (str): Path to input JSON file
-        output_file (str): Path to output JSON file
-    """
-    
-    # Read the JSON file
-    with open(input_file, 'r', encoding='utf-8') as f:
-        faqs = json.load(f)
+        faqs: Iterable of FAQ objects, e.g. load_faqs.iter_faqs(path)
+        stats: Dict updated in place with 'total', 'changes_made',
+            'original_categories' (a Counter of the input categories) and
+            'summary' (a FaqSummary of the normalized output)
     
-    print(f"Processing {len(faqs)} FAQ entries...")
-    
-    # Track unique categories before and after normalization
-    original_categories = set()
-    normalized_categories = set()
-    changes_made = 0
+    Yields:
+        FAQ objects with normalized categories, in input order. Entries
+        without a string category pass through unchanged, for the
+        validator to report.
+    """
+    stats.setdefault('total', 0)
+    stats.setdefault('changes_made', 0)
+    original_categories: Counter = stats.setdefault('original_categories', Counter())
+    summary: FaqSummary = stats.setdefault('summary', FaqSummary())
     
-    # Normalize each category
     for faq in faqs:
-        original_category = faq['category']
-        original_categories.add(original_category)
+        original_category = faq.get('category') if isinstance(faq, dict) else None
+        if not isinstance(original_category, str):
+            if isinstance(faq, dict):
+                summary.add(faq)
+            stats['total'] += 1
+            yield faq
+            continue
+        original_categories[original_category] += 1
         
-        # Convert to lowercase and trim whitespace
-        normalized_category = original_category.strip().lower()
+        normalized_category = normalize_category(original_category)
         
         if original_category != normalized_category:
-            changes_made += 1
-            print(f"Changed: '{original_category}' -> '{normalized_category}'")
+            stats['changes_made'] += 1
+            count('normalize.changed')
+            detail(f"Changed: '{original_category}' -> '{normalized_category}'")
         
         faq['category'] = normalized_category
-        normalized_categories.add(normalized_category)
+        summary.add(faq)
+        stats['total'] += 1
+        yield faq
+
+def _with_normalized_category(faq: Any) -> Any:
+    """A copy of faq with its category normalized; entries without a string category are returned unchanged."""
+    category = faq.get('category') if isinstance(faq, dict) else None
+    if not isinstance(category, str):
+        return faq
+    return dict(faq, category=normalize_category(category))
+
+def _scan_category_patches(input_file: str, stats: Dict[str, Any]) -> List[Tuple[int, int, str]]:
+    """
+    Normalize categories without writing anything.
+    
+    Returns:
+        (start, end, normalized_category) byte spans of every changed category value
+    """
+    patches = []
+    for faq, offsets in iter_faqs_with_offsets(input_file):
+        changes_made = stats.get('changes_made', 0)
+        for normalized in iter_normalized_faqs([faq], stats):
+            if stats['changes_made'] > changes_made:
+                start, end = offsets['category']
+                patches.append((start, end, normalized['category']))
+    return patches
+
+def _file_version(file_path: str) -> Tuple[int, int]:
+    stat = os.stat(file_path)
+    return stat.st_size, stat.st_mtime_ns
+
+def normalize_categories(input_file, output_file, patch=False):
+    """
+    Read FAQs JSON file, normalize category values, and write back.
+    FAQs are streamed from input to output one entry at a time, so
+    input_file and output_file may be the same path.
+    
+    When both are the same file, nothing is written unless a category
+    changed. A JSONL file then has only the changed records rewritten; a JSON
+    file is rewritten through an fsynced temporary file and an atomic rename,
+    or, with patch=True, has just the changed category values overwritten in
+    place at their byte offsets (falling back to the rewrite if a value grew).
+    
+    Args:
+        input_file (str): Path to input JSON file
+        output_file (str): Path to output JSON file
+        patch (bool): Patch changed values in place instead of rewriting
     
-    # Write the normalized data back to file
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(faqs, f, indent=2, ensure_ascii=False)
+    Returns:
+        bool: Whether output_file was written
+    """
+    
+    print(f"Processing FAQ entries from {input_file}...")
+    
+    # Track unique categories before and after normalization
+    stats = {}
+    written = True
+    same_file = os.path.abspath(input_file) == os.path.abspath(output_file)
+    if is_jsonl(input_file) and same_file:
+        store = JsonlFaqFile(input_file)
+        changed = []
+        with span('normalize'):
+            for i, faq in enumerate(iter_normalized_faqs(iter(store), stats)):
+                if stats['changes_made'] > len(changed):
+                    changed.append((i, faq))
+        with span('serialize'):
+            for i, faq in changed:
+                store.update(i, faq)
+        written = bool(changed)
+    elif same_file:
+        version = _file_version(input_file)
+        with span('normalize'):
+            patches = _scan_category_patches(input_file, stats)
+        if not patches:
+            written = False
+        elif patch and _file_version(input_file) == version and patch_faq_values(input_file, patches):
+            print(f"\nPatched {len(patches)} category values in place")
+        else:
+            if patch:
+                print(f"\nCategories cannot be patched in place, rewriting {output_file}")
+            with span('serialize'):
+                write_faqs(output_file, map(_with_normalized_category, iter_faqs(input_file)))
+    else:
+        # Reading, normalizing and writing are interleaved in one stream
+        with span('normalize+serialize'):
+            write_faqs(output_file, iter_normalized_faqs(iter_faqs(input_file), stats))
     
     print(f"\nSummary:")
-    print(f"- Total FAQs processed: {len(faqs)}")
-    print(f"- Changes made: {changes_made}")
-    print(f"- Original unique categories: {len(original_categories)}")
-    print(f"- Normalized unique categories: {len(normalized_categories)}")
+    print(f"- Total FAQs processed: {stats['total']}")
+    print(f"- Changes made: {stats['changes_made']}")
+    print(f"- Original unique categories: {len(stats['original_categories'])}")
+    print(f"- Normalized unique categories: {len(stats['summary'].categories)}")
     
-    print(f"\nOriginal categories:")
-    for cat in sorted(original_categories):
-        print(f"  - '{cat}'")
+    detail(f"\nOriginal categories:")
+    for cat in sorted(stats['original_categories']):
+        detail(f"  - '{cat}': {stats['original_categories'][cat]}")
     
-    print(f"\nNormalized categories:")
-    for cat in sorted(normalized_categories):
-        print(f"  - '{cat}'")
+    print(f"\nNormalized corpus:")
+    stats['summary'].print_report()
     
-    print(f"\nFile saved as: {output_file}")
+    if written:
+        print(f"\nFile saved as: {output_file}")
+    else:
+        print(f"\nNo categories changed; {output_file} left untouched")
+    print(f"\nText cache:\n{format_cache_stats()}")
+    return written
 
 if __name__ == "__main__":
-    input_file = "data/faqs.json"
-    output_file = "data/faqs.json"  # Overwrite the original file
+    parser = argparse.ArgumentParser(description='Normalize FAQ category values')
+    parser.add_argument('--input', default='data/faqs.json',
+                       help='Input FAQ file (default: data/faqs.json)')
+    parser.add_argument('--output', default='data/faqs.json',
+                       help='Output FAQ file (default: overwrite the input)')
+    parser.add_argument('--patch', action='store_true',
+                       help='Overwrite changed category values in place instead of rewriting the file')
+    add_instrumentation_arguments(parser)
+    args = parser.parse_args()
     
-    normalize_categories(input_file, output_file)
+    with instrumented(args, 'normalize_categories'):
+        normalize_categories(args.input, args.output, patch=args.patch)
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Sharded FAQ corpus: one FAQ file per category or property plus a manifest.
+
+A sharded corpus is a directory holding manifest.json and a shards/
+directory. The manifest lists every shard in order with its file, entry
+count, and the size and mtime of the file when it was last summarized.
+Each shard's FaqSummary sits next to it in <shard file>.summary.json, so
+the manifest stays small. Loading reads only the requested shards, and
+corpus statistics are merged from the stored summaries without opening
+shard bodies (a shard edited behind the manifest's back is re-summarized
+first). The corpus order is the shards in manifest order, each in file
+order.
+
+Usage:
+    python sharded_corpus.py split data/faqs.json data/faqs_sharded --by category
+    python sharded_corpus.py summary data/faqs_sharded [--shards local-area,policies]
+    python sharded_corpus.py dedup data/faqs_sharded --workers 4 [--output DIR]
+    python sharded_corpus.py join data/faqs_sharded data/faqs.json
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+
+from faq_summary import FaqSummary
+from load_faqs import iter_faqs, write_faqs, write_json_atomic
+from text_processing import create_duplicate_key, normalize_category
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_FORMAT = 1
+SHARD_DIRECTORY = 'shards'
+
+# How the shard of a FAQ is chosen; any other shard_by value names a FAQ field
+SHARD_KEYS = {
+    'category': lambda faq: normalize_category(faq.get('category', '')),
+}
+DEFAULT_SHARD_VALUE = 'default'
+
+
+def is_sharded(path: str) -> bool:
+    """Whether path is a sharded corpus directory."""
+    return os.path.isfile(os.path.join(path, MANIFEST_NAME))
+
+
+def shard_value(faq: Dict[str, Any], shard_by: str) -> str:
+    """The category or property a FAQ is filed under."""
+    if shard_by in SHARD_KEYS:
+        value = SHARD_KEYS[shard_by](faq)
+    else:
+        value = faq.get(shard_by)
+    return str(value) if value not in (None, '') else DEFAULT_SHARD_VALUE
+
+
+def _slug(value: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', value.lower()).strip('-') or DEFAULT_SHARD_VALUE
+
+
+def _file_version(file_path: str) -> List[int]:
+    stat = os.stat(file_path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def summary_path(shard_file: str) -> str:
+    """Location of the stored FaqSummary of a shard file."""
+    return f"{shard_file}.summary.json"
+
+
+def _write_shard_file(path: str, faqs: Iterable[Dict[str, Any]]) -> Tuple[int, List[int]]:
+    """Write one shard and its summary. Returns (count, version) for the manifest."""
+    summary = FaqSummary()
+    count = write_faqs(path, _summarize_while_streaming(faqs, summary))
+    write_json_atomic(summary_path(path), summary.to_dict())
+    return count, _file_version(path)
+
+
+def _summarize_while_streaming(faqs: Iterable[Dict[str, Any]], summary: FaqSummary) -> Iterator[Dict[str, Any]]:
+    for faq in faqs:
+        summary.add(faq)
+        yield faq
+
+
+class ShardedCorpus:
+    """A sharded corpus directory, described by its manifest."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.manifest_file = os.path.join(directory, MANIFEST_NAME)
+        if not os.path.exists(self.manifest_file):
+            raise FileNotFoundError(f"No shard manifest at: {self.manifest_file}")
+        with open(self.manifest_file, 'r', encoding='utf-8') as file:
+            manifest = json.load(file)
+        if manifest.get('format') != MANIFEST_FORMAT:
+            raise ValueError(f"Unsupported shard manifest format in {self.manifest_file}: {manifest.get('format')}")
+        self.shard_by: str = manifest['shard_by']
+        # Shard name -> {'name', 'value', 'file', 'count', 'version'}, in corpus order
+        self.shards: Dict[str, Dict[str, Any]] = {shard['name']: shard for shard in manifest['shards']}
+
+    @classmethod
+    def create(cls, directory: str, faqs: Iterable[Dict[str, Any]], shard_by: str = 'category',
+               suffix: str = '.jsonl') -> 'ShardedCorpus':
+        """
+        Split FAQs into a new sharded corpus (replacing any existing manifest).
+        Shards are ordered by first appearance of their category or property.
+        """
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for faq in faqs:
+            groups.setdefault(shard_value(faq, shard_by), []).append(faq)
+
+        os.makedirs(os.path.join(directory, SHARD_DIRECTORY), exist_ok=True)
+        shards = []
+        names = set()
+        for value, group in groups.items():
+            name = base = _slug(value)
+            suffix_number = 2
+            while name in names:
+                name = f"{base}-{suffix_number}"
+                suffix_number += 1
+            names.add(name)
+            shard = {'name': name, 'value': value, 'file': f"{SHARD_DIRECTORY}/{name}{suffix}"}
+            shard['count'], shard['version'] = _write_shard_file(os.path.join(directory, shard['file']), group)
+            shards.append(shard)
+        _write_manifest(directory, shard_by, shards)
+        return cls(directory)
+
+    def shard_path(self, name: str) -> str:
+        return os.path.join(self.directory, self.shards[name]['file'])
+
+    def select(self, names: Optional[Iterable[str]] = None) -> List[str]:
+        """Requested shard names in corpus order (all shards when names is None)."""
+        if names is None:
+            return list(self.shards)
+        wanted = set(names)
+        unknown = wanted.difference(self.shards)
+        if unknown:
+            raise ValueError(f"Unknown shards: {', '.join(sorted(unknown))} "
+                             f"(choose from: {', '.join(self.shards)})")
+        return [name for name in self.shards if name in wanted]
+
+    def __len__(self) -> int:
+        return sum(shard['count'] for shard in self.shards.values())
+
+    def iter_faqs(self, shards: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Stream the FAQs of the selected shards; other shard files are never opened."""
+        for name in self.select(shards):
+            yield from iter_faqs(self.shard_path(name))
+
+    def load(self, shards: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        return list(self.iter_faqs(shards))
+
+    def stale_shards(self) -> List[str]:
+        """Shards whose file changed since the manifest last summarized it."""
+        return [name for name, shard in self.shards.items()
+                if _file_version(self.shard_path(name)) != shard['version']]
+
+    def refresh(self, shards: Optional[Iterable[str]] = None) -> List[str]:
+        """Re-summarize stale shards (of the selection) and save the manifest. Returns their names."""
+        selected = set(self.select(shards))
+        stale = [name for name in self.stale_shards() if name in selected]
+        for name in stale:
+            path = self.shard_path(name)
+            summary = FaqSummary.from_faqs(iter_faqs(path))
+            write_json_atomic(summary_path(path), summary.to_dict())
+            self.shards[name].update(count=summary.total, version=_file_version(path))
+        if stale:
+            self.save_manifest()
+        return stale
+
+    def summary(self, shards: Optional[Iterable[str]] = None) -> FaqSummary:
+        """Merged summary of the selected shards, from their stored summaries."""
+        names = self.select(shards)
+        self.refresh(names)
+        summaries = []
+        for name in names:
+            with open(summary_path(self.shard_path(name)), 'r', encoding='utf-8') as file:
+                summaries.append(FaqSummary.from_dict(json.load(file)))
+        return FaqSummary.merge_all(summaries)
+
+    def write_shard(self, name: str, faqs: Iterable[Dict[str, Any]], value: Optional[str] = None) -> int:
+        """Replace (or add, at the end) one shard and update the manifest. Returns the entry count."""
+        shard = self.shards.get(name) or {'name': name, 'value': value or name,
+                                          'file': f"{SHARD_DIRECTORY}/{name}.jsonl"}
+        shard['count'], shard['version'] = _write_shard_file(os.path.join(self.directory, shard['file']), faqs)
+        self.shards[name] = shard
+        self.save_manifest()
+        return shard['count']
+
+    def save_manifest(self) -> None:
+        _write_manifest(self.directory, self.shard_by, list(self.shards.values()))
+
+
+def _write_manifest(directory: str, shard_by: str, shards: List[Dict[str, Any]]) -> None:
+    write_json_atomic(os.path.join(directory, MANIFEST_NAME),
+                {'format': MANIFEST_FORMAT, 'shard_by': shard_by, 'shards': shards})
+
+
+def _shard_keys(file_path: str, check_answer: bool) -> Tuple[List[Tuple[int, str]], List[Tuple[int, int, str]]]:
+    """
+    Deduplicate one shard.
+
+    Returns:
+        ([(index, key)] of first occurrences in file order,
+         [(duplicate_index, original_index, key)] within the shard)
+    """
+    seen: Dict[str, int] = {}
+    firsts = []
+    duplicates = []
+    for i, faq in enumerate(iter_faqs(file_path)):
+        key = create_duplicate_key(faq, check_answer)
+        original = seen.setdefault(key, i)
+        if original == i:
+            firsts.append((i, key))
+        else:
+            duplicates.append((i, original, key))
+    return firsts, duplicates
+
+
+def find_shard_duplicates(corpus: ShardedCorpus, check_answer: bool = False, workers: int = 1,
+                          shards: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Exact duplicates across the selected shards, as detect_and_remove_duplicates
+    would find them in the concatenated corpus.
+
+    Every shard is keyed and deduplicated on its own, in a process pool when
+    workers > 1. Only the first-occurrence keys come back, and one merge
+    pass in corpus order then finds the keys that an earlier shard already
+    holds.
+
+    Returns:
+        One dict per duplicate with 'duplicate_shard', 'duplicate_index',
+        'original_shard', 'original_index' (indices within each shard),
+        'comparison_key' and 'comparison_type', ordered by shard then index
+    """
+    names = corpus.select(shards)
+    paths = [corpus.shard_path(name) for name in names]
+    if workers > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_shard_keys, paths, [check_answer] * len(paths)))
+    else:
+        results = [_shard_keys(path, check_answer) for path in paths]
+
+    comparison_type = "question and answer" if check_answer else "question only"
+    owners: Dict[str, Tuple[str, int]] = {}
+    duplicates = []
+    for name, (firsts, local_duplicates) in zip(names, results):
+        found = []
+        for i, key in firsts:
+            owner = owners.setdefault(key, (name, i))
+            if owner[0] != name:
+                found.append((i, owner[0], owner[1], key))
+        for i, original, key in local_duplicates:
+            # When an earlier shard owns the key, the local first copy is a duplicate too
+            owner = owners[key]
+            found.append((i, owner[0], owner[1], key) if owner[0] != name else (i, name, original, key))
+        for i, original_shard, original_index, key in sorted(found):
+            duplicates.append({
+                'duplicate_shard': name,
+                'duplicate_index': i,
+                'original_shard': original_shard,
+                'original_index': original_index,
+                'comparison_key': key,
+                'comparison_type': comparison_type,
+            })
+    return duplicates
+
+
+def _filter_shard(source: str, destination: str, dropped: List[int]) -> Tuple[int, List[int]]:
+    """Write source minus the dropped indices to destination. Returns (count, version)."""
+    dropped_set = set(dropped)
+    return _write_shard_file(destination, (faq for i, faq in enumerate(iter_faqs(source)) if i not in dropped_set))
+
+
+def remove_shard_duplicates(corpus: ShardedCorpus, duplicates: List[Dict[str, Any]],
+                            output_directory: Optional[str] = None, workers: int = 1) -> ShardedCorpus:
+    """
+    Write the corpus without the given duplicates, to output_directory or in
+    place. Only shards that lose entries are rewritten (in parallel when
+    workers > 1); the others are copied, or left alone in place.
+    """
+    output_directory = output_directory or corpus.directory
+    in_place = os.path.abspath(output_directory) == os.path.abspath(corpus.directory)
+    dropped: Dict[str, List[int]] = {}
+    for duplicate in duplicates:
+        dropped.setdefault(duplicate['duplicate_shard'], []).append(duplicate['duplicate_index'])
+
+    os.makedirs(os.path.join(output_directory, SHARD_DIRECTORY), exist_ok=True)
+    shards = [dict(shard) for shard in corpus.shards.values()]
+    for shard in shards:
+        if shard['name'] not in dropped and not in_place:
+            destination = os.path.join(output_directory, shard['file'])
+            shutil.copyfile(corpus.shard_path(shard['name']), destination)
+            shutil.copyfile(summary_path(corpus.shard_path(shard['name'])), summary_path(destination))
+            shard['version'] = _file_version(destination)
+
+    rewrites = [shard for shard in shards if shard['name'] in dropped]
+    arguments = ([corpus.shard_path(shard['name']) for shard in rewrites],
+                 [os.path.join(output_directory, shard['file']) for shard in rewrites],
+                 [dropped[shard['name']] for shard in rewrites])
+    if workers > 1 and len(rewrites) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_filter_shard, *arguments))
+    else:
+        results = list(map(_filter_shard, *arguments))
+    for shard, (written, version) in zip(rewrites, results):
+        shard.update(count=written, version=version)
+
+    _write_manifest(output_directory, corpus.shard_by, shards)
+    return ShardedCorpus(output_directory)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Create and work with sharded FAQ corpora')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    split = subparsers.add_parser('split', help='Split a FAQ file into a sharded corpus')
+    split.add_argument('input', help='FAQ file (JSON or JSONL)')
+    split.add_argument('directory', help='Directory for the sharded corpus')
+    split.add_argument('--by', default='category',
+                       help='Shard by normalized category (default) or by the value of another field, e.g. property')
+    split.add_argument('--format', choices=['jsonl', 'json'], default='jsonl', help='Shard file format (default: jsonl)')
+    summary = subparsers.add_parser('summary', help='Summarize a sharded corpus from its manifest')
+    summary.add_argument('directory')
+    summary.add_argument('--shards', help='Comma-separated shard names (default: all)')
+    dedup = subparsers.add_parser('dedup', help='Remove exact duplicates, shard by shard in parallel')
+    dedup.add_argument('directory')
+    dedup.add_argument('--check-answer', action='store_true', help='Also consider the answer field')
+    dedup.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                       help='Worker processes (default: one per CPU)')
+    dedup.add_argument('--output', help='Write the deduplicated corpus here (default: in place)')
+    dedup.add_argument('--dry-run', action='store_true', help='Report duplicates without writing anything')
+    join = subparsers.add_parser('join', help='Concatenate the shards back into one FAQ file')
+    join.add_argument('directory')
+    join.add_argument('output', help='FAQ file to write (JSON or JSONL)')
+    join.add_argument('--shards', help='Comma-separated shard names (default: all)')
+    args = parser.parse_args()
+
+    if args.command == 'split':
+        corpus = ShardedCorpus.create(args.directory, iter_faqs(args.input), args.by, f".{args.format}")
+        print(f"Split {len(corpus)} FAQs from {args.input} into {len(corpus.shards)} shards in {args.directory}")
+        return
+
+    corpus = ShardedCorpus(args.directory)
+    shards = args.shards.split(',') if getattr(args, 'shards', None) else None
+    if args.command == 'summary':
+        for name in corpus.select(shards):
+            print(f"  {name:<30} {corpus.shards[name]['count']:>8}")
+        corpus.summary(shards).print_report()
+    elif args.command == 'dedup':
+        duplicates = find_shard_duplicates(corpus, args.check_answer, args.workers)
+        cross_shard = sum(1 for d in duplicates if d['original_shard'] != d['duplicate_shard'])
+        print(f"Found {len(duplicates)} duplicates in {len(corpus)} FAQs ({cross_shard} across shards)")
+        if duplicates and not args.dry_run:
+            output = remove_shard_duplicates(corpus, duplicates, args.output, args.workers)
+            print(f"Deduplicated corpus of {len(output)} FAQs saved to: {output.directory}")
+    else:
+        count = write_faqs(args.output, corpus.iter_faqs(shards))
+        print(f"Wrote {count} FAQs to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+"""
+Inverted-index similarity engine for FAQ questions.
+Finds all question pairs whose word-level Jaccard similarity meets a threshold
+without comparing every question against every other one, and answers
+top-k nearest-question queries from a persistent token index.
+
+Usage:
+    python similarity_index.py build --input data/faqs.json
+    python similarity_index.py query "can I rent a bicycle" --top 5
+"""
+
+import argparse
+import heapq
+import json
+import math
+import os
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import compress
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from instrumentation import count
+from text_processing import get_words
+
+QUESTION_INDEX_VERSION = 1
+
+# Slack used when turning the Jaccard threshold into prefix/size bounds so that
+# floating point rounding can only ever admit extra candidates, never drop one.
+_EPSILON = 1e-9
+
+
+def jaccard_similarity(set1: set, set2: set) -> float:
+    """Calculate Jaccard similarity between two sets."""
+    if not set1 and not set2:
+        return 1.0
+    if not set1 or not set2:
+        return 0.0
+    intersection = len(set1.intersection(set2))
+    union = len(set1.union(set2))
+    return intersection / union
+
+
+def prefix_length(size: int, threshold: float) -> int:
+    """
+    Number of leading tokens (in global order) that must be indexed for a set
+    of the given size so that any pair reaching the threshold shares one.
+    """
+    required = math.ceil(threshold * size - _EPSILON)
+    return max(size - required + 1, 0)
+
+
+class SimilarityIndex:
+    """
+    Token -> posting-list index over tokenized questions.
+
+    Each question is tokenized exactly once. Tokens are ranked globally from
+    rarest to most common and only the prefix of each sorted token list is
+    indexed, so candidate pairs are generated from rare shared tokens and the
+    common ones ("can", "i", "the") never produce long candidate scans.
+    """
+
+    def __init__(self, token_sets: Sequence[Set[str]], threshold: float):
+        self.token_sets = list(token_sets)
+        self.threshold = threshold
+        self.sizes = [len(tokens) for tokens in self.token_sets]
+        # Candidate pairs verified with a full Jaccard computation so far
+        self.compared = 0
+
+        document_frequency: Dict[str, int] = defaultdict(int)
+        for tokens in self.token_sets:
+            for token in tokens:
+                document_frequency[token] += 1
+        self.token_rank = {
+            token: rank
+            for rank, token in enumerate(sorted(document_frequency, key=lambda t: (document_frequency[t], t)))
+        }
+
+        # Postings are appended in document order, so every list stays sorted
+        self.prefixes: List[List[int]] = []
+        self.postings: Dict[int, List[int]] = defaultdict(list)
+        self.empty_documents: List[int] = []
+        for doc_id, tokens in enumerate(self.token_sets):
+            ranks = sorted(self.token_rank[token] for token in tokens)
+            prefix = ranks[:prefix_length(len(ranks), threshold)]
+            self.prefixes.append(prefix)
+            if not tokens:
+                self.empty_documents.append(doc_id)
+            for rank in prefix:
+                self.postings[rank].append(doc_id)
+
+    @classmethod
+    def from_questions(cls, questions: Sequence[str], threshold: float) -> 'SimilarityIndex':
+        """Tokenize each question once and build the index."""
+        return cls([get_words(question) for question in questions], threshold)
+
+    def candidates(self, doc_id: int) -> List[int]:
+        """Sorted ids greater than doc_id that share a prefix token and pass the size filter."""
+        size = self.sizes[doc_id]
+        found = set()
+        for rank in self.prefixes[doc_id]:
+            posting = self.postings[rank]
+            for other in posting[bisect_right(posting, doc_id):]:
+                other_size = self.sizes[other]
+                if min(size, other_size) >= self.threshold * max(size, other_size) - _EPSILON:
+                    found.add(other)
+        return sorted(found)
+
+    def pairs_for(self, doc_id: int) -> List[Tuple[int, int, float]]:
+        """Verified (doc_id, other, similarity) pairs with other > doc_id, in index order."""
+        if self.threshold <= 0:
+            return [
+                (doc_id, other, jaccard_similarity(self.token_sets[doc_id], self.token_sets[other]))
+                for other in range(doc_id + 1, len(self.token_sets))
+            ]
+
+        if not self.token_sets[doc_id]:
+            if 1.0 < self.threshold:
+                return []
+            start = bisect_right(self.empty_documents, doc_id)
+            return [(doc_id, other, 1.0) for other in self.empty_documents[start:]]
+
+        pairs = []
+        tokens = self.token_sets[doc_id]
+        candidates = self.candidates(doc_id)
+        self.compared += len(candidates)
+        for other in candidates:
+            similarity = jaccard_similarity(tokens, self.token_sets[other])
+            if similarity >= self.threshold:
+                pairs.append((doc_id, other, similarity))
+        return pairs
+
+    def pairs_for_block(self, start: int, stop: int) -> List[Tuple[int, int, float]]:
+        """Qualifying pairs whose first index lies in [start, stop), in index order."""
+        pairs = []
+        for doc_id in range(start, stop):
+            pairs.extend(self.pairs_for(doc_id))
+        return pairs
+
+    def all_pairs(self, workers: int = 1, block_size: Optional[int] = None) -> List[Tuple[int, int, float]]:
+        """
+        Every qualifying pair, ordered exactly like a nested i < j scan.
+
+        With workers > 1 the document range is split into blocks that are
+        scored in a process pool. The index is sent to each worker once when
+        the pool starts, not with every block, and blocks are reassembled in
+        order so the result is identical to the serial run.
+        """
+        total = len(self.token_sets)
+        if workers <= 1 or total < 2:
+            return self.pairs_for_block(0, total)
+
+        if block_size is None:
+            # Many small blocks keep workers busy although early documents have more candidates
+            block_size = max(1, math.ceil(total / (workers * 16)))
+        starts = range(0, total, block_size)
+        stops = [min(start + block_size, total) for start in starts]
+
+        pairs = []
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self,)) as executor:
+            for block, compared in executor.map(_score_block, starts, stops):
+                pairs.extend(block)
+                self.compared += compared
+        return pairs
+
+
+# Index held by each pool worker, installed once by the pool initializer
+_worker_index: Optional[SimilarityIndex] = None
+
+
+def _init_worker(index: SimilarityIndex) -> None:
+    global _worker_index
+    _worker_index = index
+
+
+def _score_block(start: int, stop: int) -> Tuple[List[Tuple[int, int, float]], int]:
+    """Pairs of one block and the number of candidates the worker compared for it."""
+    compared = _worker_index.compared
+    pairs = _worker_index.pairs_for_block(start, stop)
+    return pairs, _worker_index.compared - compared
+
+
+def find_similar_pairs(questions: Sequence[str], similarity_threshold: float = 0.8,
+                       workers: int = 1) -> List[Tuple[int, int, float]]:
+    """
+    Find all (index1, index2, similarity) pairs with Jaccard similarity at or
+    above the threshold.
+
+    Args:
+        questions: Question strings to compare
+        similarity_threshold: Minimum Jaccard similarity for a pair to be reported
+        workers: Number of worker processes (1 runs in this process)
+
+    Returns:
+        List of (index1, index2, similarity) tuples with index1 < index2,
+        sorted by index1 then index2
+    """
+    index = SimilarityIndex.from_questions(questions, similarity_threshold)
+    pairs = index.all_pairs(workers)
+    count('similarity.pairs_compared', index.compared)
+    return pairs
+
+
+def _max_size(best: float, size: int, remaining: int) -> int:
+    """
+    Largest token set size whose similarity to a query of `size` tokens can
+    still reach best when it shares at most `remaining` of them.
+    """
+    return math.floor(remaining / best - size + remaining + _EPSILON)
+
+
+class NearestQuestionIndex:
+    """
+    Token index for top-k nearest-question queries by Jaccard similarity.
+
+    Every posting list is ordered by (token set size, id), so the sizes that
+    cannot beat the current k-th best score are skipped with a bisection.
+    Query tokens are visited from rarest to most common, and the scan stops
+    once a question that shares none of the visited tokens could no longer
+    enter the top k. Within a posting list, each size is scored as one block:
+    overlaps are counted with C-level set intersections and only questions
+    with enough shared tokens to reach the k-th best score are looked at in
+    Python. Results are exact: the same as scoring every question.
+
+    Measured with benchmarks/bench_most_similar.py on 100k synthetic FAQs
+    (about 5.5k distinct tokens): about 0.8 ms per query at p50 and 25 ms at
+    p99, against 210 ms for scoring every question; reloading the index from
+    JSON takes about 1.3 s. The tail is questions whose k-th best match shares
+    mostly very common words: every question of a competing size in a
+    posting list of around 10k has to be scored to keep the result exact.
+    """
+
+    def __init__(self, token_sets: Sequence[Set[str]] = ()):
+        self.token_ids: Dict[str, int] = {}
+        self.sizes: List[int] = []
+        self.documents: List[frozenset] = []
+        # token id -> ids of the questions holding it, ordered by (size, id),
+        # and the sizes of those questions in the same order
+        self.posting_ids: List[List[int]] = []
+        self.posting_sizes: List[List[int]] = []
+        self.empty_documents: List[int] = []
+        for tokens in token_sets:
+            self._append(tokens, sort=False)
+        sizes = self.sizes
+        for token_id, doc_ids in enumerate(self.posting_ids):
+            doc_ids.sort(key=lambda doc_id: (sizes[doc_id], doc_id))
+            self.posting_sizes[token_id] = [sizes[doc_id] for doc_id in doc_ids]
+
+    @classmethod
+    def from_questions(cls, questions: Sequence[str]) -> 'NearestQuestionIndex':
+        """Tokenize each question once and build the index."""
+        return cls(get_words(question) for question in questions)
+
+    def __len__(self) -> int:
+        return len(self.sizes)
+
+    def _append(self, tokens: Set[str], sort: bool = True) -> int:
+        doc_id = len(self.sizes)
+        ids = []
+        for token in tokens:
+            token_id = self.token_ids.get(token)
+            if token_id is None:
+                token_id = self.token_ids[token] = len(self.posting_ids)
+                self.posting_ids.append([])
+                self.posting_sizes.append([])
+            ids.append(token_id)
+        size = len(ids)
+        self.sizes.append(size)
+        self.documents.append(frozenset(ids))
+        if not ids:
+            self.empty_documents.append(doc_id)
+        for token_id in ids:
+            if sort:
+                # doc_id is the largest id, so it goes after every question of its size
+                position = bisect_right(self.posting_sizes[token_id], size)
+                self.posting_ids[token_id].insert(position, doc_id)
+                self.posting_sizes[token_id].insert(position, size)
+            else:
+                self.posting_ids[token_id].append(doc_id)
+        return doc_id
+
+    def add(self, question: str) -> int:
+        """Index one more question and return its id (the next corpus position)."""
+        return self._append(get_words(question))
+
+    def most_similar(self, question: str, k: int = 5,
+                     min_similarity: float = 0.0) -> List[Tuple[int, float]]:
+        """
+        The k indexed questions most similar to a new one.
+
+        Args:
+            question: Question text to look up
+            k: Maximum number of results
+            min_similarity: Smallest Jaccard similarity worth reporting
+
+        Returns:
+            (id, similarity) pairs sharing at least one word with the question,
+            best first, ties broken by id
+        """
+        if k <= 0:
+            return []
+        words = get_words(question)
+        if not words:
+            if min_similarity > 1.0:
+                return []
+            return [(doc_id, 1.0) for doc_id in self.empty_documents[:k]]
+
+        size = len(words)
+        query = frozenset(self.token_ids[word] for word in words if word in self.token_ids)
+        shared = query.intersection
+        documents = self.documents.__getitem__
+        ordered = sorted(query, key=lambda token_id: len(self.posting_ids[token_id]))
+        # Min-heap of (similarity, -id): the root is the weakest of the current top k
+        heap: List[Tuple[float, int]] = []
+        seen: Set[int] = set()
+        compared = 0
+        for position, token_id in enumerate(ordered):
+            best = heap[0][0] if len(heap) == k else min_similarity
+            # A question of size s first met here shares at most o = min(remaining, s)
+            # query tokens, so its similarity is at most o / (size + s - o): s / size
+            # below remaining, remaining / (size + s - remaining) above it
+            remaining = len(ordered) - position
+            if remaining / size < best - _EPSILON:
+                break
+            doc_ids = self.posting_ids[token_id]
+            posting_sizes = self.posting_sizes[token_id]
+            block_start = bisect_left(posting_sizes, math.ceil(best * size - _EPSILON))
+            while block_start < len(posting_sizes):
+                best = heap[0][0] if len(heap) == k else min_similarity
+                other_size = posting_sizes[block_start]
+                if best > 0 and other_size > _max_size(best, size, remaining):
+                    break
+                block_end = bisect_right(posting_sizes, other_size, block_start)
+                block = doc_ids[block_start:block_end]
+                block_start = block_end
+                compared += len(block)
+                # Shared tokens needed for o / (size + other_size - o) to reach best
+                needed = max(1, math.ceil(best * (size + other_size) / (1 + best) - _EPSILON))
+                overlaps = list(map(len, map(shared, map(documents, block))))
+                for i in compress(range(len(block)), map(needed.__le__, overlaps)):
+                    doc_id = block[i]
+                    # A question that fell short under an earlier token still falls
+                    # short, since best only grows; only survivors need remembering
+                    if doc_id in seen:
+                        continue
+                    seen.add(doc_id)
+                    overlap = overlaps[i]
+                    entry = (overlap / (size + other_size - overlap), -doc_id)
+                    if len(heap) < k:
+                        if entry[0] >= min_similarity:
+                            heapq.heappush(heap, entry)
+                    elif entry > heap[0]:
+                        heapq.heapreplace(heap, entry)
+        count('similarity.query_compared', compared)
+        return [(-negative_id, similarity) for similarity, negative_id in sorted(heap, reverse=True)]
+
+    def to_dict(self, source: Optional[str] = None) -> Dict[str, Any]:
+        """Serializable form: vocabulary, set sizes and size-ordered postings."""
+        return {
+            'version': QUESTION_INDEX_VERSION,
+            'sourceHash': source,
+            'tokens': list(self.token_ids),
+            'sizes': self.sizes,
+            'postings': self.posting_ids,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'NearestQuestionIndex':
+        if data.get('version') != QUESTION_INDEX_VERSION:
+            raise ValueError(f"Unsupported question index version: {data.get('version')}")
+        index = cls()
+        index.token_ids = {token: token_id for token_id, token in enumerate(data['tokens'])}
+        index.sizes = sizes = data['sizes']
+        index.posting_ids = data['postings']
+        index.posting_sizes = [list(map(sizes.__getitem__, doc_ids)) for doc_ids in index.posting_ids]
+        documents: List[List[int]] = [[] for _ in sizes]
+        for token_id, doc_ids in enumerate(index.posting_ids):
+            for doc_id in doc_ids:
+                documents[doc_id].append(token_id)
+        index.documents = [frozenset(ids) for ids in documents]
+        index.empty_documents = [doc_id for doc_id, size in enumerate(sizes) if not size]
+        return index
+
+
+def question_index_path(faq_file: str) -> str:
+    """Location of the persistent question index for a FAQ file."""
+    return f"{faq_file}.questions.json"
+
+
+def load_question_index(faq_file: str, index_file: Optional[str] = None) -> NearestQuestionIndex:
+    """
+    Load the question index of a FAQ file, rebuilding and saving it when it is
+    missing, unreadable or was built from a different version of the file.
+    """
+    from faq_index import source_hash
+    from load_faqs import iter_faqs, write_json_atomic
+
+    index_file = index_file or question_index_path(faq_file)
+    source = source_hash(faq_file)
+    if os.path.exists(index_file):
+        try:
+            with open(index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('sourceHash') == source:
+                return NearestQuestionIndex.from_dict(data)
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Ignoring unreadable question index {index_file}: {e}")
+
+    index = NearestQuestionIndex.from_questions([faq.get('question', '') for faq in iter_faqs(faq_file)])
+    write_json_atomic(index_file, index.to_dict(source))
+    print(f"Question index for {len(index)} FAQs saved to: {index_file}")
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build or query the nearest-question index')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build = subparsers.add_parser('build', help='Build the question index next to the FAQ file')
+    build.add_argument('--input', default='data/faqs.json',
+                       help='Input FAQ file (default: data/faqs.json)')
+    query = subparsers.add_parser('query', help='Find the existing questions closest to a new one')
+    query.add_argument('text', help='Question text')
+    query.add_argument('--input', default='data/faqs.json',
+                       help='FAQ file to search (default: data/faqs.json)')
+    query.add_argument('--top', type=int, default=5,
+                       help='Number of results (default: 5)')
+    query.add_argument('--min-similarity', type=float, default=0.0,
+                       help='Smallest similarity to report (default: 0.0)')
+
+    args = parser.parse_args()
+
+    index = load_question_index(args.input)
+    if args.command == 'build':
+        print(f"  Distinct question tokens: {len(index.token_ids)}")
+        return
+    from load_faqs import load_faq_at
+    for rank, (faq_id, similarity) in enumerate(index.most_similar(args.text, args.top, args.min_similarity), 1):
+        print(f"  {rank}. [{faq_id}] {similarity:.3f} {load_faq_at(args.input, faq_id).get('question', '')}")
+
+
+if __name__ == '__main__':
+    main()
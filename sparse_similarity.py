@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Sparse-matrix backend for question similarity.
+Encodes each question as a binary token-incidence row, finds candidate pairs
+with a sparse matrix product over rare-word prefixes one row block at a time,
+and scores them from the incidence rows, so the dense n x n similarity matrix
+is never built.
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # pragma: no cover - numpy/scipy are optional for the other scripts
+    np = None
+    sparse = None
+
+from similarity_index import _EPSILON, SimilarityIndex, get_words, prefix_length
+
+DEFAULT_BLOCK_SIZE = 2048
+# Upper bound on candidate entries produced by one block product
+DEFAULT_MAX_CANDIDATES = 2_000_000
+
+
+def _require_scipy():
+    if sparse is None:
+        raise ImportError("The sparse backend requires numpy and scipy (pip install numpy scipy)")
+
+
+def incidence_matrix(questions: Sequence[str]) -> 'sparse.csr_matrix':
+    """Binary CSR matrix with one row per question and one column per distinct word."""
+    _require_scipy()
+    vocabulary: Dict[str, int] = {}
+    indptr = [0]
+    indices: List[int] = []
+    for question in questions:
+        for word in get_words(question):
+            indices.append(vocabulary.setdefault(word, len(vocabulary)))
+        indptr.append(len(indices))
+    data = np.ones(len(indices), dtype=np.int32)
+    return sparse.csr_matrix(
+        (data, np.array(indices, dtype=np.int32), np.array(indptr, dtype=np.int64)),
+        shape=(len(questions), max(len(vocabulary), 1))
+    )
+
+
+def prefix_matrix(matrix: 'sparse.csr_matrix', similarity_threshold: float) -> 'sparse.csr_matrix':
+    """
+    Incidence matrix restricted to each row's prefix: its rarest words, as many
+    as prefix_length allows. Two rows reaching the threshold always share a
+    prefix word, so P @ P.T contains every qualifying pair.
+    """
+    document_frequency = np.asarray(matrix.sum(axis=0)).ravel()
+    rank = np.empty(matrix.shape[1], dtype=np.int64)
+    rank[np.lexsort((np.arange(matrix.shape[1]), document_frequency))] = np.arange(matrix.shape[1])
+
+    indptr = [0]
+    indices: List['np.ndarray'] = []
+    for row in range(matrix.shape[0]):
+        columns = matrix.indices[matrix.indptr[row]:matrix.indptr[row + 1]]
+        prefix = columns[np.argsort(rank[columns], kind='stable')][:prefix_length(len(columns), similarity_threshold)]
+        indices.append(prefix)
+        indptr.append(indptr[-1] + len(prefix))
+    flat = np.concatenate(indices) if indices else np.empty(0, dtype=np.int32)
+    return sparse.csr_matrix(
+        (np.ones(len(flat), dtype=np.int32), flat, np.array(indptr, dtype=np.int64)),
+        shape=matrix.shape
+    )
+
+
+def row_blocks(costs: 'np.ndarray', block_size: int, max_candidates: int) -> List[Tuple[int, int]]:
+    """
+    Split rows into consecutive (start, stop) blocks of at most block_size rows
+    whose summed cost stays within max_candidates (a single row always fits).
+    """
+    blocks = []
+    start = 0
+    running = 0
+    for row, cost in enumerate(costs.tolist()):
+        if row > start and (row - start >= block_size or running + cost > max_candidates):
+            blocks.append((start, row))
+            start, running = row, 0
+        running += cost
+    if start < len(costs):
+        blocks.append((start, len(costs)))
+    return blocks
+
+
+def find_similar_pairs_sparse(questions: Sequence[str], similarity_threshold: float = 0.8,
+                              block_size: int = DEFAULT_BLOCK_SIZE,
+                              max_candidates: int = DEFAULT_MAX_CANDIDATES) -> List[Tuple[int, int, float]]:
+    """
+    Sparse-matrix equivalent of similarity_index.find_similar_pairs.
+
+    For each block of rows, candidate pairs come from the prefix product
+    P[block] @ P.T, are size-filtered against the row sums, and their exact
+    intersections come from the elementwise product of the incidence rows.
+    Blocks are sized so one product holds at most max_candidates entries,
+    which bounds peak memory; the dense n x n matrix is never built.
+
+    Returns:
+        List of (index1, index2, similarity) tuples with index1 < index2,
+        sorted by index1 then index2
+    """
+    _require_scipy()
+    if similarity_threshold <= 0:
+        # Every pair qualifies, including ones with no shared words
+        return SimilarityIndex.from_questions(questions, similarity_threshold).all_pairs()
+
+    matrix = incidence_matrix(questions)
+    sizes = np.diff(matrix.indptr).astype(np.int64)
+    prefixes = prefix_matrix(matrix, similarity_threshold)
+    prefixes_transposed = prefixes.T.tocsr()
+
+    pairs: List[Tuple[int, int, float]] = []
+    empty_rows = np.flatnonzero(sizes == 0)
+    empty_pairs = 1.0 >= similarity_threshold and len(empty_rows) > 1
+
+    prefix_frequency = np.asarray(prefixes.sum(axis=0)).ravel().astype(np.int64)
+    costs = prefixes @ prefix_frequency
+
+    for start, stop in row_blocks(costs, block_size, max_candidates):
+        candidates = (prefixes[start:stop] @ prefixes_transposed).tocoo()
+        rows = candidates.row.astype(np.int64) + start
+        cols = candidates.col.astype(np.int64)
+        smaller = np.minimum(sizes[rows], sizes[cols])
+        larger = np.maximum(sizes[rows], sizes[cols])
+        keep = (cols > rows) & (smaller >= similarity_threshold * larger - _EPSILON)
+        rows, cols = rows[keep], cols[keep]
+
+        intersections = np.asarray(matrix[rows].multiply(matrix[cols]).sum(axis=1)).ravel().astype(np.int64)
+        unions = sizes[rows] + sizes[cols] - intersections
+        similarities = intersections / unions
+        keep = similarities >= similarity_threshold
+        rows, cols, similarities = rows[keep], cols[keep], similarities[keep]
+
+        if empty_pairs:
+            block_empty = empty_rows[(empty_rows >= start) & (empty_rows < stop)]
+            for row in block_empty:
+                later = empty_rows[empty_rows > row]
+                rows = np.concatenate([rows, np.full(len(later), row, dtype=np.int64)])
+                cols = np.concatenate([cols, later])
+                similarities = np.concatenate([similarities, np.ones(len(later))])
+
+        order = np.lexsort((cols, rows))
+        pairs.extend(zip(rows[order].tolist(), cols[order].tolist(), similarities[order].tolist()))
+    return pairs
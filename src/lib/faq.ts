@@ -1,4 +1,5 @@
 import faqs from '../../data/faqs.json';
+import faqIndex from '../../data/faqs.index.json';
 
 export interface FAQ {
   category: string;
@@ -8,20 +9,69 @@ export interface FAQ {
   embedding?: number[];
 }
 
+interface FaqSearchIndex {
+  count: number;
+  contentHash?: string;
+  questions: string[];
+  keywordIndex: Record<string, number[]>;
+}
+
 const faqsData: FAQ[] = faqs as any;
 
-export function searchFaq(query: string, topN = 3): FAQ[] {
-  const q = query.toLowerCase();
-  const scored = faqsData.map((f) => {
-    let score = 0;
-    if (f.question.toLowerCase().includes(q)) score += 2;
+// Prebuilt by `python faq_index.py build`. If it was built from other
+// questions or keywords than faqs.json holds, lowercase once at load time instead.
+const prebuiltIndex = faqIndex as unknown as FaqSearchIndex;
+const searchIndex: FaqSearchIndex =
+  prebuiltIndex.count === faqsData.length && prebuiltIndex.contentHash === contentHash(faqsData)
+    ? prebuiltIndex
+    : buildSearchIndex(faqsData);
+
+// 32-bit FNV-1a over the UTF-16 code units of every question and keyword;
+// must match content_hash() in faq_index.py.
+function contentHash(data: FAQ[]): string {
+  let hash = 0x811c9dc5;
+  const feed = (unit: number) => {
+    hash = Math.imul(hash ^ unit, 0x01000193) >>> 0;
+  };
+  for (const f of data) {
+    feed(1);
+    for (const text of [f.question, ...f.keywords]) {
+      for (let i = 0; i < text.length; i++) feed(text.charCodeAt(i));
+      feed(0);
+    }
+  }
+  return hash.toString(16).padStart(8, '0');
+}
+
+function buildSearchIndex(data: FAQ[]): FaqSearchIndex {
+  // No prototype, so keywords like "constructor" are ordinary keys
+  const keywordIndex: Record<string, number[]> = Object.create(null);
+  data.forEach((f, id) => {
     f.keywords.forEach((k) => {
-      if (q.includes(k.toLowerCase())) score += 1;
+      const key = k.toLowerCase();
+      if (!keywordIndex[key]) keywordIndex[key] = [];
+      keywordIndex[key].push(id);
     });
-    return { faq: f, score };
   });
-  scored.sort((a, b) => b.score - a.score);
-  return scored.filter((s) => s.score > 0).slice(0, topN).map((s) => s.faq);
+  return { count: data.length, questions: data.map((f) => f.question.toLowerCase()), keywordIndex };
+}
+
+export function searchFaq(query: string, topN = 3): FAQ[] {
+  const q = query.toLowerCase();
+  const scores = new Map<number, number>();
+  const add = (id: number, points: number) => scores.set(id, (scores.get(id) ?? 0) + points);
+
+  searchIndex.questions.forEach((question, id) => {
+    if (question.includes(q)) add(id, 2);
+  });
+  for (const [keyword, ids] of Object.entries(searchIndex.keywordIndex)) {
+    if (q.includes(keyword)) ids.forEach((id) => add(id, 1));
+  }
+
+  return [...scores.entries()]
+    .sort((a, b) => b[1] - a[1] || a[0] - b[0])
+    .slice(0, topN)
+    .map(([id]) => faqsData[id]);
 }
 
 export { faqsData as faqs };
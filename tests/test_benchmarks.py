@@ -0,0 +1,34 @@
+import os
+import subprocess
+import sys
+import unittest
+from unittest import mock
+
+BENCHMARKS = os.path.join(os.path.dirname(__file__), '..', 'benchmarks')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BENCHMARKS)
+
+import corpus
+from text_processing import normalize_text
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_corpus_without_duplicates_has_distinct_questions(self):
+        """Test that duplicate_rate=0 gives distinct questions even when the phrase generator repeats itself."""
+        repeated = ['can i rent a item1 item2 near place3?'] * 300
+        with mock.patch.object(corpus, 'synthetic_questions', return_value=repeated):
+            faqs = corpus.generate_corpus(300, duplicate_rate=0.0)
+        questions = [normalize_text(faq['question']) for faq in faqs]
+        self.assertEqual(len(set(questions)), len(questions))
+
+    def test_validate_benchmark_smoke_run(self):
+        """Test that the validation benchmark runs to completion at a small size."""
+        result = subprocess.run([sys.executable, os.path.join(BENCHMARKS, 'bench_validate.py'), '--size', '300'],
+                                capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn('assertions per rule', result.stdout)
+        self.assertIn('violations: 0', result.stdout)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import embeddings
+
+
+@unittest.skipIf(embeddings.np is None, "numpy is not installed")
+class TestEmbeddings(unittest.TestCase):
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.faq_path = os.path.join(self.tmp.name, 'faqs.json')
+        shutil.copy(os.path.join(test_dir, '..', 'data', 'faqs.json'), self.faq_path)
+        with open(self.faq_path) as f:
+            self.faqs = json.load(f)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_build_stores_memory_mapped_float32_matrix(self):
+        """Test that the stored matrix is float32, unit length and memory-mapped on load."""
+        paths = embeddings.build_embeddings(self.faq_path, dimension=64)
+        vectors, meta = embeddings.load_embeddings(paths)
+        self.assertIsInstance(vectors, embeddings.np.memmap)
+        self.assertEqual(vectors.dtype, embeddings.np.float32)
+        self.assertEqual(vectors.shape, (len(self.faqs), 64))
+        self.assertTrue(embeddings.np.allclose(embeddings.np.linalg.norm(vectors, axis=1), 1.0, atol=1e-5))
+        self.assertEqual(meta['count'], len(self.faqs))
+
+    def test_full_probe_matches_brute_force(self):
+        """Test that probing every IVF list returns the exact nearest neighbours."""
+        embeddings.build_embeddings(self.faq_path)
+        search = embeddings.EmbeddingSearch(self.faq_path)
+        query = 'where can I rent a bicycle'
+        n_lists = len(search.ivf.centroids)
+        self.assertEqual([row for row, _ in search.search(query, k=5, n_probe=n_lists)],
+                         [row for row, _ in search.search(query, k=5, exact=True)])
+        self.assertEqual(search.search(query, k=1, exact=True)[0][0], 0)
+
+    def test_stale_embeddings_are_refused(self):
+        """Test that search refuses embeddings built from a different version of the FAQ file."""
+        embeddings.build_embeddings(self.faq_path)
+        edited = self.faqs[:1] + self.faqs[2:] + [dict(self.faqs[1], question='Moved and edited?')]
+        with open(self.faq_path, 'w') as f:
+            json.dump(edited, f)
+        with self.assertRaises(ValueError):
+            embeddings.EmbeddingSearch(self.faq_path)
+        embeddings.build_embeddings(self.faq_path)
+        self.assertEqual(len(embeddings.EmbeddingSearch(self.faq_path).faqs), len(edited))
+
+    def test_blocked_search_matches_dense_matrix(self):
+        """Test that blocked pair search equals thresholding the full similarity matrix."""
+        np = embeddings.np
+        vectors = embeddings.HashingEmbedder(use_idf=False).embed([faq['question'] for faq in self.faqs])
+        dense = vectors @ vectors.T
+        expected = [(i, j) for i in range(len(vectors)) for j in range(i + 1, len(vectors))
+                    if dense[i, j] >= 0.5]
+        found = embeddings.find_similar_pairs_embedding(vectors, 0.5, top_k=len(vectors), block_size=7)
+        self.assertEqual([(i, j) for i, j, _ in found], expected)
+
+        limited = embeddings.find_similar_pairs_embedding(vectors, 0.5, top_k=1, block_size=7)
+        for i in {i for i, _ in expected}:
+            partners = [(j, s) for a, j, s in limited if a == i]
+            self.assertEqual(len(partners), 1)
+            self.assertTrue(np.isclose(partners[0][1], max(dense[i, j] for a, j in expected if a == i)))
+
+    def test_cache_only_embeds_changed_questions(self):
+        """Test that a rerun reuses cached embeddings for unchanged questions."""
+        cache_file = embeddings.embedding_cache_path(self.faq_path)
+        embeddings.find_similar_questions_embedding(self.faqs, cache_file=cache_file)
+
+        self.faqs[3]['question'] = 'A brand new question?'
+        embedder = embeddings.load_embedder('hashing', use_idf=False)
+        cache = embeddings.EmbeddingCache('hashing', embedder, cache_file)
+        vectors = cache.embed([faq['question'] for faq in self.faqs])
+        self.assertEqual((cache.misses, cache.hits), (1, len(self.faqs) - 1))
+        self.assertTrue(embeddings.np.allclose(vectors, embedder.embed([faq['question'] for faq in self.faqs])))
+
+
+if __name__ == '__main__':
+    unittest.main()
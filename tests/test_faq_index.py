@@ -0,0 +1,73 @@
+import json
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from faq_index import FaqSearchIndex, build_search_index, content_hash
+
+
+def reference_search(faqs, query, top_n=3):
+    """Direct port of searchFaq from src/lib/faq.ts."""
+    q = query.lower()
+    scored = []
+    for faq_id, f in enumerate(faqs):
+        score = 0
+        if q in f['question'].lower():
+            score += 2
+        for k in f['keywords']:
+            if k.lower() in q:
+                score += 1
+        scored.append((faq_id, score))
+    scored.sort(key=lambda item: -item[1])
+    return [faq_id for faq_id, score in scored if score > 0][:top_n]
+
+
+class TestFaqSearchIndex(unittest.TestCase):
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        with open(os.path.join(test_dir, '..', 'data', 'faqs.json')) as f:
+            self.faqs = json.load(f)
+        self.index = FaqSearchIndex(build_search_index(self.faqs))
+
+    def test_parity_with_search_faq(self):
+        """Test that indexed queries rank FAQs exactly like searchFaq."""
+        queries = ['', 'a', 'bicycle', 'Can I rent a bicycle or a motorbike?', 'massage spa',
+                   'rent a', 'ent a bic', 'WHERE CAN I', 'wifi password please', 'towels', 'xyz']
+        queries += [faq['question'] for faq in self.faqs]
+        queries += [' '.join(faq['keywords']) for faq in self.faqs]
+        for query in queries:
+            for top_n in [3, 100]:
+                self.assertEqual(self.index.search(query, top_n), reference_search(self.faqs, query, top_n),
+                                 f"Mismatch for query {query!r}")
+
+    def test_repeated_keywords_score_separately(self):
+        """Test that a keyword listed twice on one FAQ counts twice, as in searchFaq."""
+        faqs = [
+            {'question': 'One?', 'keywords': ['pool'], 'answer': ''},
+            {'question': 'Two?', 'keywords': ['pool', 'POOL'], 'answer': ''},
+        ]
+        index = FaqSearchIndex(build_search_index(faqs))
+        self.assertEqual(index.search('pool hours'), reference_search(faqs, 'pool hours'))
+        self.assertEqual(index.scores('pool hours'), {0: 1, 1: 2})
+
+
+    def test_content_hash_detects_same_count_edits(self):
+        """Test that the hash the app checks changes with any question or keyword edit."""
+        edited_keyword = [dict(faq) for faq in self.faqs]
+        edited_keyword[5]['keywords'] = edited_keyword[5]['keywords'] + ['constructor']
+        edited_question = [dict(faq) for faq in self.faqs]
+        edited_question[40]['question'] += ' '
+        hashes = {content_hash(self.faqs), content_hash(edited_keyword), content_hash(edited_question)}
+        self.assertEqual(len(hashes), 3)
+        self.assertEqual(build_search_index(self.faqs)['contentHash'], content_hash(self.faqs))
+
+    def test_content_hash_matches_typescript(self):
+        """Test against the value contentHash() in src/lib/faq.ts gives (UTF-16 code units)."""
+        faqs = [{'question': 'Ünïcode 😀 q', 'keywords': ['constructor', 'Ω']}, {'question': '', 'keywords': []}]
+        self.assertEqual(content_hash(faqs), 'fd40dfa8')
+
+
+if __name__ == '__main__':
+    unittest.main()
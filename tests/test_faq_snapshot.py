@@ -0,0 +1,87 @@
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import text_processing
+from faq_snapshot import FaqSnapshot, build_snapshot, snapshot_path
+from load_faqs import load_faq_at, load_faqs, write_faqs
+from text_processing import get_words, normalize_category
+
+
+class TestFaqSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'faqs.json')
+        shutil.copy(os.path.join(os.path.dirname(__file__), '..', 'data', 'faqs.json'), self.path)
+        with open(self.path, encoding='utf-8') as f:
+            self.faqs = json.load(f)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def load_at(self, index):
+        """load_faq_at, and whether it decoded the entry from the snapshot."""
+        with mock.patch.object(FaqSnapshot, '__getitem__', autospec=True,
+                               side_effect=FaqSnapshot.__getitem__) as from_snapshot:
+            faq = load_faq_at(self.path, index)
+        return faq, from_snapshot.called
+
+    def test_round_trip_and_precomputed_fields(self):
+        """Test that entries, categories and tokens match what the JSON gives."""
+        build_snapshot(self.path)
+        with FaqSnapshot.open(self.path) as snapshot:
+            self.assertEqual(len(snapshot), len(self.faqs))
+            self.assertEqual(snapshot.load_all(), self.faqs)
+            self.assertEqual(list(snapshot), self.faqs)
+            self.assertEqual(snapshot[-1], self.faqs[-1])
+            for i, faq in enumerate(self.faqs):
+                self.assertEqual(snapshot.category(i), normalize_category(faq['category']))
+                self.assertEqual(snapshot.question_tokens(i), get_words(faq['question']))
+            with self.assertRaises(IndexError):
+                snapshot[len(self.faqs)]
+
+    def test_random_access_uses_current_snapshot_and_falls_back_when_stale(self):
+        """Test that load_faq_at reads the snapshot only while it matches the file."""
+        self.assertEqual(self.load_at(7), (self.faqs[7], False))
+        build_snapshot(self.path)
+        self.assertEqual(self.load_at(7), (self.faqs[7], True))
+
+        # Touched but unchanged: confirmed by hash
+        os.utime(self.path, ns=(0, os.stat(self.path).st_mtime_ns + 10**9))
+        self.assertEqual(self.load_at(7), (self.faqs[7], True))
+
+        edited = self.faqs[:-1] + [dict(self.faqs[-1], question='Changed?')]
+        write_faqs(self.path, edited)
+        self.assertIsNone(FaqSnapshot.open(self.path))
+        self.assertEqual(self.load_at(len(edited) - 1), (edited[-1], False))
+
+        with open(snapshot_path(self.path), 'wb') as f:
+            f.write(b'FAQSNAP\x00 truncated')
+        self.assertEqual(self.load_at(7), (edited[7], False))
+
+    def test_whole_corpus_loads_from_json(self):
+        """Test that load_faqs parses the JSON even when a snapshot is current."""
+        build_snapshot(self.path)
+        with mock.patch.object(FaqSnapshot, 'open') as open_snapshot, contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(load_faqs(self.path), self.faqs)
+        open_snapshot.assert_not_called()
+
+    def test_changed_normalizer_recomputes_tokens(self):
+        """Test that stored tokens are not trusted once the normalizer fingerprint changes."""
+        build_snapshot(self.path)
+        with mock.patch.object(text_processing, 'normalizer_fingerprint', return_value='0' * 40):
+            with FaqSnapshot.open(self.path) as snapshot, \
+                    mock.patch.object(text_processing, 'get_words', return_value=frozenset('k')) as words:
+                self.assertEqual(snapshot.question_tokens(3), frozenset('k'))
+                words.assert_called_once_with(self.faqs[3]['question'])
+
+if __name__ == '__main__':
+    unittest.main()
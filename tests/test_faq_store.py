@@ -0,0 +1,72 @@
+import json
+import os
+import sys
+import unittest
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from faq_store import FaqStore
+
+FAQ_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'faqs.json')
+
+
+class TestFaqStore(unittest.TestCase):
+    def setUp(self):
+        with open(FAQ_PATH, encoding='utf-8') as f:
+            self.data = json.load(f)
+        self.store = FaqStore(self.data)
+
+    def test_round_trip(self):
+        """Test that rows convert back to the original dicts, key order included."""
+        self.assertEqual(len(self.store), len(self.data))
+        restored = list(self.store.to_dicts())
+        self.assertEqual(restored, self.data)
+        self.assertEqual([list(faq) for faq in restored], [list(faq) for faq in self.data])
+
+    def test_row_view_is_dict_like(self):
+        """Test the per-row view behaves like the FAQ dict it came from."""
+        row = self.store[-1]
+        self.assertEqual(row['question'], self.data[-1]['question'])
+        self.assertEqual(row.get('keywords'), self.data[-1]['keywords'])
+        self.assertIsNone(row.get('embedding'))
+        self.assertEqual(dict(row.items()), self.data[-1])
+        with self.assertRaises(KeyError):
+            row['embedding']
+        with self.assertRaises(IndexError):
+            self.store[len(self.data)]
+
+    def test_category_counts(self):
+        """Test category counts match a count over the dicts."""
+        expected = Counter(faq['category'] for faq in self.data)
+        self.assertEqual(self.store.category_counts(), dict(expected))
+        self.assertEqual(len(self.store.categories), len(expected))
+
+    def test_irregular_entries_are_preserved(self):
+        """Test missing fields, unusual values and extra fields survive."""
+        faqs = [
+            {'question': 'Is there Wi-Fi?', 'embedding': [0.1, 0.2]},
+            {'category': None, 'question': 42, 'keywords': 'wifi', 'answer': 'Yes – everywhere.'},
+            {'answer': '', 'keywords': [], 'category': 'amenities'},
+        ]
+        store = FaqStore(faqs)
+        self.assertEqual(list(store.to_dicts()), faqs)
+        self.assertEqual(list(store[2]), ['answer', 'keywords', 'category'])
+        self.assertEqual(store.category_counts(), {'amenities': 1})
+        self.assertIsNone(store.category(0))
+
+    def test_smaller_than_dicts(self):
+        """Test the columns take less memory than the dicts they replace."""
+        def deep_size(value):
+            size = sys.getsizeof(value)
+            if isinstance(value, dict):
+                size += sum(deep_size(k) + deep_size(v) for k, v in value.items())
+            elif isinstance(value, list):
+                size += sum(deep_size(item) for item in value)
+            return size
+
+        self.assertLess(self.store.nbytes() * 2, deep_size(self.data))
+
+
+if __name__ == '__main__':
+    unittest.main()
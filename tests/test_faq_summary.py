@@ -0,0 +1,51 @@
+import json
+import os
+import sys
+import unittest
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from faq_store import FaqStore
+from faq_summary import FaqSummary
+
+FAQ_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'faqs.json')
+
+
+class TestFaqSummary(unittest.TestCase):
+    def setUp(self):
+        with open(FAQ_PATH, encoding='utf-8') as f:
+            self.data = json.load(f)
+        self.summary = FaqSummary.from_faqs(self.data)
+
+    def test_counts_match_direct_computation(self):
+        """Test the one-pass counts against straightforward per-field counts."""
+        self.assertEqual(self.summary.total, len(self.data))
+        self.assertEqual(self.summary.categories, Counter(faq['category'] for faq in self.data))
+        self.assertEqual(sum(self.summary.keywords.values()), sum(len(faq['keywords']) for faq in self.data))
+        self.assertEqual(self.summary.field_presence['answer'], len(self.data))
+        lengths = sorted(len(faq['answer']) for faq in self.data)
+        stats = self.summary.answer_length_stats()
+        self.assertEqual((stats['min'], stats['max']), (lengths[0], lengths[-1]))
+        self.assertEqual(stats['median'], lengths[(len(lengths) - 1) // 2])
+        self.assertEqual(sum(n for _, n in self.summary.answer_length_histogram(50)), len(self.data))
+
+    def test_shard_merge_equals_single_pass(self):
+        """Test merging per-shard summaries, including through JSON, gives the full summary."""
+        shards = [self.data[i:i + 20] for i in range(0, len(self.data), 20)]
+        partials = [json.loads(json.dumps(FaqSummary.from_faqs(shard).to_dict())) for shard in shards]
+        merged = FaqSummary.merge_all(FaqSummary.from_dict(partial) for partial in partials)
+        self.assertEqual(merged, self.summary)
+        self.assertEqual(FaqSummary.from_faqs(shards[0]) + FaqSummary.from_faqs(self.data[20:]), self.summary)
+
+    def test_store_fast_path_matches_dicts(self):
+        """Test summarizing a FaqStore gives the same result as summarizing dicts."""
+        faqs = self.data + [
+            {'question': 'Is there Wi-Fi?', 'embedding': [0.1]},
+            {'category': None, 'question': 42, 'keywords': ['WiFi', 3], 'answer': None},
+        ]
+        self.assertEqual(FaqSummary.from_faqs(FaqStore(faqs)), FaqSummary.from_faqs(faqs))
+
+
+if __name__ == '__main__':
+    unittest.main()
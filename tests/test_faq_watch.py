@@ -0,0 +1,154 @@
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import instrumentation
+from detect_duplicates_enhanced import detect_and_remove_duplicates
+from faq_summary import FaqSummary
+from faq_watch import CorpusState, FaqWatcher
+from load_faqs import write_faqs
+from similarity_index import find_similar_pairs
+
+WORDS = ['pool', 'spa', 'bike', 'rent', 'open', 'hours', 'beach', 'parking', 'pets', 'breakfast']
+
+
+def faq(question, category='Amenities', answer='Yes.'):
+    return {'category': category, 'question': question, 'keywords': ['k'], 'answer': answer}
+
+
+def random_faq(rng):
+    words = rng.sample(WORDS, rng.randint(0, 4))
+    if rng.random() < 0.3:
+        words = [word.upper() for word in words]
+    return faq(' '.join(words) + '?', rng.choice(['Amenities', 'local area', 'Policies ']), rng.choice(['Yes.', 'No.']))
+
+
+class TestCorpusState(unittest.TestCase):
+    def setUp(self):
+        instrumentation.set_verbose(False)
+
+    def tearDown(self):
+        instrumentation.set_verbose(True)
+
+    def assertMatchesBatch(self, state, faqs, check_answer=False):
+        with contextlib.redirect_stdout(io.StringIO()):
+            unique, removed = detect_and_remove_duplicates(faqs, check_answer)
+        self.assertEqual(state.duplicates(), removed)
+        duplicate_positions = {d['duplicate_index'] for d in removed}
+        positions = [i for i in range(len(faqs)) if i not in duplicate_positions]
+        expected = [(positions[i], positions[j], similarity) for i, j, similarity
+                    in find_similar_pairs([f['question'] for f in unique], state.threshold)]
+        self.assertEqual([(p['index1'], p['index2'], p['similarity']) for p in state.similar_pairs()], expected)
+        self.assertEqual(state.summary, FaqSummary.from_faqs(faqs))
+
+    def test_incremental_updates_match_batch(self):
+        """Test that reports after random inserts, deletes and edits equal a from-scratch run."""
+        rng = random.Random(7)
+        for check_answer in (False, True):
+            state = CorpusState(threshold=0.6, check_answer=check_answer)
+            faqs = [random_faq(rng) for _ in range(60)]
+            state.update(faqs)
+            self.assertMatchesBatch(state, faqs, check_answer)
+            for _ in range(25):
+                faqs = list(faqs)
+                for _ in range(rng.randint(1, 4)):
+                    edit = rng.random()
+                    if edit < 0.3 and faqs:
+                        del faqs[rng.randrange(len(faqs))]
+                    elif edit < 0.6:
+                        faqs.insert(rng.randint(0, len(faqs)), random_faq(rng))
+                    elif edit < 0.8 and faqs:
+                        faqs[rng.randrange(len(faqs))] = random_faq(rng)
+                    else:
+                        rng.shuffle(faqs)
+                state.update(faqs)
+                self.assertMatchesBatch(state, faqs, check_answer)
+
+    def test_work_tracks_edit_size(self):
+        """Test that an unchanged corpus costs nothing and one edit compares only its candidates."""
+        faqs = [faq(f"question number {n} about topic {n % 50}?") for n in range(1000)]
+        state = CorpusState()
+        state.update(faqs)
+        self.assertEqual(state.update(list(faqs))[:2], (0, 0))
+        self.assertEqual(state.update(list(faqs)).pairs_compared, 0)
+
+        faqs[500] = faq('question number 500 about topic 0 again?')
+        stats = state.update(faqs)
+        self.assertEqual((stats.added, stats.removed, stats.total), (1, 1, 1000))
+        self.assertLess(stats.pairs_compared, 50)
+
+    def test_rejects_bad_threshold(self):
+        with self.assertRaises(ValueError):
+            CorpusState(threshold=0)
+
+
+class TestFaqWatcher(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'faqs.json')
+        self.output_dir = os.path.join(self.tmp.name, 'derived')
+        instrumentation.set_verbose(False)
+
+    def tearDown(self):
+        instrumentation.set_verbose(True)
+        self.tmp.cleanup()
+
+    def report(self, name):
+        with open(os.path.join(self.output_dir, name), encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_poll_publishes_reports(self):
+        """Test that reports are published on the first poll and after each change only."""
+        write_faqs(self.path, [faq('Can I rent a bike?'), faq('Is there a spa?')])
+        watcher = FaqWatcher(self.path, self.output_dir)
+        self.assertEqual(watcher.poll().added, 2)
+        self.assertIsNone(watcher.poll())
+        self.assertEqual(self.report('duplicates.json')['total_duplicates'], 0)
+        self.assertEqual(self.report('summary.json')['summary']['total'], 2)
+
+        write_faqs(self.path, [faq('Can I rent a bike?'), faq('Is there a spa?'), faq('can i RENT a bike? ')])
+        os.utime(self.path, ns=(0, os.stat(self.path).st_mtime_ns + 1))
+        stats = watcher.poll()
+        self.assertEqual((stats.added, stats.removed), (1, 0))
+        duplicates = self.report('duplicates.json')
+        self.assertEqual([(d['original_index'], d['duplicate_index']) for d in duplicates['duplicates']], [(0, 2)])
+        self.assertEqual(sorted(os.listdir(self.output_dir)), ['duplicates.json', 'similar.json', 'summary.json'])
+
+    def test_unreadable_file_keeps_state(self):
+        """Test that a half-written file is skipped and retried on the next poll."""
+        write_faqs(self.path, [faq('Can I rent a bike?')])
+        watcher = FaqWatcher(self.path, self.output_dir)
+        watcher.poll()
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('[{"question": ')
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertIsNone(watcher.poll())
+        self.assertEqual(len(watcher.state.order), 1)
+        self.assertEqual(self.report('summary.json')['summary']['total'], 1)
+
+        write_faqs(self.path, [faq('Can I rent a bike?'), faq('Is there a spa?')])
+        self.assertEqual(watcher.poll().added, 1)
+
+    def test_missing_file_keeps_watching(self):
+        """Test that a file removed between polls is skipped rather than ending the watch."""
+        write_faqs(self.path, [faq('Can I rent a bike?')])
+        watcher = FaqWatcher(self.path, self.output_dir)
+        watcher.poll()
+        os.remove(self.path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertIsNone(watcher.poll())
+        self.assertEqual(len(watcher.state.order), 1)
+
+        write_faqs(self.path, [faq('Can I rent a bike?'), faq('Is there a spa?')])
+        self.assertEqual(watcher.poll().added, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
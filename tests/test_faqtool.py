@@ -0,0 +1,77 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from faqtool import run_pipeline
+from normalize_categories import normalize_categories
+from detect_duplicates import detect_and_remove_duplicates
+
+
+class TestFaqtoolPipeline(unittest.TestCase):
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        self.tmp = tempfile.TemporaryDirectory()
+        with open(os.path.join(test_dir, '..', 'data', 'faqs.json')) as f:
+            data = json.load(f)
+        data[2]['category'] = '  ' + data[2]['category'].upper()
+        data.append(dict(data[4], question=data[4]['question'].lower() + ' '))
+        self.input_path = os.path.join(self.tmp.name, 'faqs.json')
+        with open(self.input_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_matches_sequential_scripts(self):
+        """Test that normalize -> dedup -> validate equals running the scripts in turn."""
+        sequential_path = os.path.join(self.tmp.name, 'sequential.json')
+        shutil.copy(self.input_path, sequential_path)
+        normalize_categories(sequential_path, sequential_path)
+        with open(sequential_path, encoding='utf-8') as f:
+            expected, _ = detect_and_remove_duplicates(json.load(f))
+
+        output_path = os.path.join(self.tmp.name, 'out.json')
+        context = run_pipeline(self.input_path, output_path, ['normalize', 'dedup', 'validate'])
+        self.assertEqual(context.violations, [])
+        self.assertEqual(len(context.removed_duplicates), 1)
+        with open(output_path, encoding='utf-8') as f:
+            self.assertEqual(f.read(), json.dumps(expected, indent=2, ensure_ascii=False))
+
+    def test_validation_failure_keeps_output_unwritten(self):
+        """Test that validation violations are collected and block the write."""
+        output_path = os.path.join(self.tmp.name, 'out.json')
+        context = run_pipeline(self.input_path, output_path, ['validate'])
+        self.assertEqual(len(context.violations), 0)
+
+        with open(self.input_path, encoding='utf-8') as f:
+            data = json.load(f)
+        data[0]['keywords'] = []
+        del data[1]['answer']
+        with open(self.input_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.remove(output_path)
+        context = run_pipeline(self.input_path, output_path, ['validate'])
+        self.assertEqual([str(v) for v in context.violations], ["Entry 0: keywords should not be empty",
+                                                                "Entry 1 is missing required field: answer"])
+        self.assertFalse(os.path.exists(output_path))
+
+    def test_missing_category_is_reported_by_validate(self):
+        """Test that normalize passes an entry without a category on for validate to report."""
+        with open(self.input_path, encoding='utf-8') as f:
+            data = json.load(f)
+        del data[1]['category']
+        with open(self.input_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        output_path = os.path.join(self.tmp.name, 'out.json')
+        context = run_pipeline(self.input_path, output_path, ['normalize', 'dedup', 'validate'])
+        self.assertEqual([str(v) for v in context.violations], ["Entry 1 is missing required field: category"])
+        self.assertFalse(os.path.exists(output_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
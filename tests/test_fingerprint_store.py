@@ -0,0 +1,106 @@
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import fingerprint_store
+import instrumentation
+from fingerprint_store import FingerprintStore, detect_and_remove_duplicates_incremental
+from detect_duplicates_enhanced import detect_and_remove_duplicates
+from load_faqs import write_faqs
+
+
+class TestFingerprintStore(unittest.TestCase):
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        with open(os.path.join(test_dir, '..', 'data', 'faqs.json')) as f:
+            self.data = json.load(f)
+        self.data.append(dict(self.data[10], question=self.data[10]['question'].upper()))
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, 'fingerprints.sqlite')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_incremental_matches_full_run(self):
+        """Test that appending in batches gives the same result as one full pass."""
+        for check_answer in [False, True]:
+            expected = detect_and_remove_duplicates(self.data, check_answer)
+            db_path = os.path.join(self.tmp.name, f'fingerprints-{check_answer}.sqlite')
+            with FingerprintStore(db_path) as store:
+                detect_and_remove_duplicates_incremental(self.data[:40], store, check_answer)
+            with FingerprintStore(db_path) as store:
+                self.assertEqual(store.processed_count, 40)
+                result = detect_and_remove_duplicates_incremental(self.data, store, check_answer)
+            self.assertEqual(result, expected)
+
+    def test_only_delta_is_keyed(self):
+        """Test that a rerun only computes keys for new entries."""
+        with FingerprintStore(self.db_path) as store:
+            detect_and_remove_duplicates_incremental(self.data[:-3], store)
+            with mock.patch.object(fingerprint_store, 'create_duplicate_key',
+                                   wraps=fingerprint_store.create_duplicate_key) as key_fn:
+                store.add(self.data)
+            self.assertEqual(key_fn.call_count, 3 * len(fingerprint_store.KINDS))
+
+    def test_edit_before_last_entry_rebuilds(self):
+        """Test that editing an already processed entry, not just the last one, resets the store."""
+        faqs = self.data + [{'question': 'A brand new question?', 'answer': 'Yes.'}]
+        with FingerprintStore(self.db_path) as store:
+            detect_and_remove_duplicates_incremental(faqs, store)
+        faqs[len(self.data) - 1] = dict(faqs[len(self.data) - 1], question='Now a distinct question?')
+        with FingerprintStore(self.db_path) as store:
+            self.assertFalse(store.matches_prefix(faqs))
+            result = detect_and_remove_duplicates_incremental(faqs, store)
+        self.assertEqual(result, detect_and_remove_duplicates(faqs))
+        self.assertEqual(len(result[0]), len(faqs))
+
+    def test_file_backed_store_checks_file_bytes(self):
+        """Test that appends to the source file are confirmed from its bytes and edits rebuild."""
+        path = os.path.join(self.tmp.name, 'faqs.json')
+        write_faqs(path, self.data[:-3])
+        with FingerprintStore(self.db_path) as store:
+            detect_and_remove_duplicates_incremental(self.data[:-3], store, source_file=path)
+        write_faqs(path, self.data)
+        with FingerprintStore(self.db_path) as store, \
+                mock.patch.object(fingerprint_store.FingerprintStore, '_prefix_digest') as entry_digest:
+            self.assertTrue(store.matches_prefix(self.data, path))
+            result = detect_and_remove_duplicates_incremental(self.data, store, source_file=path)
+            self.assertEqual(store.processed_count, len(self.data))
+            entry_digest.assert_not_called()
+        self.assertEqual(result, detect_and_remove_duplicates(self.data))
+
+        edited = [dict(self.data[0], question='Now a distinct question?')] + self.data[1:]
+        write_faqs(path, edited)
+        with FingerprintStore(self.db_path) as store:
+            self.assertFalse(store.matches_prefix(edited, path))
+            result = detect_and_remove_duplicates_incremental(edited, store, source_file=path)
+        self.assertEqual(result, detect_and_remove_duplicates(edited))
+
+    def test_quiet_hides_each_duplicate(self):
+        """Test that per-duplicate lines go through instrumentation.detail."""
+        instrumentation.set_verbose(False)
+        try:
+            with FingerprintStore(self.db_path) as store, contextlib.redirect_stdout(io.StringIO()) as output:
+                detect_and_remove_duplicates_incremental(self.data, store)
+        finally:
+            instrumentation.set_verbose(True)
+        self.assertNotIn('Found duplicate', output.getvalue())
+
+    def test_rules_change_invalidates_store(self):
+        """Test that a different normalization fingerprint resets the store."""
+        with FingerprintStore(self.db_path) as store:
+            store.add(self.data)
+        with mock.patch.object(fingerprint_store, 'normalization_rules_version', return_value='changed'):
+            with FingerprintStore(self.db_path) as store:
+                self.assertEqual(store.processed_count, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import instrumentation
+from ingest_service import FaqIngestService, IngestClient, serve
+from jsonl_store import JsonlFaqFile
+
+
+def faq(question, category='Amenities & Facilities '):
+    return {'category': category, 'question': question, 'keywords': ['k'], 'answer': 'Yes.'}
+
+
+class TestIngestService(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.corpus = os.path.join(self.tmp.name, 'faqs.jsonl')
+        JsonlFaqFile.create(self.corpus, [faq('Can I rent a bike?', 'local area')])
+        instrumentation.set_verbose(False)
+
+    def tearDown(self):
+        instrumentation.set_verbose(True)
+        self.tmp.cleanup()
+
+    def test_screen_and_commit(self):
+        """Test that batches are validated, normalized and deduplicated before being stored."""
+        async def scenario():
+            async with FaqIngestService(self.corpus) as service:
+                first = await service.submit([faq('  can i RENT a bike? '), faq('Is there a spa?'), {'question': 'x'}])
+                second = await service.submit([faq('is there a SPA?'), faq('Do you have parking?')])
+            return first, second
+
+        first, second = asyncio.run(scenario())
+        self.assertEqual(first.accepted, 1)
+        self.assertEqual(first.duplicates, [0])
+        self.assertEqual({v.index for v in first.invalid}, {2})
+        self.assertEqual((second.accepted, second.duplicates), (1, [0]))
+        self.assertEqual([entry['question'] for entry in JsonlFaqFile(self.corpus)],
+                         ['Can I rent a bike?', 'Is there a spa?', 'Do you have parking?'])
+        self.assertEqual(JsonlFaqFile(self.corpus)[1]['category'], 'amenities & facilities')
+
+    def test_concurrent_batches_share_commits_under_backpressure(self):
+        """Test that concurrent submitters are group-committed and never exceed max_pending."""
+        async def scenario():
+            service = FaqIngestService(self.corpus, batch_size=20, max_pending=30, commit_interval=0.01)
+            peak = 0
+
+            async def submitter(k):
+                for n in range(5):
+                    await service.submit([faq(f"Question {k} {n} {m}?") for m in range(5)])
+
+            original_screen = service.screen
+
+            def screen(faqs):
+                result = original_screen(faqs)
+                nonlocal peak
+                peak = max(peak, service._queued + result.accepted)
+                return result
+
+            service.screen = screen
+            async with service:
+                await asyncio.gather(*(submitter(k) for k in range(8)))
+            return service, peak
+
+        service, peak = asyncio.run(scenario())
+        self.assertEqual(service.stats['committed'], 200)
+        self.assertLess(service.stats['commits'], 40)
+        self.assertLessEqual(peak, 30)
+        self.assertEqual(len(JsonlFaqFile(self.corpus)), 201)
+
+    def test_http_endpoint(self):
+        """Test submitting, similar-question lookup and stats over a keep-alive HTTP connection."""
+        async def scenario():
+            service = FaqIngestService(self.corpus)
+            server = await serve(service, port=0)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                async with IngestClient(port=port) as client:
+                    result = await client.submit([faq('Is breakfast included?'), faq('Can I rent a bike?')])
+                    bad_status, _ = await client.request('POST', '/faqs', {'not': 'a list'})
+                    missing_status, _ = await client.request('GET', '/nothing')
+                    _, similar = await client.request('POST', '/similar',
+                                                      {'question': 'Is breakfast included with a bike?', 'k': 3})
+                    _, stats = await client.request('GET', '/stats')
+                await service.close()
+            return result, bad_status, missing_status, stats, similar
+
+        result, bad_status, missing_status, stats, similar = asyncio.run(scenario())
+        self.assertEqual([(s['index'], s['question']) for s in similar['similar']],
+                         [(1, 'Is breakfast included?'), (0, 'Can I rent a bike?')])
+        self.assertEqual(result, {'accepted': 1, 'duplicates': [1], 'invalid': []})
+        self.assertEqual((bad_status, missing_status), (400, 404))
+        self.assertEqual((stats['corpus_size'], stats['commits'], stats['queued']), (2, 1, 0))
+
+    def test_commit_failure_fails_the_batch(self):
+        """Test that any commit error is answered with a 500 and nothing is left pending."""
+        async def scenario():
+            service = FaqIngestService(self.corpus)
+
+            def fail(batch, sync):
+                raise RuntimeError('writer broke')
+
+            service.store.extend = fail
+            server = await serve(service, port=0)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                async with IngestClient(port=port) as client:
+                    status, payload = await client.request('POST', '/faqs', [faq('Is breakfast included?')])
+                await service.close()
+            return service, status, payload
+
+        service, status, payload = asyncio.run(scenario())
+        self.assertEqual(status, 500)
+        self.assertIn('writer broke', payload['error'])
+        self.assertEqual((service.stats['accepted'], service.status()['queued']), (0, 0))
+        self.assertEqual(len(JsonlFaqFile(self.corpus)), 1)
+
+    def test_requires_jsonl_corpus(self):
+        """Test that a JSON array corpus is refused, since it cannot be appended to."""
+        with self.assertRaises(ValueError):
+            FaqIngestService(os.path.join(self.tmp.name, 'faqs.json'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import instrumentation
+from detect_duplicates_enhanced import detect_and_remove_duplicates, find_similar_questions
+from instrumentation import count, detail, instrumented, span, timing_report
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        instrumentation.reset()
+        instrumentation.set_verbose(True)
+
+    def tearDown(self):
+        instrumentation.reset()
+        instrumentation.set_verbose(True)
+
+    def test_nested_spans_and_counters(self):
+        """Test that nested spans are reported under their full path and counters add up."""
+        with span('run'):
+            for _ in range(3):
+                with span('load'):
+                    count('items', 2)
+        report = timing_report()
+        self.assertEqual(set(report['spans']), {'run', 'run/load'})
+        self.assertEqual(report['spans']['run/load']['calls'], 3)
+        self.assertGreaterEqual(report['spans']['run']['seconds'], report['spans']['run/load']['seconds'])
+        self.assertEqual(report['counters'], {'items': 6})
+        self.assertIn('misses', report['text_cache']['get_words'])
+
+    def test_span_recorded_when_block_raises(self):
+        """Test that a failing stage is still timed and does not leave the span open."""
+        with self.assertRaises(RuntimeError):
+            with span('broken'):
+                raise RuntimeError
+        with span('after'):
+            pass
+        self.assertEqual(set(timing_report()['spans']), {'broken', 'after'})
+
+    def test_quiet_suppresses_detail_only(self):
+        """Test that turning verbose output off silences per-item output but not results."""
+        faqs = [{'question': 'Can I park?'}, {'question': 'can i park?'}]
+        out = io.StringIO()
+        instrumentation.set_verbose(False)
+        with contextlib.redirect_stdout(out):
+            detail('per item')
+            unique, removed = detect_and_remove_duplicates(faqs)
+        self.assertNotIn('per item', out.getvalue())
+        self.assertNotIn('Found duplicate', out.getvalue())
+        self.assertEqual((len(unique), len(removed)), (1, 1))
+        self.assertEqual(timing_report()['counters']['dedup.duplicates'], 1)
+
+    def test_similarity_counters(self):
+        """Test that the similarity search reports pairs compared and found."""
+        faqs = [{'question': 'can i rent a bike'}, {'question': 'can i rent a bike today'},
+                {'question': 'where is the spa'}]
+        find_similar_questions(faqs, 0.5)
+        counters = timing_report()['counters']
+        self.assertEqual(counters['similarity.questions'], 3)
+        self.assertEqual(counters['similarity.pairs_found'], 1)
+        self.assertGreaterEqual(counters['similarity.pairs_compared'], 1)
+
+    def test_instrumented_writes_report(self):
+        """Test that the shared flags produce a JSON timing report for the whole run."""
+        parser = argparse.ArgumentParser()
+        instrumentation.add_instrumentation_arguments(parser)
+        with tempfile.TemporaryDirectory() as tmp:
+            report_file = os.path.join(tmp, 'timing.json')
+            args = parser.parse_args(['--quiet', '--timing-report', report_file])
+            with contextlib.redirect_stdout(io.StringIO()):
+                with instrumented(args, 'script'):
+                    self.assertFalse(instrumentation.is_verbose())
+                    with span('stage'):
+                        count('things')
+            with open(report_file, encoding='utf-8') as f:
+                report = json.load(f)
+        self.assertEqual(set(report['spans']), {'script', 'script/stage'})
+        self.assertEqual(report['counters'], {'things': 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
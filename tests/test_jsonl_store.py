@@ -0,0 +1,102 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from jsonl_store import JsonlFaqFile, index_path, json_to_jsonl, jsonl_to_json
+from load_faqs import load_faq_at, load_faqs
+from normalize_categories import normalize_categories
+
+
+class TestJsonlStore(unittest.TestCase):
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        self.faq_path = os.path.join(test_dir, '..', 'data', 'faqs.json')
+        self.tmp = tempfile.TemporaryDirectory()
+        self.jsonl_path = os.path.join(self.tmp.name, 'faqs.jsonl')
+
+        with open(self.faq_path) as f:
+            self.data = json.load(f)
+        json_to_jsonl(self.faq_path, self.jsonl_path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_roundtrip_conversion(self):
+        """Test that JSON -> JSONL -> JSON reproduces the original file."""
+        json_path = os.path.join(self.tmp.name, 'faqs.json')
+        jsonl_to_json(self.jsonl_path, json_path)
+        with open(self.faq_path, encoding='utf-8') as a, open(json_path, encoding='utf-8') as b:
+            self.assertEqual(a.read(), b.read())
+
+    def test_random_access(self):
+        """Test that entries can be read by position through the offset index."""
+        self.assertTrue(os.path.exists(index_path(self.jsonl_path)))
+        self.assertEqual(load_faq_at(self.jsonl_path, 42), self.data[42])
+        self.assertEqual(JsonlFaqFile(self.jsonl_path)[-1], self.data[-1])
+
+    def test_append_and_update(self):
+        """Test that appends and in-place edits keep every entry addressable."""
+        store = JsonlFaqFile(self.jsonl_path)
+        new_faq = dict(self.data[0], question='Is there a new question?')
+        self.assertEqual(store.append(new_faq), len(self.data))
+
+        store.update(3, dict(self.data[3], category='x'))
+        store.update(5, dict(self.data[5], answer=self.data[5]['answer'] * 3))
+
+        reopened = JsonlFaqFile(self.jsonl_path)
+        expected = self.data + [new_faq]
+        expected[3] = dict(self.data[3], category='x')
+        expected[5] = dict(self.data[5], answer=self.data[5]['answer'] * 3)
+        self.assertEqual(list(reopened), expected)
+        self.assertEqual([reopened[i] for i in range(len(reopened))], expected)
+
+    def test_failed_extend_leaves_store_unchanged(self):
+        """Test that a batch whose write fails adds no offsets and no bytes."""
+        store = JsonlFaqFile(self.jsonl_path)
+        size = os.path.getsize(self.jsonl_path)
+        new_faqs = [dict(self.data[0], question=f"New question {n}?") for n in range(3)]
+        with mock.patch('jsonl_store.os.fsync', side_effect=OSError('disk full')):
+            with self.assertRaises(OSError):
+                store.extend(new_faqs, sync=True)
+        self.assertEqual((len(store), os.path.getsize(self.jsonl_path)), (len(self.data), size))
+
+        self.assertEqual(store.extend(new_faqs[:1]), [len(self.data)])
+        self.assertEqual(store[-1], new_faqs[0])
+        self.assertEqual(list(JsonlFaqFile(self.jsonl_path)), self.data + new_faqs[:1])
+
+    def test_failed_longer_update_leaves_file_intact(self):
+        """Test that a longer record whose write fails leaves the data file and offsets as they were."""
+        store = JsonlFaqFile(self.jsonl_path)
+        with open(self.jsonl_path, 'rb') as f:
+            original = f.read()
+        offsets = store.offsets.tolist()
+        with mock.patch('jsonl_store.os.fsync', side_effect=OSError('disk full')):
+            with self.assertRaises(OSError):
+                store.update(5, dict(self.data[5], answer=self.data[5]['answer'] * 3))
+        with open(self.jsonl_path, 'rb') as f:
+            self.assertEqual(f.read(), original)
+        self.assertEqual(store.offsets.tolist(), offsets)
+        self.assertFalse(os.path.exists(self.jsonl_path + '.tmp'))
+        self.assertEqual(list(JsonlFaqFile(self.jsonl_path)), self.data)
+
+    def test_stale_index_is_rebuilt(self):
+        """Test that an edit made outside the store triggers a reindex."""
+        with open(self.jsonl_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(self.data[0]) + '\n')
+        self.assertEqual(len(JsonlFaqFile(self.jsonl_path)), len(self.data) + 1)
+
+    def test_normalize_in_place(self):
+        """Test that normalizing a JSONL file in place only changes categories."""
+        store = JsonlFaqFile(self.jsonl_path)
+        store.update(7, dict(self.data[7], category='  ' + self.data[7]['category'].title() + ' '))
+        normalize_categories(self.jsonl_path, self.jsonl_path)
+        self.assertEqual(load_faqs(self.jsonl_path), self.data)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from load_faqs import iter_faqs, iter_faqs_with_offsets, patch_faq_values, write_faqs
+from detect_duplicates import detect_and_remove_duplicates, iter_unique_faqs
+
+
+class TestIterFaqs(unittest.TestCase):
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        self.faq_path = os.path.join(test_dir, '..', 'data', 'faqs.json')
+        self.backup_path = os.path.join(test_dir, '..', 'data', 'faqs.json.backup')
+
+        with open(self.faq_path) as f:
+            self.data = json.load(f)
+
+    def test_streams_flat_array(self):
+        """Test that streaming yields the same entries as json.load at any chunk size."""
+        for chunk_size in [1, 13, 4096]:
+            self.assertEqual(list(iter_faqs(self.faq_path, chunk_size)), self.data)
+
+    def test_streams_wrapped_array(self):
+        """Test that the {"faqs": [...]} layout is unwrapped."""
+        faqs = list(iter_faqs(self.backup_path, chunk_size=64))
+        self.assertTrue(len(faqs) > 0)
+        for faq in faqs:
+            self.assertIn('question', faq)
+
+    def test_rejects_malformed_array(self):
+        """Test that a missing delimiter raises a JSON decode error."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'bad.json')
+            with open(path, 'w') as f:
+                f.write('[{"question": "a"} {"question": "b"}]')
+            with self.assertRaises(json.JSONDecodeError):
+                list(iter_faqs(path))
+
+    def test_write_matches_json_dump(self):
+        """Test that streamed output is byte-identical to json.dump with indent=2."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'out.json')
+            self.assertEqual(write_faqs(path, iter_faqs(self.faq_path)), len(self.data))
+            with open(path, encoding='utf-8') as f:
+                self.assertEqual(f.read(), json.dumps(self.data, indent=2, ensure_ascii=False))
+
+    def test_streaming_dedup_matches_list_dedup(self):
+        """Test that the streaming dedup stage keeps the same FAQs as the list version."""
+        faqs = self.data + [dict(self.data[0], question=self.data[0]['question'].upper() + '  ')]
+        expected, expected_removed = detect_and_remove_duplicates(faqs)
+        removed = []
+        self.assertEqual(list(iter_unique_faqs(iter(faqs), removed)), expected)
+        self.assertEqual([d['duplicate_index'] for d in removed],
+                         [d['duplicate_index'] for d in expected_removed])
+
+    def test_offsets_locate_values(self):
+        """Test that recorded byte offsets point at each value's JSON text."""
+        faqs = [{'category': 'Café \u2013 Bar', 'question': 'Où?', 'keywords': ['a', 'b']},
+                {'category': 'x', 'answer': 'ü' * 50}]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'faqs.json')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write('{"faqs": [{"category": "Caf\u00e9 \\u2013 Bar", "question": "Où?", "keywords": ["a", "b"]},\r\n'
+                        + json.dumps(faqs[1], ensure_ascii=False) + ']}')
+            with open(path, 'rb') as f:
+                raw = f.read()
+            entries = list(iter_faqs_with_offsets(path, chunk_size=7))
+            self.assertEqual([faq for faq, _ in entries], faqs)
+            for faq, offsets in entries:
+                for key, (start, end) in offsets.items():
+                    self.assertEqual(json.loads(raw[start:end].decode('utf-8')), faq[key])
+
+    def test_numbers_split_across_chunks(self):
+        """Test that a number cut at a chunk boundary is read whole, one byte at a time."""
+        text = '[{"category": "{[\U0001F600", "]a{\\"a": 1.5, "rank": -12.5e+3, "n": [0, 10]}]'
+        expected = json.loads(text)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'faqs.json')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            for chunk_size in [1, 2, 3]:
+                self.assertEqual(list(iter_faqs(path, chunk_size)), expected)
+                self.assertEqual([faq for faq, _ in iter_faqs_with_offsets(path, chunk_size)], expected)
+
+    def test_patch_keeps_file_valid(self):
+        """Test in-place patches pad shorter values and refuse longer ones."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'faqs.json')
+            write_faqs(path, self.data)
+            size = os.path.getsize(path)
+            entries = list(iter_faqs_with_offsets(path))
+            start, end = entries[3][1]['category']
+            self.assertTrue(patch_faq_values(path, [(start, end, 'x')]))
+            self.assertEqual(os.path.getsize(path), size)
+            expected = [dict(faq) for faq in self.data]
+            expected[3]['category'] = 'x'
+            self.assertEqual(list(iter_faqs(path)), expected)
+            self.assertFalse(patch_faq_values(path, [(start, end, 'x' * (end - start))]))
+            self.assertEqual(list(iter_faqs(path)), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import minhash
+
+
+@unittest.skipIf(minhash.np is None, "numpy is not installed")
+class TestMinHash(unittest.TestCase):
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        faq_path = os.path.join(test_dir, '..', 'data', 'faqs.json')
+
+        with open(faq_path) as f:
+            self.faqs = json.load(f)
+
+    def test_signature_matrix_is_compact(self):
+        """Test that signatures are a uint32 matrix with one row per FAQ."""
+        hasher = minhash.MinHasher(num_perm=64)
+        signatures = hasher.signatures([faq['question'] for faq in self.faqs])
+        self.assertEqual(signatures.shape, (len(self.faqs), 64))
+        self.assertEqual(signatures.dtype, minhash.np.uint32)
+
+    def test_default_settings_recall(self):
+        """Test that the default band/row setting recovers the exact pairs on the dataset."""
+        result = minhash.evaluate_recall(self.faqs, 0.5, [(32, 4)])[0]
+        self.assertGreater(result['exact_pairs'], 0)
+        self.assertGreaterEqual(result['recall'], 0.9)
+
+    def test_signature_cache_roundtrip(self):
+        """Test that cached signatures are reused only for identical input."""
+        hasher = minhash.MinHasher(num_perm=16)
+        texts = [faq['question'] for faq in self.faqs]
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_file = os.path.join(tmp, 'faqs.json.minhash.npz')
+            first = minhash.load_or_compute_signatures(texts, hasher, cache_file)
+            second = minhash.load_or_compute_signatures(texts, hasher, cache_file)
+            self.assertTrue((first == second).all())
+
+            changed = minhash.load_or_compute_signatures(texts[:-1], hasher, cache_file)
+            self.assertEqual(changed.shape[0], len(texts) - 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from load_faqs import write_faqs
+from normalize_categories import normalize_categories
+
+
+class TestNormalizeCategories(unittest.TestCase):
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        with open(os.path.join(test_dir, '..', 'data', 'faqs.json'), encoding='utf-8') as f:
+            self.data = json.load(f)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'faqs.json')
+        self.messy = [dict(faq) for faq in self.data]
+        self.messy[2]['category'] = '  ' + self.messy[2]['category'].upper() + ' '
+        self.messy[9]['category'] = self.messy[9]['category'].title()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read(self):
+        with open(self.path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_no_change_leaves_file_untouched(self):
+        """Test a run with nothing to normalize does not write the file."""
+        write_faqs(self.path, self.data)
+        os.utime(self.path, ns=(0, 0))
+        self.assertFalse(normalize_categories(self.path, self.path))
+        self.assertFalse(normalize_categories(self.path, self.path, patch=True))
+        self.assertEqual(os.stat(self.path).st_mtime_ns, 0)
+        self.assertEqual([name for name in os.listdir(self.tmp.name)], ['faqs.json'])
+
+    def test_rewrite_is_atomic_and_keeps_mode(self):
+        """Test the rewrite produces the normalized corpus and keeps the file mode."""
+        write_faqs(self.path, self.messy)
+        os.chmod(self.path, 0o644)
+        self.assertTrue(normalize_categories(self.path, self.path))
+        self.assertEqual(self.read(), self.data)
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o644)
+        self.assertEqual([name for name in os.listdir(self.tmp.name)], ['faqs.json'])
+
+    def test_patch_mode_matches_rewrite(self):
+        """Test patching changed values in place gives the same FAQs as a rewrite."""
+        write_faqs(self.path, self.messy)
+        size = os.path.getsize(self.path)
+        self.assertTrue(normalize_categories(self.path, self.path, patch=True))
+        self.assertEqual(self.read(), self.data)
+        self.assertEqual(os.path.getsize(self.path), size)
+
+    def test_same_file_passes_entries_without_string_category(self):
+        """Test that in-place runs leave missing and null categories for the validator."""
+        self.messy[4]['category'] = None
+        del self.messy[6]['category']
+        expected = [dict(faq) for faq in self.data]
+        expected[4]['category'] = None
+        del expected[6]['category']
+        for patch in (False, True):
+            write_faqs(self.path, self.messy)
+            self.assertTrue(normalize_categories(self.path, self.path, patch=patch))
+            self.assertEqual(self.read(), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import sharded_corpus
+from detect_duplicates_enhanced import detect_and_remove_duplicates
+from faq_summary import FaqSummary
+from load_faqs import iter_faqs, load_faqs
+from sharded_corpus import ShardedCorpus, find_shard_duplicates, is_sharded, remove_shard_duplicates
+
+
+def faq(question, category, answer='Yes.', **extra):
+    return dict({'category': category, 'question': question, 'keywords': ['k'], 'answer': answer}, **extra)
+
+
+class TestShardedCorpus(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.tmp.name, 'sharded')
+        self.faqs = [
+            faq('Can I rent a bike?', 'Local Area'),
+            faq('Is there a spa?', 'wellness & spa'),
+            faq('can i rent a bike? ', 'local area'),
+            faq('Where is the beach?', 'local area '),
+            faq('IS THERE A SPA?', 'Local Area'),
+            faq('Do you have parking?', 'policies'),
+        ]
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.corpus = ShardedCorpus.create(self.directory, self.faqs)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def ordered(self):
+        """The FAQs in corpus order: shards by first appearance, then file order."""
+        return [self.faqs[i] for i in (0, 2, 3, 4, 1, 5)]
+
+    def test_split_and_selective_load(self):
+        """Test that shards group by normalized category and only requested shards are read."""
+        self.assertTrue(is_sharded(self.directory))
+        self.assertEqual(list(self.corpus.shards), ['local-area', 'wellness-spa', 'policies'])
+        self.assertEqual(len(self.corpus), 6)
+        self.assertEqual(list(iter_faqs(self.directory)), self.ordered())
+
+        opened = []
+        real_iter_faqs = sharded_corpus.iter_faqs
+        with mock.patch.object(sharded_corpus, 'iter_faqs', lambda path: opened.append(path) or real_iter_faqs(path)):
+            with contextlib.redirect_stdout(io.StringIO()):
+                loaded = load_faqs(self.directory, shards=['policies'])
+        self.assertEqual(loaded, [self.faqs[5]])
+        self.assertEqual(opened, [self.corpus.shard_path('policies')])
+        with self.assertRaises(ValueError):
+            self.corpus.select(['no-such-shard'])
+
+    def test_shard_by_property(self):
+        """Test sharding by another field, with a default shard for FAQs without it."""
+        faqs = [faq('a?', 'x', property='Beach Hotel'), faq('b?', 'x'), faq('c?', 'y', property='Beach Hotel')]
+        corpus = ShardedCorpus.create(os.path.join(self.tmp.name, 'by-property'), faqs, shard_by='property')
+        self.assertEqual({name: shard['count'] for name, shard in corpus.shards.items()},
+                         {'beach-hotel': 2, 'default': 1})
+
+    def test_colliding_shard_names(self):
+        """Test that categories whose names collide after slugging get distinct shards."""
+        faqs = [faq('a?', 'x'), faq('b?', 'x-2'), faq('c?', 'x!'), faq('d?', 'X?')]
+        corpus = ShardedCorpus.create(os.path.join(self.tmp.name, 'colliding'), faqs)
+        self.assertEqual(list(corpus.shards), ['x', 'x-2', 'x-3', 'x-4'])
+        self.assertEqual(list(corpus.iter_faqs()), faqs)
+
+    def test_summary_without_reading_shards(self):
+        """Test that the merged summary matches a full scan without opening shard bodies."""
+        expected = FaqSummary.from_faqs(self.ordered())
+        with mock.patch.object(sharded_corpus, 'iter_faqs', side_effect=AssertionError('shard body read')):
+            self.assertEqual(ShardedCorpus(self.directory).summary(), expected)
+
+    def test_stale_shard_is_resummarized(self):
+        """Test that a shard edited outside the manifest is re-summarized on the next summary."""
+        path = self.corpus.shard_path('policies')
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(faq('Are pets allowed?', 'policies')) + '\n')
+        corpus = ShardedCorpus(self.directory)
+        self.assertEqual(corpus.stale_shards(), ['policies'])
+        self.assertEqual(corpus.summary(['policies']).total, 2)
+        self.assertEqual(ShardedCorpus(self.directory).stale_shards(), [])
+        self.assertEqual(len(ShardedCorpus(self.directory)), 7)
+
+    def test_dedup_matches_monolithic_corpus(self):
+        """Test that per-shard dedup plus the key merge finds what one pass over the corpus finds."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            unique, removed = detect_and_remove_duplicates(self.ordered())
+        for workers in (1, 2):
+            duplicates = find_shard_duplicates(self.corpus, workers=workers)
+            self.assertEqual([d['comparison_key'] for d in duplicates], [d['comparison_key'] for d in removed])
+        self.assertEqual([(d['duplicate_shard'], d['duplicate_index'], d['original_shard'], d['original_index'])
+                          for d in duplicates],
+                         [('local-area', 1, 'local-area', 0), ('wellness-spa', 0, 'local-area', 3)])
+
+        output = remove_shard_duplicates(self.corpus, duplicates, os.path.join(self.tmp.name, 'out'), workers=2)
+        self.assertEqual(list(output.iter_faqs()), unique)
+        self.assertEqual(output.summary(), FaqSummary.from_faqs(unique))
+        self.assertEqual(list(ShardedCorpus(self.directory).iter_faqs()), self.ordered())
+
+        remove_shard_duplicates(self.corpus, duplicates)
+        self.assertEqual(list(ShardedCorpus(self.directory).iter_faqs()), unique)
+        self.assertEqual(find_shard_duplicates(ShardedCorpus(self.directory)), [])
+
+    def test_repeats_in_later_shard_point_at_earliest_owner(self):
+        """Test that every copy of a key in a later shard reports the earlier shard's entry as original."""
+        faqs = [faq('Can I rent a bike?', 'local area'), faq('Is there a spa?', 'wellness'),
+                faq('can i rent a bike?', 'wellness'), faq('CAN I RENT A BIKE?', 'wellness')]
+        directory = os.path.join(self.tmp.name, 'repeats')
+        with contextlib.redirect_stdout(io.StringIO()):
+            corpus = ShardedCorpus.create(directory, faqs)
+            _, removed = detect_and_remove_duplicates(faqs)
+        duplicates = find_shard_duplicates(corpus)
+        self.assertEqual([(d['duplicate_shard'], d['duplicate_index'], d['original_shard'], d['original_index'])
+                          for d in duplicates],
+                         [('wellness', 1, 'local-area', 0), ('wellness', 2, 'local-area', 0)])
+        self.assertEqual([(d['duplicate_index'], d['original_index']) for d in removed], [(2, 0), (3, 0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
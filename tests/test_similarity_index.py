@@ -0,0 +1,120 @@
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from load_faqs import write_faqs
+from similarity_index import (NearestQuestionIndex, SimilarityIndex, find_similar_pairs, get_words,
+                              jaccard_similarity, load_question_index, question_index_path)
+
+
+def brute_force_pairs(questions, threshold):
+    """Reference all-pairs scan matching the original find_similar_questions loop."""
+    pairs = []
+    for i, q1 in enumerate(questions):
+        words1 = get_words(q1)
+        for j, q2 in enumerate(questions[i+1:], i+1):
+            similarity = jaccard_similarity(words1, get_words(q2))
+            if similarity >= threshold:
+                pairs.append((i, j, similarity))
+    return pairs
+
+
+class TestSimilarityIndex(unittest.TestCase):
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        faq_path = os.path.join(test_dir, '..', 'data', 'faqs.json')
+
+        with open(faq_path) as f:
+            self.questions = [faq['question'] for faq in json.load(f)]
+
+    def test_matches_all_pairs_scan_on_dataset(self):
+        """Test that the indexed search returns exactly the brute-force pairs."""
+        for threshold in [0.0, 0.3, 0.5, 0.8, 1.0]:
+            self.assertEqual(find_similar_pairs(self.questions, threshold),
+                             brute_force_pairs(self.questions, threshold),
+                             f"Mismatch at threshold {threshold}")
+
+    def test_matches_all_pairs_scan_on_random_corpus(self):
+        """Test equivalence on a synthetic corpus with repeats and empty questions."""
+        rng = random.Random(7)
+        vocabulary = [f"w{n}" for n in range(30)]
+        questions = []
+        for _ in range(300):
+            questions.append(' '.join(rng.choice(vocabulary) for _ in range(rng.randint(0, 8))))
+        questions.extend(['', '?', questions[5]])
+
+        for threshold in [0.25, 0.5, 0.6, 0.8, 1.0]:
+            self.assertEqual(find_similar_pairs(questions, threshold),
+                             brute_force_pairs(questions, threshold),
+                             f"Mismatch at threshold {threshold}")
+
+    def test_parallel_matches_serial(self):
+        """Test that a process pool returns the serial pairs in the same order."""
+        index = SimilarityIndex.from_questions(self.questions, 0.3)
+        self.assertEqual(index.all_pairs(workers=2, block_size=7), index.all_pairs())
+
+
+def brute_force_nearest(questions, question, k, min_similarity=0.0):
+    """Reference top-k: score every question, best first, ties by index."""
+    words = get_words(question)
+    scored = [(i, jaccard_similarity(words, get_words(other))) for i, other in enumerate(questions)]
+    scored = [(i, s) for i, s in scored if s > 0 and s >= min_similarity]
+    return sorted(scored, key=lambda item: (-item[1], item[0]))[:k]
+
+
+class TestNearestQuestionIndex(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(11)
+        vocabulary = [f"w{n}" for n in range(25)]
+        self.questions = [' '.join(rng.choice(vocabulary) for _ in range(rng.randint(0, 7))) for _ in range(400)]
+        self.queries = [' '.join(rng.choice(vocabulary) for _ in range(rng.randint(1, 7))) for _ in range(60)]
+        self.queries += ['', 'unknown words only', self.questions[3] + ' w0 unknown']
+
+    def test_matches_brute_force(self):
+        """Test that top-k results equal scoring every question, including ties and the floor."""
+        index = NearestQuestionIndex.from_questions(self.questions)
+        for query in self.queries:
+            for k, min_similarity in [(1, 0.0), (5, 0.0), (20, 0.3), (5, 0.9)]:
+                if query:
+                    expected = brute_force_nearest(self.questions, query, k, min_similarity)
+                else:
+                    expected = [(i, 1.0) for i, q in enumerate(self.questions) if not get_words(q)][:k]
+                self.assertEqual(index.most_similar(query, k, min_similarity), expected,
+                                 f"Mismatch for {query!r}, k={k}, min_similarity={min_similarity}")
+
+    def test_add_and_round_trip(self):
+        """Test that added questions are found and the serialized index answers the same."""
+        index = NearestQuestionIndex.from_questions(self.questions[:200])
+        for question in self.questions[200:]:
+            index.add(question)
+        restored = NearestQuestionIndex.from_dict(json.loads(json.dumps(index.to_dict())))
+        for query in self.queries:
+            expected = brute_force_nearest(self.questions, query, 5) if query else index.most_similar(query)
+            self.assertEqual(index.most_similar(query), expected)
+            self.assertEqual(restored.most_similar(query), expected)
+
+    def test_persistent_index_is_rebuilt_when_stale(self):
+        """Test that the saved index is reused until the FAQ file changes."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'faqs.json')
+            write_faqs(path, [{'question': q} for q in ['Can I rent a bike?', 'Is there a spa?']])
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                self.assertEqual(len(load_question_index(path)), 2)
+                self.assertEqual(load_question_index(path).most_similar('rent a bike', 1), [(0, 0.6)])
+            self.assertEqual(output.getvalue().count('saved'), 1)
+            self.assertTrue(os.path.exists(question_index_path(path)))
+
+            write_faqs(path, [{'question': q} for q in ['Is there a spa?', 'Can I rent a bike?', 'A bike?']])
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertEqual(load_question_index(path).most_similar('rent a bike', 2), [(2, 2 / 3), (1, 0.6)])
+
+
+if __name__ == '__main__':
+    unittest.main()
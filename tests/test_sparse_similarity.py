@@ -0,0 +1,35 @@
+import json
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import sparse_similarity
+from similarity_index import find_similar_pairs
+
+
+@unittest.skipIf(sparse_similarity.sparse is None, "numpy/scipy are not installed")
+class TestSparseSimilarity(unittest.TestCase):
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        with open(os.path.join(test_dir, '..', 'data', 'faqs.json')) as f:
+            self.questions = [faq['question'] for faq in json.load(f)]
+
+    def test_matches_python_backend(self):
+        """Test that the sparse backend returns identical pairs and similarities."""
+        rng = random.Random(3)
+        vocabulary = [f"w{n}" for n in range(25)]
+        synthetic = [' '.join(rng.choice(vocabulary) for _ in range(rng.randint(0, 6))) for _ in range(200)]
+        for questions in [self.questions, synthetic + ['', '!']]:
+            for threshold in [0.0, 0.4, 0.5, 0.8, 1.0]:
+                self.assertEqual(
+                    sparse_similarity.find_similar_pairs_sparse(questions, threshold, block_size=16),
+                    find_similar_pairs(questions, threshold),
+                    f"Mismatch at threshold {threshold}"
+                )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import text_processing
+from text_processing import CachedTextFunction, create_duplicate_key, get_words
+
+
+class TestTextProcessing(unittest.TestCase):
+    def setUp(self):
+        text_processing.clear_caches()
+
+    def tearDown(self):
+        text_processing.close_persistent_cache()
+        text_processing.clear_caches()
+
+    def test_results_match_uncached_functions(self):
+        """Test that cached helpers return what the original inline code did."""
+        faq = {'question': '  Where can I RENT a bike? ', 'answer': ' Ask at reception. '}
+        self.assertEqual(create_duplicate_key(faq), 'where can i rent a bike?')
+        self.assertEqual(create_duplicate_key(faq, check_answer=True),
+                         'where can i rent a bike?|ask at reception.')
+        self.assertEqual(get_words("What's the Wi-Fi?"), {'what', 's', 'the', 'wi', 'fi'})
+
+    def test_counters_and_lru_bound(self):
+        """Test hit/miss counting and that the in-memory cache stays bounded."""
+        cached = CachedTextFunction(str.upper, maxsize=2)
+        for text in ['a', 'b', 'a', 'c', 'b']:
+            cached(text)
+        self.assertEqual(cached.stats(), {'hits': 1, 'disk_hits': 0, 'misses': 4, 'size': 2, 'maxsize': 2})
+
+    def test_persistent_cache_survives_memory_reset(self):
+        """Test that a second run is served from the on-disk cache."""
+        with tempfile.TemporaryDirectory() as tmp:
+            text_processing.enable_persistent_cache(os.path.join(tmp, 'cache.sqlite'))
+            first = get_words('Can I rent a kayak?')
+            text_processing.close_persistent_cache()
+            text_processing.clear_caches()
+
+            text_processing.enable_persistent_cache(os.path.join(tmp, 'cache.sqlite'))
+            self.assertEqual(get_words('Can I rent a kayak?'), first)
+            self.assertEqual(text_processing.cache_stats()['get_words']['disk_hits'], 1)
+            self.assertEqual(text_processing.cache_stats()['get_words']['misses'], 0)
+
+    def test_forked_process_opens_its_own_connection(self):
+        """Test that a child process does not reuse the connection it inherited."""
+        with tempfile.TemporaryDirectory() as tmp:
+            text_processing.enable_persistent_cache(os.path.join(tmp, 'cache.sqlite'))
+            parent = text_processing._get_persistent()
+            self.assertIs(text_processing._get_persistent(), parent)
+            with mock.patch.object(text_processing.os, 'getpid', return_value=os.getpid() + 1):
+                child = text_processing._get_persistent()
+                self.assertIsNot(child, parent)
+                self.assertIs(text_processing._get_persistent(), child)
+                get_words('Can I rent a kayak?')
+                text_processing.close_persistent_cache()
+            parent.close()
+
+    def test_cheap_normalizers_are_not_cached(self):
+        """Test that only tokenization goes through the cache."""
+        self.assertNotIsInstance(text_processing.normalize_text, CachedTextFunction)
+        self.assertEqual(list(text_processing.cache_stats()), ['get_words'])
+
+
+if __name__ == '__main__':
+    unittest.main()
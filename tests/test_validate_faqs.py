@@ -0,0 +1,70 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from validate_faqs import FAQ_SCHEMA, FieldRule, validate_faqs, validate_file
+
+
+class TestValidateFaqs(unittest.TestCase):
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        self.faq_path = os.path.join(test_dir, '..', 'data', 'faqs.json')
+        with open(self.faq_path, encoding='utf-8') as f:
+            self.data = json.load(f)
+
+    def test_clean_corpus_passes(self):
+        """Test the shipped FAQ file has no violations when streamed from disk."""
+        self.assertEqual(validate_file(self.faq_path), [])
+
+    def test_collects_every_violation(self):
+        """Test all violations are reported with entry indices instead of stopping at the first."""
+        faqs = [dict(faq) for faq in self.data[:4]]
+        del faqs[0]['answer']
+        faqs[1]['category'] = '   '
+        faqs[1]['keywords'] = ['ok', 3]
+        faqs[2]['question'] = None
+        faqs[3]['question'] = faqs[0]['question']
+        faqs.append('not an object')
+        self.assertEqual([(v.index, v.field, v.rule) for v in validate_faqs(faqs)], [
+            (0, 'answer', 'required'),
+            (1, 'category', 'non_empty'),
+            (1, 'keywords', 'type'),
+            (2, 'question', 'type'),
+            (3, 'question', 'unique'),
+            (4, None, 'type'),
+        ])
+        self.assertEqual(str(validate_faqs(faqs)[2]), "Entry 1, keyword 1: should be a string")
+
+    def test_empty_corpus_and_custom_schema(self):
+        """Test the corpus-level rule and an optional extra field."""
+        self.assertEqual([str(v) for v in validate_faqs([])], ["FAQ data should not be empty."])
+        schema = dict(FAQ_SCHEMA, embedding=FieldRule(list, required=False, item_type=float))
+        faqs = [dict(self.data[0], embedding=[0.5, 'x']), dict(self.data[1])]
+        self.assertEqual([str(v) for v in validate_faqs(faqs, schema)],
+                         ["Entry 0, embedding item 1: should be float"])
+
+    def test_field_names_are_plain_keys(self):
+        """Test that a field name with quotes or code in it is only ever used as a dict key."""
+        field = "x'); raise SystemExit('{i}"
+        schema = dict(FAQ_SCHEMA, **{field: FieldRule(str, unique=True)})
+        faqs = [dict(self.data[0], **{field: 'a'}), dict(self.data[1], **{field: 'a'}), dict(self.data[2])]
+        self.assertEqual([str(v) for v in validate_faqs(faqs, schema)],
+                         [f"Entry 1: duplicate {field} (first at entry 0): a",
+                          f"Entry 2 is missing required field: {field}"])
+
+    def test_invalid_json_raises(self):
+        """Test a malformed file is reported as a decode error."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'bad.json')
+            with open(path, 'w') as f:
+                f.write('[{"question": "a"},')
+            with self.assertRaises(json.JSONDecodeError):
+                validate_file(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Shared text normalization and tokenization for the FAQ scripts.
+Tokenization is memoized in a bounded in-memory LRU cache and, when a
+persistent cache is enabled, in an SQLite file keyed by a content hash plus
+the normalizer fingerprint. The plain lower/strip normalizers are cheaper
+than a cache lookup and are not cached. Hit/miss counters are available
+from cache_stats().
+
+Enable the persistent cache for any script with:
+    FAQ_TEXT_CACHE=.text_cache.sqlite python detect_duplicates_enhanced.py ...
+"""
+
+import atexit
+import hashlib
+import inspect
+import json
+import os
+import re
+import sqlite3
+from collections import OrderedDict
+from typing import Dict, Any, Callable, Optional
+
+# Bump when normalization changes in a way the source fingerprint cannot see
+NORMALIZER_VERSION = 1
+
+DEFAULT_CACHE_SIZE = 65536
+
+_WORD_PATTERN = re.compile(r'\b\w+\b')
+
+
+def _normalize_text(text: str) -> str:
+    return text.lower().strip()
+
+
+def _normalize_category(category: str) -> str:
+    return category.strip().lower()
+
+
+def _get_words(text: str) -> frozenset:
+    return frozenset(_WORD_PATTERN.findall(text.lower()))
+
+
+def normalizer_fingerprint() -> str:
+    """
+    Hash of NORMALIZER_VERSION and the normalization source code. Persistent
+    caches and stores built on these functions are invalid once it changes.
+    """
+    digest = hashlib.sha1(f"version:{NORMALIZER_VERSION}".encode('utf-8'))
+    for function in (_normalize_text, _normalize_category, _get_words, _create_duplicate_key):
+        try:
+            source = inspect.getsource(function)
+        except (OSError, TypeError):
+            source = function.__code__.co_code.hex()
+        digest.update(source.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class _PersistentCache:
+    """SQLite key/value table of cached results, written in batches."""
+
+    def __init__(self, path: str, flush_every: int = 1000):
+        self.path = path
+        self.flush_every = flush_every
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS text_cache (key BLOB PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID"
+        )
+        self.pending = []
+
+    def get(self, key: bytes) -> Optional[str]:
+        row = self.connection.execute("SELECT value FROM text_cache WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: bytes, value: str) -> None:
+        self.pending.append((key, value))
+        if len(self.pending) >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.pending:
+            with self.connection:
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO text_cache (key, value) VALUES (?, ?)", self.pending
+                )
+            self.pending = []
+
+    def close(self) -> None:
+        self.flush()
+        self.connection.close()
+
+
+_persistent_path: Optional[str] = None
+_persistent: Optional[_PersistentCache] = None
+# Process that opened _persistent; a forked child must not share its connection
+_persistent_pid: Optional[int] = None
+_persistent_checked = False
+_fingerprint: Optional[str] = None
+
+
+def enable_persistent_cache(path: str) -> None:
+    """
+    Back every cached function with an SQLite file at path. The connection
+    is opened on first use, separately in each process.
+    """
+    global _persistent_path, _persistent_checked, _fingerprint
+    close_persistent_cache()
+    _persistent_path = path
+    _persistent_checked = True
+    _fingerprint = normalizer_fingerprint()
+
+
+def close_persistent_cache() -> None:
+    """Flush and close the persistent cache, if this process opened one."""
+    global _persistent, _persistent_path
+    if _persistent is not None and _persistent_pid == os.getpid():
+        _persistent.close()
+    _persistent = None
+    _persistent_path = None
+
+
+def _get_persistent() -> Optional[_PersistentCache]:
+    global _persistent, _persistent_pid, _persistent_checked
+    if not _persistent_checked:
+        _persistent_checked = True
+        path = os.environ.get('FAQ_TEXT_CACHE')
+        if path:
+            enable_persistent_cache(path)
+    if _persistent_path is None:
+        return None
+    pid = os.getpid()
+    if _persistent is None or _persistent_pid != pid:
+        # Drop (without closing) a connection inherited from the parent
+        _persistent = _PersistentCache(_persistent_path)
+        _persistent_pid = pid
+    return _persistent
+
+
+atexit.register(close_persistent_cache)
+
+
+class CachedTextFunction:
+    """
+    Memoizing wrapper: bounded LRU in memory, then the optional persistent
+    cache, then the real function.
+    """
+
+    def __init__(self, function: Callable[[str], Any], maxsize: int = DEFAULT_CACHE_SIZE,
+                 encode: Callable[[Any], str] = str, decode: Callable[[str], Any] = str):
+        self.__wrapped__ = function
+        self.__name__ = function.__name__.lstrip('_')
+        self.__doc__ = function.__doc__
+        self.maxsize = maxsize
+        self.encode = encode
+        self.decode = decode
+        self.memory: 'OrderedDict[str, Any]' = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def __call__(self, text: str) -> Any:
+        try:
+            value = self.memory[text]
+        except KeyError:
+            pass
+        else:
+            self.memory.move_to_end(text)
+            self.hits += 1
+            return value
+
+        persistent = _get_persistent()
+        key = None
+        if persistent is not None:
+            key = hashlib.sha1(f"{_fingerprint}:{self.__name__}:{text}".encode('utf-8')).digest()
+            stored = persistent.get(key)
+            if stored is not None:
+                self.disk_hits += 1
+                return self._remember(text, self.decode(stored))
+
+        self.misses += 1
+        value = self.__wrapped__(text)
+        if persistent is not None:
+            persistent.put(key, self.encode(value))
+        return self._remember(text, value)
+
+    def _remember(self, text: str, value: Any) -> Any:
+        self.memory[text] = value
+        if len(self.memory) > self.maxsize:
+            self.memory.popitem(last=False)
+        return value
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'size': len(self.memory),
+            'maxsize': self.maxsize,
+        }
+
+    def clear(self) -> None:
+        self.memory.clear()
+        self.hits = self.disk_hits = self.misses = 0
+
+
+normalize_text = _normalize_text
+normalize_category = _normalize_category
+get_words = CachedTextFunction(
+    _get_words,
+    encode=lambda words: json.dumps(sorted(words), ensure_ascii=False),
+    decode=lambda stored: frozenset(json.loads(stored)),
+)
+
+# The basic dedup script's name for the same normalization
+normalize_question = normalize_text
+
+_CACHED_FUNCTIONS = [get_words]
+
+
+def _create_duplicate_key(faq: Dict[str, Any], check_answer: bool = False) -> str:
+    question = normalize_text(faq.get('question', ''))
+    if check_answer:
+        answer = normalize_text(faq.get('answer', ''))
+        return f"{question}|{answer}"
+    return question
+
+
+def create_duplicate_key(faq: Dict[str, Any], check_answer: bool = False) -> str:
+    """Create a key for duplicate detection based on question and optionally answer."""
+    return _create_duplicate_key(faq, check_answer)
+
+
+def cache_stats() -> Dict[str, Dict[str, int]]:
+    """Hit/miss counters for every cached function."""
+    return {function.__name__: function.stats() for function in _CACHED_FUNCTIONS}
+
+
+def format_cache_stats() -> str:
+    """One line per cached function, for script summaries."""
+    lines = []
+    for name, stats in cache_stats().items():
+        lookups = stats['hits'] + stats['disk_hits'] + stats['misses']
+        if lookups:
+            rate = (stats['hits'] + stats['disk_hits']) / lookups
+            lines.append(f"  {name}: {stats['hits']} hits, {stats['disk_hits']} disk hits, "
+                         f"{stats['misses']} misses ({rate:.0%} hit rate)")
+    return '\n'.join(lines) if lines else "  (no cached lookups)"
+
+
+def clear_caches() -> None:
+    """Empty the in-memory caches and reset their counters."""
+    for function in _CACHED_FUNCTIONS:
+        function.clear()
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Single-pass schema validation for FAQ files.
+
+The schema is compiled once into one check per field. Entries are then
+validated in a single streaming pass. Every violation is collected with its
+entry index instead of stopping at the first one. The exit status makes the
+script usable as a CI or pre-commit gate:
+
+    python validate_faqs.py data/faqs.json data/flat_faqs.json
+"""
+
+import argparse
+import json
+import sys
+from typing import List, Dict, Any, Callable, Iterable, Iterator, NamedTuple, Optional
+
+from load_faqs import iter_faqs
+
+
+class FieldRule(NamedTuple):
+    """Constraints on one FAQ field."""
+    type: type
+    required: bool = True
+    non_empty: bool = True
+    item_type: Optional[type] = None
+    unique: bool = False
+
+
+FAQ_SCHEMA: Dict[str, FieldRule] = {
+    'category': FieldRule(str),
+    'question': FieldRule(str, unique=True),
+    'keywords': FieldRule(list, item_type=str),
+    'answer': FieldRule(str),
+}
+
+
+class Violation(NamedTuple):
+    """One schema violation. index is None for corpus-level problems."""
+    index: Optional[int]
+    field: Optional[str]
+    rule: str
+    message: str
+
+    def __str__(self) -> str:
+        return self.message
+
+
+_MISSING = object()
+
+# check(index, value, violations) for one field
+FieldCheck = Callable[[int, Any, List[Violation]], None]
+
+
+def _compile_field(field: str, rule: FieldRule) -> FieldCheck:
+    """Build the check for one field, with only the tests its rule asks for."""
+    expected_type = rule.type
+    type_name = {str: 'a string', list: 'a list', dict: 'an object'}.get(expected_type, expected_type.__name__)
+    item_type = rule.item_type
+    item_name = {str: 'a string'}.get(item_type, getattr(item_type, '__name__', ''))
+    item_label = field[:-1] if field.endswith('s') else f"{field} item"
+    strip = expected_type is str
+
+    def check(i: int, value: Any, violations: List[Violation]) -> None:
+        if value is _MISSING:
+            if rule.required:
+                violations.append(Violation(i, field, 'required', f"Entry {i} is missing required field: {field}"))
+            return
+        if not isinstance(value, expected_type):
+            violations.append(Violation(i, field, 'type', f"Entry {i}: {field} should be {type_name}"))
+            return
+        if rule.non_empty and not (value.strip() if strip else value):
+            violations.append(Violation(i, field, 'non_empty', f"Entry {i}: {field} should not be empty"))
+        if item_type is not None:
+            for j, item in enumerate(value):
+                if not isinstance(item, item_type):
+                    violations.append(Violation(i, field, 'type', f"Entry {i}, {item_label} {j}: should be {item_name}"))
+
+    return check
+
+
+def _compile_entry_field(field: str, rule: FieldRule, seen: Optional[Dict[Any, int]]) -> FieldCheck:
+    """
+    Build the per-entry check of one field. A valid value costs a few type
+    and truthiness tests; anything else is handed to the field's full check,
+    which records the violations. Values of a unique field are recorded in
+    seen.
+    """
+    full_check = _compile_field(field, rule)
+    expected_type = rule.type
+    strip = expected_type is str
+    optional = not rule.required
+    non_empty = rule.non_empty
+    is_item = rule.item_type.__instancecheck__ if rule.item_type is not None else None
+
+    def check(i: int, value: Any, violations: List[Violation]) -> None:
+        if optional and value is _MISSING:
+            return
+        if not (value.__class__ is expected_type
+                and (not non_empty or (value.strip() if strip else value))
+                and (is_item is None or all(map(is_item, value)))):
+            full_check(i, value, violations)
+        if seen is not None and isinstance(value, expected_type):
+            first = seen.setdefault(value, i)
+            if first != i:
+                violations.append(Violation(i, field, 'unique',
+                                            f"Entry {i}: duplicate {field} (first at entry {first}): {value}"))
+
+    return check
+
+
+def _compile_entry_check(schema: Dict[str, FieldRule],
+                         first_seen: Dict[str, Dict[Any, int]]) -> Callable[[Dict[str, Any], int, List[Violation]], None]:
+    """
+    Build one function that runs the check of every field of an entry, in
+    schema order. Values of unique fields are recorded in first_seen.
+    """
+    checks = [(field, _compile_entry_field(field, rule, first_seen.get(field)))
+              for field, rule in schema.items()]
+
+    def check_entry(entry: Dict[str, Any], i: int, violations: List[Violation]) -> None:
+        get = entry.get
+        for field, check in checks:
+            check(i, get(field, _MISSING), violations)
+
+    return check_entry
+
+
+class FaqValidator:
+    """
+    Schema compiled for repeated single-pass validation.
+
+    Feed entries with check() (or stream them through iter_validated) and
+    call finish() once at the end for the corpus-level rules.
+    """
+
+    def __init__(self, schema: Dict[str, FieldRule] = FAQ_SCHEMA):
+        # field -> value -> index of the first entry with that value
+        self.first_seen: Dict[str, Dict[Any, int]] = {field: {} for field, rule in schema.items() if rule.unique}
+        self.check_entry = _compile_entry_check(schema, self.first_seen)
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget everything seen so far, to validate another stream."""
+        self.count = 0
+        self.violations: List[Violation] = []
+        for seen in self.first_seen.values():
+            seen.clear()
+
+    def check(self, entry: Any) -> None:
+        """Validate the next entry of the stream."""
+        i = self.count
+        self.count += 1
+        violations = self.violations
+        if not isinstance(entry, dict):
+            violations.append(Violation(i, None, 'type', f"Entry {i} should be an object"))
+            return
+        self.check_entry(entry, i, violations)
+
+    def finish(self) -> List[Violation]:
+        """Apply the corpus-level rules and return every violation found."""
+        if self.count == 0:
+            self.violations.append(Violation(None, None, 'non_empty', "FAQ data should not be empty."))
+        return self.violations
+
+    def iter_validated(self, faqs: Iterable[Any]) -> Iterator[Any]:
+        """Pass entries through unchanged, validating each; finish() runs when the stream ends."""
+        for entry in faqs:
+            self.check(entry)
+            yield entry
+        self.finish()
+
+
+def iter_validated_faqs(faqs: Iterable[Dict[str, Any]], violations: List[Violation],
+                        schema: Dict[str, FieldRule] = FAQ_SCHEMA) -> Iterator[Dict[str, Any]]:
+    """
+    Pass FAQs through unchanged, appending every schema violation to
+    violations once the stream is exhausted.
+    """
+    validator = FaqValidator(schema)
+    yield from validator.iter_validated(faqs)
+    violations.extend(validator.violations)
+
+
+def validate_faqs(faqs: Iterable[Dict[str, Any]], schema: Dict[str, FieldRule] = FAQ_SCHEMA) -> List[Violation]:
+    """Validate a list or stream of FAQs in one pass."""
+    validator = FaqValidator(schema)
+    for entry in faqs:
+        validator.check(entry)
+    return validator.finish()
+
+
+def validate_file(file_path: str, schema: Dict[str, FieldRule] = FAQ_SCHEMA) -> List[Violation]:
+    """
+    Stream a FAQ file (any layout iter_faqs accepts) through the validator.
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        json.JSONDecodeError: If the JSON is invalid
+        ValueError: If the file holds no FAQ list
+    """
+    return validate_faqs(iter_faqs(file_path), schema)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Validate FAQ files against the FAQ schema')
+    parser.add_argument('files', nargs='*', default=['data/faqs.json'],
+                        help='FAQ files to validate (default: data/faqs.json)')
+    parser.add_argument('--max-shown', type=int, default=50,
+                        help='Violations printed per file (default: 50, 0 for all)')
+    args = parser.parse_args()
+
+    failed = False
+    for file_path in args.files:
+        try:
+            violations = validate_file(file_path)
+        except FileNotFoundError:
+            print(f"{file_path}: file not found")
+            failed = True
+            continue
+        except (json.JSONDecodeError, ValueError) as e:
+            print(f"{file_path}: invalid JSON: {e}")
+            failed = True
+            continue
+
+        if not violations:
+            print(f"{file_path}: OK")
+            continue
+        failed = True
+        print(f"{file_path}: {len(violations)} violations")
+        shown = violations if args.max_shown <= 0 else violations[:args.max_shown]
+        for violation in shown:
+            print(f"  - {violation}")
+        if len(shown) < len(violations):
+            print(f"  ... and {len(violations) - len(shown)} more")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())